@@ -1,13 +1,18 @@
-from ocr.input import AnyInput
-from ocr.output import AnyOutput
+import asyncio
+import logging
+
+from ocr.pipeline import Pipeline
+from ocr.text_extractor import ExtractionStatus
 from ocr.text_extractor import TextExtractor
-from ocr.transfomations import TransformationsApplier
+from pydantic import PositiveFloat
 from pydantic_settings import BaseSettings
 from pydantic_settings import CliApp
 from pydantic_settings import SettingsConfigDict
 
+_logger = logging.getLogger(__name__)
+
 
-class OCR(BaseSettings, TransformationsApplier):
+class OCR(BaseSettings, Pipeline):
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -17,18 +22,29 @@ class OCR(BaseSettings, TransformationsApplier):
         cli_ignore_unknown_args=False,
     )
 
-    input: AnyInput
     text_extractor: TextExtractor
-    outputs: tuple[AnyOutput, ...]
+    streaming: bool = False
+    status_interval: PositiveFloat = 30.0
 
     async def cli_cmd(self) -> None:
-        images = self.input.get_images()
-        if not images:
-            return
-        result = await self.text_extractor.extract_from_images(images)
-        transformed_result = await self.apply_transformations(result)
-        for output in self.outputs:
-            await output.save_results(transformed_result)
+        reporter = asyncio.create_task(self._report_status())
+        try:
+            await self.run(self.text_extractor, self.streaming)
+        finally:
+            reporter.cancel()
+
+    async def _report_status(self) -> None:
+        reported = ExtractionStatus()
+        while True:
+            await asyncio.sleep(self.status_interval)
+            status = self.text_extractor.status
+            if status == reported:
+                continue
+            _logger.info(
+                f"Pages queued: {status.queued}, in flight: {status.in_flight}, "
+                f"done: {status.done}, failed: {status.failed}"
+            )
+            reported = status
 
 
 if __name__ == "__main__":
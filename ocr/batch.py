@@ -0,0 +1,160 @@
+import asyncio
+import csv
+import json
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Annotated
+from typing import Any
+from typing import IO
+from typing import Literal
+from typing import Optional
+
+from ocr.pipeline import Pipeline
+from ocr.resources import share_resources
+from ocr.text_extractor import TextExtractor
+from pydantic import AfterValidator
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import PositiveInt
+from pydantic_settings import BaseSettings
+from pydantic_settings import CliApp
+from pydantic_settings import SettingsConfigDict
+
+_logger = logging.getLogger(__name__)
+_MANIFEST_SUFFIXES = (".jsonl", ".csv")
+
+
+def _validate_manifest_path(path: Path) -> Path:
+    if not path.is_file():
+        raise ValueError(f"Manifest file does not exist: {path}")
+    if path.suffix.lower() not in _MANIFEST_SUFFIXES:
+        raise ValueError(
+            f"Manifest must be one of {_MANIFEST_SUFFIXES}, got: {path}"
+        )
+    return path
+
+
+class BatchJob(Pipeline):
+    model_config = ConfigDict(extra="forbid")
+    name: str
+
+
+class JobSummary(BaseModel):
+    name: str
+    status: Literal["done", "failed"]
+    pages: int
+    characters: int
+    seconds: float
+    error: Optional[str] = None
+
+
+class BatchOCR(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        env_nested_delimiter="__",
+        cli_parse_args=True,
+        cli_kebab_case=True,
+        cli_ignore_unknown_args=False,
+    )
+
+    manifest: Annotated[Path, AfterValidator(_validate_manifest_path)]
+    text_extractor: TextExtractor
+    summary_path: Path = Path("batch_summary.jsonl")
+    max_jobs: PositiveInt = 4
+    streaming: bool = False
+
+    async def cli_cmd(self) -> None:
+        jobs = self._load_jobs()
+        share_resources(jobs)
+        semaphore = asyncio.Semaphore(self.max_jobs)
+        self.summary_path.parent.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        with self.summary_path.open("w") as summary_file:
+            async with self.text_extractor.session():
+                summaries = await asyncio.gather(
+                    *(
+                        self._run_job(job, semaphore, summary_file)
+                        for job in jobs
+                    )
+                )
+        failed = sum(summary.status == "failed" for summary in summaries)
+        _logger.info(
+            f"Finished {len(summaries)} jobs ({failed} failed), "
+            f"{sum(summary.pages for summary in summaries)} pages "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+
+    async def _run_job(
+        self,
+        job: BatchJob,
+        semaphore: asyncio.Semaphore,
+        summary_file: IO[str],
+    ) -> JobSummary:
+        async with semaphore:
+            start = time.perf_counter()
+            error = None
+            try:
+                await job.run(self.text_extractor, self.streaming)
+            except Exception as e:
+                _logger.exception(f"Job {job.name} failed")
+                error = "; ".join(map(_describe, _leaf_errors(e)))
+            summary = JobSummary(
+                name=job.name,
+                status="done" if error is None else "failed",
+                pages=job.n_pages,
+                characters=job.n_characters,
+                seconds=round(time.perf_counter() - start, 3),
+                error=error,
+            )
+        summary_file.write(summary.model_dump_json() + "\n")
+        summary_file.flush()
+        return summary
+
+    def _load_jobs(self) -> tuple[BatchJob, ...]:
+        with self.manifest.open(newline="") as file:
+            if self.manifest.suffix.lower() == ".csv":
+                rows = [_parse_csv_row(row) for row in csv.DictReader(file)]
+            else:
+                rows = [json.loads(line) for line in file if line.strip()]
+        jobs = tuple(map(BatchJob.model_validate, rows))
+        duplicates = [
+            name
+            for name, count in Counter(job.name for job in jobs).items()
+            if count > 1
+        ]
+        if duplicates:
+            raise ValueError(f"Duplicate job names in manifest: {duplicates}")
+        continuous = [job.name for job in jobs if job.input.continuous]
+        if continuous:
+            raise ValueError(
+                f"Jobs with never-ending inputs cannot be batched: {continuous}"
+            )
+        return jobs
+
+
+def _leaf_errors(error: BaseException) -> Iterator[BaseException]:
+    if isinstance(error, BaseExceptionGroup):
+        for inner in error.exceptions:
+            yield from _leaf_errors(inner)
+    else:
+        yield error
+
+
+def _describe(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def _parse_csv_row(row: dict[str, str]) -> dict[str, Any]:
+    return {
+        column: value if column == "name" else json.loads(value)
+        for column, value in row.items()
+        if value
+    }
+
+
+if __name__ == "__main__":
+    CliApp.run(BatchOCR)
@@ -0,0 +1,109 @@
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import PositiveInt
+
+_logger = logging.getLogger(__name__)
+
+
+class DiskCache(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    directory: Path
+    max_size_bytes: PositiveInt = 2**30
+    max_entries: Optional[PositiveInt] = None
+    _entries: Optional["OrderedDict[str, int]"]
+    _size: int
+    _hits: int
+    _misses: int
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._entries = None
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def get(self, key: str) -> Optional[str]:
+        entries = self._load_entries()
+        if key not in entries:
+            self._misses += 1
+            return None
+        path = self._path(key)
+        try:
+            value = path.read_text()
+        except FileNotFoundError:
+            self._size -= entries.pop(key)
+            self._misses += 1
+            return None
+        os.utime(path)
+        entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        entries = self._load_entries()
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(value)
+        os.replace(temp_path, path)
+        self._size -= entries.pop(key, 0)
+        entries[key] = path.stat().st_size
+        self._size += entries[key]
+        self._evict(entries)
+
+    def log_stats(self, name: str) -> None:
+        lookups = self._hits + self._misses
+        if not lookups:
+            return
+        _logger.info(
+            f"{name} cache: {self._hits} hits, {self._misses} misses "
+            f"({self._hits / lookups:.1%} hit rate), "
+            f"{len(self._load_entries())} entries, {self._size} bytes"
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _load_entries(self) -> "OrderedDict[str, int]":
+        if self._entries is not None:
+            return self._entries
+        files = sorted(
+            (
+                (path.stat(), path.name)
+                for path in self.directory.glob("*/*")
+                if path.suffix != ".tmp"
+            ),
+            key=lambda item: item[0].st_mtime,
+        )
+        self._entries = OrderedDict(
+            (name, stat.st_size) for stat, name in files
+        )
+        self._size = sum(self._entries.values())
+        self._evict(self._entries)
+        return self._entries
+
+    def _evict(self, entries: "OrderedDict[str, int]") -> None:
+        while entries and (
+            self._size > self.max_size_bytes
+            or (
+                self.max_entries is not None
+                and len(entries) > self.max_entries
+            )
+        ):
+            key, size = entries.popitem(last=False)
+            self._path(key).unlink(missing_ok=True)
+            self._size -= size
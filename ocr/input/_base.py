@@ -1,7 +1,12 @@
+import asyncio
 from abc import ABC
 from abc import abstractmethod
-from pathlib import Path
+from collections.abc import AsyncIterator
+from typing import Optional
 
+from ocr.journal import Journal
+from ocr.page import Page
+from ocr.page import PageSource
 from pydantic import BaseModel
 from pydantic import ConfigDict
 
@@ -18,7 +23,33 @@ class Input(BaseModel, ABC):
         ".tif",
         ".webp",
     )
+    _journal: Optional[Journal] = None
+
+    @property
+    def continuous(self) -> bool:
+        return False
 
     @abstractmethod
-    def get_images(self) -> tuple[Path, ...]:
+    def get_images(self) -> tuple[PageSource, ...]:
+        pass
+
+    async def iter_images(self) -> AsyncIterator[PageSource]:
+        for image in await asyncio.to_thread(self.get_images):
+            yield image
+
+    def release_image(self, image: PageSource) -> None:
         pass
+
+    def record_text(self, image: PageSource, text: str) -> None:
+        pass
+
+    def use_journal(self, journal: Optional[Journal]) -> None:
+        self._journal = journal
+
+    def _resumed_page(self, name: str, number: int) -> Optional[Page]:
+        if self._journal is None:
+            return None
+        text = self._journal.page_text(name)
+        if text is None:
+            return None
+        return Page(name, number, b"", text)
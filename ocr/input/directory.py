@@ -1,10 +1,21 @@
+import asyncio
 import os.path
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from contextlib import suppress
 from pathlib import Path
 from typing import Annotated
 from typing import Literal
 
 from ocr.input._base import Input
+from ocr.input.watcher import AnyDirectoryWatcher
+from ocr.input.watcher import default_watcher
+from ocr.page import PageSource
 from pydantic import AfterValidator
+from pydantic import Field
+from pydantic import NonNegativeFloat
+
+_Signature = tuple[int, int]
 
 
 def _validate_path(path: Path) -> Path:
@@ -18,16 +29,87 @@ def _validate_path(path: Path) -> Path:
 class DirectoryInput(Input):
     type: Literal["directory"] = "directory"
     input_directory: Annotated[Path, AfterValidator(_validate_path)]
+    watch: bool = False
+    skip_existing: bool = False
+    settle_time: NonNegativeFloat = 2.0
+    watcher: AnyDirectoryWatcher = Field(default_factory=default_watcher)  # type: ignore[assignment]
+
+    @property
+    def continuous(self) -> bool:
+        return self.watch
 
     def get_images(self) -> tuple[Path, ...]:
         return tuple(
             file_path
             for file_path in sorted(
-                (
-                    file_path
-                    for file_path in self.input_directory.iterdir()
-                    if file_path.suffix.lower() in self.supported_extensions
-                ),
+                self._image_files(),
                 key=os.path.getmtime,
             )
         )
+
+    async def iter_images(self) -> AsyncIterator[PageSource]:
+        if not self.watch:
+            async for image in super().iter_images():
+                yield image
+            return
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        seen = set(self.get_images()) if self.skip_existing else set()
+        unsettled: dict[Path, tuple[_Signature, float]] = {}
+        async with self.watcher.watch(self.input_directory, changed):
+            while True:
+                changed.clear()
+                now = loop.time()
+                unsettled = self._observe(seen, unsettled, now)
+                ready = sorted(
+                    (
+                        path
+                        for path, (_, since) in unsettled.items()
+                        if now - since >= self.settle_time
+                    ),
+                    key=lambda path: unsettled[path][0][1],
+                )
+                for path in ready:
+                    del unsettled[path]
+                    seen.add(path)
+                    yield path
+                timeout = min(
+                    (
+                        since + self.settle_time - loop.time()
+                        for _, since in unsettled.values()
+                    ),
+                    default=self.watcher.rescan_interval,
+                )
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(changed.wait(), max(timeout, 0))
+
+    def _image_files(self) -> Iterator[Path]:
+        return (
+            file_path
+            for file_path in self.input_directory.iterdir()
+            if file_path.suffix.lower() in self.supported_extensions
+        )
+
+    def _observe(
+        self,
+        seen: set[Path],
+        unsettled: dict[Path, tuple[_Signature, float]],
+        now: float,
+    ) -> dict[Path, tuple[_Signature, float]]:
+        observed = {}
+        for path in self._image_files():
+            if path in seen:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if not stat.st_size:
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            previous = unsettled.get(path)
+            if previous is not None and previous[0] == signature:
+                observed[path] = previous
+            else:
+                observed[path] = (signature, now)
+        return observed
@@ -0,0 +1,93 @@
+import logging
+import os
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import TypeAdapter
+
+_logger = logging.getLogger(__name__)
+
+
+class ManifestEntry(BaseModel):
+    name: str
+    modified_time: Optional[str] = None
+    md5_checksum: Optional[str] = None
+    text: str
+
+    def matches(self, file: dict[str, str]) -> bool:
+        return (self.modified_time, self.md5_checksum) == (
+            file.get("modifiedTime"),
+            file.get("md5Checksum"),
+        )
+
+
+_Entries: TypeAdapter[dict[str, ManifestEntry]] = TypeAdapter(
+    dict[str, ManifestEntry]
+)
+
+
+class DriveManifest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    path: Path
+    _entries: dict[str, ManifestEntry]
+    _pending: dict[str, dict[str, str]]
+    _lock: threading.Lock
+    _reused: int
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._entries = (
+            _Entries.validate_json(self.path.read_bytes())
+            if self.path.exists()
+            else {}
+        )
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._reused = 0
+
+    def text(self, file: dict[str, str]) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(file["id"])
+            if entry is None or not entry.matches(file):
+                self._pending[file["id"]] = file
+                return None
+            self._reused += 1
+            return entry.text
+
+    def record(self, file_id: str, text: str) -> None:
+        with self._lock:
+            file = self._pending.pop(file_id, None)
+            if file is None:
+                return
+            self._entries[file_id] = ManifestEntry(
+                name=file["name"],
+                modified_time=file.get("modifiedTime"),
+                md5_checksum=file.get("md5Checksum"),
+                text=text,
+            )
+            self._save()
+
+    def retain(self, files: Iterable[dict[str, str]]) -> None:
+        file_ids = {file["id"] for file in files}
+        with self._lock:
+            removed = self._entries.keys() - file_ids
+            for file_id in removed:
+                del self._entries[file_id]
+            if removed:
+                self._save()
+
+    def log_stats(self) -> None:
+        _logger.info(
+            f"Drive manifest: reused text of {self._reused} unchanged files, "
+            f"{len(self._pending)} new or changed files pending"
+        )
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        temp_path.write_bytes(_Entries.dump_json(self._entries))
+        os.replace(temp_path, self.path)
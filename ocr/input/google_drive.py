@@ -1,15 +1,44 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from itertools import count
 from pathlib import Path
 from tempfile import mkdtemp
 from typing import Annotated
 from typing import Any
+from typing import IO
 from typing import Literal
+from typing import Optional
+from typing import TypeVar
 
-from google.oauth2.service_account import Credentials
+from google.auth.credentials import Credentials
+from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.discovery import Resource
+from googleapiclient.errors import HttpError
+from googleapiclient.http import DEFAULT_CHUNK_SIZE
 from googleapiclient.http import MediaIoBaseDownload
 from ocr.input._base import Input
+from ocr.input.drive_manifest import DriveManifest
+from ocr.page import Page
+from ocr.page import PageSource
 from pydantic import AfterValidator
+from pydantic import Field
+from pydantic import NonNegativeFloat
+from pydantic import NonNegativeInt
+from pydantic import PositiveInt
+
+_logger = logging.getLogger(__name__)
+_T = TypeVar("_T")
+_RETRYABLE_STATUSES = frozenset((408, 429, 500, 502, 503, 504))
 
 
 def _validate_credentials_path(path: Path) -> Path:
@@ -20,6 +49,10 @@ def _validate_credentials_path(path: Path) -> Path:
     return path
 
 
+class _ThreadState(threading.local):
+    service: Optional[Resource] = None
+
+
 class GoogleDriveInput(Input):
     type: Literal["google-drive"] = "google-drive"
     credentials_path: Annotated[
@@ -27,39 +60,171 @@ class GoogleDriveInput(Input):
     ]
     directory_id: str
     temp_directory: Path = Path(mkdtemp(dir="/dev/shm"))
-    _service: Resource
+    in_memory: bool = False
+    n_workers: PositiveInt = 8
+    chunk_size: PositiveInt = DEFAULT_CHUNK_SIZE
+    num_retries: NonNegativeInt = 5
+    retry_delay: NonNegativeFloat = 1.0
+    page_size: Annotated[PositiveInt, Field(le=1000)] = 1000
+    api_endpoint: Optional[str] = None
+    manifest: Optional[DriveManifest] = None
+    _credentials: Credentials
+    _local: _ThreadState
+    _file_ids: dict[PageSource, str]
 
     def model_post_init(self, context: Any, /) -> None:
-        credentials = Credentials.from_service_account_file(  # type: ignore[no-untyped-call]
+        self._credentials = self._load_credentials()
+        self._local = _ThreadState()
+        self._file_ids = {}
+
+    def get_images(self) -> tuple[PageSource, ...]:
+        files = self._listing()
+        with ThreadPoolExecutor(self.n_workers, "drive") as executor:
+            images = tuple(executor.map(self._fetch, count(), files))
+        if self.manifest is not None:
+            self.manifest.log_stats()
+        return images
+
+    async def iter_images(self) -> AsyncIterator[PageSource]:
+        loop = asyncio.get_running_loop()
+        files = await asyncio.to_thread(self._listing)
+        executor = ThreadPoolExecutor(self.n_workers, "drive")
+        pending: deque[asyncio.Future[PageSource]] = deque()
+        try:
+            for number, file in enumerate(files):
+                pending.append(
+                    loop.run_in_executor(executor, self._fetch, number, file)
+                )
+                if len(pending) > self.n_workers:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+            if self.manifest is not None:
+                self.manifest.log_stats()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def record_text(self, image: PageSource, text: str) -> None:
+        file_id = self._file_ids.pop(image, None)
+        if self.manifest is not None and file_id is not None:
+            self.manifest.record(file_id, text)
+
+    def _load_credentials(self) -> Credentials:
+        return service_account.Credentials.from_service_account_file(  # type: ignore[no-untyped-call,no-any-return]
             str(self.credentials_path),
             scopes=["https://www.googleapis.com/auth/drive.readonly"],
         )
-        self._service = build("drive", "v3", credentials=credentials)
-
-    def get_images(self) -> tuple[Path, ...]:
-        query = f"'{self.directory_id}' in parents and trashed=false"
-        results = (
-            self._service.files()
-            .list(q=query, fields="files(id, name)", orderBy="name")
-            .execute()
-        )
-        files = results.get("files", ())
-        temp_dir = self.temp_directory
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        image_files = []
-        for file in files:
-            file_name = file["name"]
-            if not any(
-                file_name.lower().endswith(ext)
+
+    def _service(self) -> Resource:
+        service = self._local.service
+        if service is None:
+            service = self._local.service = build(
+                "drive",
+                "v3",
+                credentials=self._credentials,
+                client_options=(
+                    {"api_endpoint": self.api_endpoint}
+                    if self.api_endpoint
+                    else None
+                ),
+                cache_discovery=False,
+            )
+        return service
+
+    def _folder_id(self) -> Optional[str]:
+        return self.directory_id
+
+    def _listing(self) -> tuple[dict[str, str], ...]:
+        files = tuple(self._list_images())
+        if self.manifest is not None:
+            self.manifest.retain(files)
+        return files
+
+    def _list_images(self) -> Iterator[dict[str, str]]:
+        folder_id = self._folder_id()
+        if folder_id is None:
+            return
+        for file in self._list_files(
+            f"'{folder_id}' in parents and trashed=false",
+            fields="id, name, modifiedTime, md5Checksum",
+            order_by="name",
+        ):
+            if any(
+                file["name"].lower().endswith(ext)
                 for ext in self.supported_extensions
             ):
-                continue
-            file_path = temp_dir / file_name
-            request = self._service.files().get_media(fileId=file["id"])
-            with file_path.open("wb") as fh:
-                downloader = MediaIoBaseDownload(fh, request)
-                done = False
-                while not done:
-                    _, done = downloader.next_chunk()
-            image_files.append(file_path)
-        return tuple(image_files)
+                yield file
+
+    def _list_files(
+        self, query: str, fields: str, order_by: str
+    ) -> Iterator[dict[str, str]]:
+        page_token = None
+        while True:
+            results = self._retry(
+                self._service()
+                .files()
+                .list(
+                    q=query,
+                    fields=f"nextPageToken, files({fields})",
+                    orderBy=order_by,
+                    pageSize=self.page_size,
+                    pageToken=page_token,
+                )
+                .execute
+            )
+            yield from results.get("files", ())
+            page_token = results.get("nextPageToken")
+            if not page_token:
+                return
+
+    def _fetch(self, number: int, file: dict[str, str]) -> PageSource:
+        if self.manifest is not None:
+            text = self.manifest.text(file)
+            if text is not None:
+                return Page(file["name"], number, b"", text)
+        resumed = self._resumed_page(file["name"], number)
+        image = (
+            self._fetch_content(number, file) if resumed is None else resumed
+        )
+        if self.manifest is not None:
+            self._file_ids[image] = file["id"]
+        return image
+
+    def _fetch_content(self, number: int, file: dict[str, str]) -> PageSource:
+        if self.in_memory:
+            buffer = BytesIO()
+            self._download(file["id"], buffer)
+            return Page(file["name"], number, buffer.getvalue())
+        file_path = self.temp_directory / file["id"] / file["name"]
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with file_path.open("wb") as fh:
+            self._download(file["id"], fh)
+        return file_path
+
+    def _download(self, file_id: str, fh: IO[bytes]) -> None:
+        request = self._service().files().get_media(fileId=file_id)
+        downloader = MediaIoBaseDownload(
+            fh, request, chunksize=self.chunk_size
+        )
+        done = False
+        while not done:
+            _, done = self._retry(downloader.next_chunk)
+
+    def _retry(self, call: Callable[[], _T]) -> _T:
+        for attempt in range(self.num_retries):
+            try:
+                return call()
+            except HttpError as e:
+                if e.resp.status not in _RETRYABLE_STATUSES:
+                    raise
+                error: Exception = e
+            except OSError as e:
+                error = e
+            delay = self.retry_delay * 2**attempt * random.random()
+            _logger.warning(
+                f"Google Drive request failed ({error}), retrying in {delay:.2f}s"
+            )
+            time.sleep(delay)
+        return call()
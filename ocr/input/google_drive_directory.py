@@ -1,5 +1,5 @@
-from pathlib import Path
 from typing import Literal
+from typing import Optional
 
 from ocr.input.google_drive import GoogleDriveInput
 
@@ -7,23 +7,16 @@ from ocr.input.google_drive import GoogleDriveInput
 class GoogleDriveDirectoryInput(GoogleDriveInput):
     type: Literal["google-drive-directory"] = "google-drive-directory"  # type: ignore[assignment]
 
-    def get_images(self) -> tuple[Path, ...]:
+    def _folder_id(self) -> Optional[str]:
         query = f"'{self.directory_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
-        results = (
-            self._service.files()
-            .list(
-                q=query,
-                fields="files(id, name, modifiedTime)",
-                orderBy="modifiedTime desc",
-                pageSize=1,
-            )
-            .execute()
+        most_recent_folder = next(
+            self._list_files(
+                query,
+                fields="id, name, modifiedTime",
+                order_by="modifiedTime desc",
+            ),
+            None,
         )
-        folders = results.get("files", ())
-        if not folders:
-            return ()
-        most_recent_dir_id = folders[0]["id"]
-        return GoogleDriveInput(
-            **self.model_dump(exclude={"directory_id", "type"}),
-            directory_id=most_recent_dir_id,
-        ).get_images()
+        if most_recent_folder is None:
+            return None
+        return most_recent_folder["id"]
@@ -1,10 +1,24 @@
+import asyncio
+import multiprocessing
+from collections import deque
+from collections.abc import AsyncIterator
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from io import BytesIO
+from itertools import chain
 from pathlib import Path
 from tempfile import mkdtemp
 from typing import Annotated
 from typing import Literal
 
 from ocr.input._base import Input
+from ocr.page import Page
+from ocr.page import PageSource
 from pdf2image import convert_from_path
+from PIL import Image
 from pydantic import AfterValidator
 from pydantic import PositiveInt
 
@@ -19,26 +33,162 @@ def _validate_pdf_path(path: Path) -> Path:
     return path
 
 
+def _render_pages(
+    pdf_path: Path,
+    first_page: int,
+    last_page: int,
+    output_folder: Path,
+    dpi: int,
+    thread_count: int,
+    in_memory: bool,
+) -> list[PageSource]:
+    if in_memory:
+        return [
+            Page(f"page_{page_number}.png", page_number, _encode(image, dpi))
+            for page_number, image in enumerate(
+                convert_from_path(
+                    pdf_path,
+                    dpi=dpi,
+                    first_page=first_page,
+                    last_page=last_page,
+                    thread_count=thread_count,
+                ),
+                first_page,
+            )
+        ]
+    output_folder.mkdir(parents=True, exist_ok=True)
+    window_folder = Path(
+        mkdtemp(dir=output_folder, prefix=f"pages_{first_page}_")
+    )
+    paths = convert_from_path(
+        pdf_path,
+        dpi=dpi,
+        first_page=first_page,
+        last_page=last_page,
+        output_folder=window_folder,
+        output_file="page",
+        fmt="png",
+        thread_count=thread_count,
+        paths_only=True,
+    )
+    return [
+        Path(path).rename(window_folder / f"page_{page_number}.png")
+        for page_number, path in enumerate(paths, first_page)
+    ]
+
+
+def _encode(image: Image.Image, dpi: int) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="PNG", dpi=(dpi, dpi))
+    return buffer.getvalue()
+
+
 class PdfInput(Input):
     type: Literal["pdf"] = "pdf"
     pdf_path: Annotated[Path, AfterValidator(_validate_pdf_path)]
     start_page: PositiveInt = 1
     number_of_pages: PositiveInt = 1
     temp_directory: Path = Path(mkdtemp(dir="/dev/shm"))
+    dpi: PositiveInt = 200
+    window_size: PositiveInt = 8
+    thread_count: PositiveInt = 1
+    n_processes: PositiveInt = 1
+    keep_images: bool = False
+    in_memory: bool = False
 
-    def get_images(self) -> tuple[Path, ...]:
-        last_page = self.start_page + self.number_of_pages - 1
-        images = convert_from_path(
-            self.pdf_path,
-            first_page=self.start_page,
-            last_page=last_page,
+    def get_images(self) -> tuple[PageSource, ...]:
+        with self._create_executor() as executor:
+            windows = [
+                (
+                    window
+                    if isinstance(window, Page)
+                    else executor.submit(
+                        _render_pages, *self._render_args(window)
+                    )
+                )
+                for window in self._windows()
+            ]
+            return tuple(
+                chain.from_iterable(
+                    (window,) if isinstance(window, Page) else window.result()
+                    for window in windows
+                )
+            )
+
+    async def iter_images(self) -> AsyncIterator[PageSource]:
+        loop = asyncio.get_running_loop()
+        executor = self._create_executor()
+        pending: deque[asyncio.Future[list[PageSource]]] = deque()
+        try:
+            for window in self._windows():
+                if isinstance(window, Page):
+                    resumed: asyncio.Future[list[PageSource]] = (
+                        loop.create_future()
+                    )
+                    resumed.set_result([window])
+                    pending.append(resumed)
+                else:
+                    pending.append(
+                        loop.run_in_executor(
+                            executor, _render_pages, *self._render_args(window)
+                        )
+                    )
+                if len(pending) > self.n_processes:
+                    for image in await pending.popleft():
+                        yield image
+            while pending:
+                for image in await pending.popleft():
+                    yield image
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def release_image(self, image: PageSource) -> None:
+        if isinstance(image, Path) and not self.keep_images:
+            image.unlink(missing_ok=True)
+            with suppress(OSError):
+                image.parent.rmdir()
+
+    def _create_executor(self) -> Executor:
+        if self.n_processes == 1:
+            return ThreadPoolExecutor(max_workers=1)
+        return ProcessPoolExecutor(
+            max_workers=self.n_processes,
+            mp_context=multiprocessing.get_context("forkserver"),
         )
-        self.temp_directory.mkdir(parents=True, exist_ok=True)
-        paths: list[Path] = []
-        for i, image in enumerate(images):
-            image_path = (
-                self.temp_directory / f"page_{self.start_page + i}.png"
+
+    def _windows(self) -> Iterator[Page | tuple[int, int]]:
+        first_page = None
+        for page_number in range(
+            self.start_page, self.start_page + self.number_of_pages
+        ):
+            resumed = self._resumed_page(
+                f"page_{page_number}.png", page_number
             )
-            image.save(str(image_path), "PNG")
-            paths.append(image_path)
-        return tuple(paths)
+            if first_page is not None and (
+                resumed is not None
+                or page_number - first_page == self.window_size
+            ):
+                yield first_page, page_number - 1
+                first_page = None
+            if resumed is not None:
+                yield resumed
+            elif first_page is None:
+                first_page = page_number
+        if first_page is not None:
+            yield first_page, self.start_page + self.number_of_pages - 1
+
+    def _render_args(
+        self, window: tuple[int, int]
+    ) -> tuple[Path, int, int, Path, int, int, bool]:
+        first_page, last_page = window
+        return (
+            self.pdf_path,
+            first_page,
+            last_page,
+            self.temp_directory,
+            self.dpi,
+            self.thread_count,
+            self.in_memory,
+        )
@@ -0,0 +1,38 @@
+import logging
+from collections.abc import Callable
+from typing import Annotated
+from typing import TypeAlias
+from typing import Union
+
+from ocr.input.watcher._base import DirectoryWatcher
+from ocr.input.watcher.polling import PollingWatcher
+from pydantic import Field
+
+_logger = logging.getLogger(__name__)
+AnyDirectoryWatcher: TypeAlias = Annotated[
+    Union[PollingWatcher,], Field(discriminator="type")
+]
+_default_watcher: Callable[[], DirectoryWatcher] = PollingWatcher
+__all__ = [
+    "AnyDirectoryWatcher",
+    "DirectoryWatcher",
+    "PollingWatcher",
+    "default_watcher",
+]
+try:
+    from ocr.input.watcher.inotify import InotifyWatcher
+
+    AnyDirectoryWatcher = Annotated[  # type: ignore[misc,assignment]
+        Union[AnyDirectoryWatcher, InotifyWatcher],
+        Field(discriminator="type"),
+    ]
+    _default_watcher = InotifyWatcher
+    __all__.append("InotifyWatcher")
+except ImportError as e:
+    _logger.warning(
+        f"watchdog>=5.0.0, necessary to use inotify directory watcher, is not installed, directory watching falls back to polling.\n{e}"
+    )
+
+
+def default_watcher() -> DirectoryWatcher:
+    return _default_watcher()
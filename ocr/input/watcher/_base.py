@@ -0,0 +1,21 @@
+import asyncio
+from abc import ABC
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import PositiveFloat
+
+
+class DirectoryWatcher(BaseModel, ABC):
+    model_config = ConfigDict(extra="forbid")
+    type: str
+    rescan_interval: PositiveFloat = 1.0
+
+    @asynccontextmanager
+    async def watch(
+        self, directory: Path, changed: asyncio.Event
+    ) -> AsyncIterator[None]:
+        yield
@@ -0,0 +1,48 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Literal
+
+from ocr.input.watcher._base import DirectoryWatcher
+from pydantic import PositiveFloat
+from watchdog.events import EVENT_TYPE_CLOSED_NO_WRITE
+from watchdog.events import EVENT_TYPE_OPENED
+from watchdog.events import FileSystemEvent
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+
+class _ChangeHandler(FileSystemEventHandler):  # type: ignore[misc]
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, changed: asyncio.Event
+    ) -> None:
+        self._loop = loop
+        self._changed = changed
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.event_type in (EVENT_TYPE_OPENED, EVENT_TYPE_CLOSED_NO_WRITE):
+            return
+        self._loop.call_soon_threadsafe(self._changed.set)
+
+
+class InotifyWatcher(DirectoryWatcher):
+    type: Literal["inotify"] = "inotify"
+    rescan_interval: PositiveFloat = 60.0
+
+    @asynccontextmanager
+    async def watch(
+        self, directory: Path, changed: asyncio.Event
+    ) -> AsyncIterator[None]:
+        observer = Observer()
+        observer.schedule(
+            _ChangeHandler(asyncio.get_running_loop(), changed),
+            str(directory),
+            recursive=False,
+        )
+        observer.start()
+        try:
+            yield
+        finally:
+            observer.stop()
+            await asyncio.to_thread(observer.join)
@@ -0,0 +1,7 @@
+from typing import Literal
+
+from ocr.input.watcher._base import DirectoryWatcher
+
+
+class PollingWatcher(DirectoryWatcher):
+    type: Literal["polling"] = "polling"
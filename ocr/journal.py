@@ -0,0 +1,118 @@
+import hashlib
+import logging
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+
+_logger = logging.getLogger(__name__)
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (name TEXT PRIMARY KEY, text TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS transformations (
+    key TEXT PRIMARY KEY, text TEXT NOT NULL
+);
+"""
+
+
+class Journal(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    path: Path
+    resume: bool = False
+    _connection: Optional[sqlite3.Connection]
+    _pages: dict[str, str]
+    _reused_pages: int
+    _reused_transformations: int
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._connection = None
+        self._pages = {}
+        self._reused_pages = 0
+        self._reused_transformations = 0
+
+    @contextmanager
+    def session(self) -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        try:
+            with connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                if not self.resume:
+                    connection.execute("DROP TABLE IF EXISTS pages")
+                    connection.execute("DROP TABLE IF EXISTS transformations")
+                connection.executescript(_SCHEMA)
+            self._pages = dict(
+                connection.execute("SELECT name, text FROM pages")
+            )
+            if self._pages:
+                _logger.info(
+                    f"Resuming from {self.path} with "
+                    f"{len(self._pages)} completed pages"
+                )
+            self._connection = connection
+            yield
+        finally:
+            self._connection = None
+            connection.close()
+            self.log_stats()
+
+    def page_text(self, name: str) -> Optional[str]:
+        text = self._pages.get(name)
+        if text is not None:
+            self._reused_pages += 1
+        return text
+
+    def record_page(self, name: str, text: str) -> None:
+        if self._pages.get(name) == text:
+            return
+        self._pages[name] = text
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?)", (name, text)
+            )
+
+    def transformed_text(
+        self, transformation: BaseModel, text: str
+    ) -> Optional[str]:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT text FROM transformations WHERE key = ?",
+                (self._transformation_key(transformation, text),),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        self._reused_transformations += 1
+        return str(row[0])
+
+    def record_transformation(
+        self, transformation: BaseModel, text: str, transformed: str
+    ) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO transformations VALUES (?, ?)",
+                (self._transformation_key(transformation, text), transformed),
+            )
+
+    def log_stats(self) -> None:
+        _logger.info(
+            f"Journal: reused {self._reused_pages} pages and "
+            f"{self._reused_transformations} transformation results"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise RuntimeError("Journal is used outside of its session")
+        return self._connection
+
+    @staticmethod
+    def _transformation_key(transformation: BaseModel, text: str) -> str:
+        digest = hashlib.sha256(transformation.model_dump_json().encode())
+        digest.update(b"\0" + text.encode())
+        return digest.hexdigest()
@@ -1,5 +1,6 @@
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import AsyncIterable
 
 from ocr.transfomations import TransformationsApplier
 from pydantic import ConfigDict
@@ -13,6 +14,9 @@ class Output(ABC, TransformationsApplier):
         result = await self.apply_transformations(result)
         await self._save_results(result)
 
+    async def save_stream(self, pages: AsyncIterable[str]) -> None:
+        await self.save_results("\n".join([page async for page in pages]))
+
     @abstractmethod
     async def _save_results(self, result: str) -> None:
         pass
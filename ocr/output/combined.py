@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterable
 from pathlib import Path
 from typing import Literal
 
@@ -7,7 +8,21 @@ from ocr.output._base import Output
 class CombinedOutput(Output):
     type: Literal["combined"] = "combined"
     path: Path
+    append: bool = False
 
     async def _save_results(self, result: str) -> None:
         self.path.parent.mkdir(exist_ok=True, parents=True)
-        self.path.write_text(result)
+        if not self.append:
+            self.path.write_text(result)
+            return
+        with self.path.open("a") as file:
+            file.write(("\n" if file.tell() else "") + result)
+
+    async def save_stream(self, pages: AsyncIterable[str]) -> None:
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        with self.path.open("a" if self.append else "w") as file:
+            separator = "\n" if file.tell() else ""
+            async for page in self.apply_transformations_stream(pages):
+                file.write(separator + page)
+                file.flush()
+                separator = "\n"
@@ -1,5 +1,6 @@
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import Sequence
 
 from pydantic import BaseModel
 from pydantic import ConfigDict
@@ -13,5 +14,8 @@ class DurationCalculator(ABC, BaseModel):
     def calculate_duration(self, word: str) -> float:
         pass
 
+    def calculate_durations(self, words: Sequence[str]) -> list[float]:
+        return [self.calculate_duration(word) for word in words]
+
     def reset(self) -> None:
         pass
@@ -0,0 +1,33 @@
+import logging
+from typing import Annotated
+from typing import TypeAlias
+from typing import Union
+
+from ocr.output.duration.backend._base import ModelBackend
+from ocr.output.duration.backend.pytorch import QuantizedTorchBackend
+from ocr.output.duration.backend.pytorch import TorchBackend
+from pydantic import Field
+
+_logger = logging.getLogger(__name__)
+AnyModelBackend: TypeAlias = Annotated[
+    Union[TorchBackend, QuantizedTorchBackend],
+    Field(discriminator="type"),
+]
+__all__ = [
+    "AnyModelBackend",
+    "ModelBackend",
+    "QuantizedTorchBackend",
+    "TorchBackend",
+]
+try:
+    from ocr.output.duration.backend.onnx_runtime import OnnxBackend
+
+    AnyModelBackend = Annotated[  # type: ignore[misc]
+        Union[AnyModelBackend, OnnxBackend],
+        Field(discriminator="type"),
+    ]
+    __all__.append("OnnxBackend")
+except ImportError as e:
+    _logger.warning(
+        f"Package necessary to use ONNX Runtime backend is not installed, ONNX backend is disabled.\n{e}"
+    )
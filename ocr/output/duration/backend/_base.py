@@ -0,0 +1,28 @@
+import logging
+import time
+from abc import ABC
+from abc import abstractmethod
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+
+_logger = logging.getLogger(__name__)
+
+
+class ModelBackend(BaseModel, ABC):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    type: str
+
+    def load(self, model_name: str, device: str) -> Any:
+        start = time.perf_counter()
+        model = self._load(model_name, device)
+        _logger.info(
+            f"Loading {model_name} with the {self.type} backend took "
+            f"{time.perf_counter() - start:.2f}s"
+        )
+        return model
+
+    @abstractmethod
+    def _load(self, model_name: str, device: str) -> Any:
+        pass
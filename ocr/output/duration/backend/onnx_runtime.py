@@ -0,0 +1,32 @@
+import logging
+from pathlib import Path
+from typing import Any
+from typing import Literal
+
+from ocr.output.duration.backend._base import ModelBackend
+from optimum.onnxruntime import ORTModelForCausalLM
+
+_logger = logging.getLogger(__name__)
+_MODEL_FILE = "model.onnx"
+
+
+class OnnxBackend(ModelBackend):
+    type: Literal["onnx"] = "onnx"
+    export_directory: Path = Path("onnx_models")
+
+    def _load(self, model_name: str, device: str) -> Any:
+        directory = self.export_directory / model_name.replace("/", "--")
+        if not (directory / _MODEL_FILE).is_file():
+            _logger.info(f"Exporting {model_name} to ONNX in {directory}")
+            ORTModelForCausalLM.from_pretrained(
+                model_name, export=True, use_cache=True
+            ).save_pretrained(directory)
+        return ORTModelForCausalLM.from_pretrained(
+            directory,
+            use_cache=True,
+            provider=(
+                "CPUExecutionProvider"
+                if device == "cpu"
+                else "CUDAExecutionProvider"
+            ),
+        )
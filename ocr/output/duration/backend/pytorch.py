@@ -0,0 +1,31 @@
+from typing import Any
+from typing import Literal
+
+import torch
+from ocr.output.duration.backend._base import ModelBackend
+from transformers import AutoModelForCausalLM
+
+
+class TorchBackend(ModelBackend):
+    type: Literal["torch"] = "torch"
+
+    def _load(self, model_name: str, device: str) -> Any:
+        model = AutoModelForCausalLM.from_pretrained(model_name)
+        model.to(device)
+        model.eval()
+        return model
+
+
+class QuantizedTorchBackend(TorchBackend):
+    type: Literal["torch-int8"] = "torch-int8"  # type: ignore[assignment]
+
+    def _load(self, model_name: str, device: str) -> Any:
+        if device != "cpu":
+            raise ValueError(
+                f"Dynamic int8 quantization only runs on CPU, not '{device}'"
+            )
+        return torch.ao.quantization.quantize_dynamic(
+            super()._load(model_name, device),
+            {torch.nn.Linear},
+            dtype=torch.qint8,
+        )
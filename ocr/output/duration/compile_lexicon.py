@@ -0,0 +1,50 @@
+import logging
+import time
+from pathlib import Path
+from typing import Optional
+
+from ocr.output.duration.frequency import clean_word
+from ocr.output.duration.lexicon import write_lexicon
+from pydantic import PositiveInt
+from pydantic_settings import BaseSettings
+from pydantic_settings import CliApp
+from pydantic_settings import SettingsConfigDict
+from wordfreq import get_frequency_dict
+from wordfreq import top_n_list
+from wordfreq import word_frequency
+
+_logger = logging.getLogger(__name__)
+
+
+class CompileLexicon(BaseSettings):
+    model_config = SettingsConfigDict(
+        cli_parse_args=True,
+        cli_kebab_case=True,
+    )
+    language: str = "pl"
+    path: Path
+    top_n: Optional[PositiveInt] = None
+
+    def cli_cmd(self) -> None:
+        start = time.perf_counter()
+        words = (
+            get_frequency_dict(self.language)
+            if self.top_n is None
+            else top_n_list(self.language, self.top_n)
+        )
+        frequencies = {
+            cleaned: frequency
+            for cleaned in set(map(clean_word, words))
+            if cleaned
+            and (frequency := float(word_frequency(cleaned, self.language)))
+        }
+        write_lexicon(self.path, self.language, frequencies)
+        _logger.info(
+            f"Compiled {len(frequencies)} '{self.language}' words into "
+            f"{self.path} ({self.path.stat().st_size} bytes) in "
+            f"{time.perf_counter() - start:.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    CliApp.run(CompileLexicon)
@@ -1,11 +1,42 @@
+import logging
 import re
+import time
+from collections.abc import Sequence
+from functools import lru_cache
 from typing import Any
 from typing import Literal
+from typing import Optional
 
+import numpy as np
+import numpy.typing as npt
 from ocr.output.duration._base import DurationCalculator
+from ocr.output.duration.lexicon import Lexicon
 from pydantic import Field
 from wordfreq import word_frequency
 
+_logger = logging.getLogger(__name__)
+_MEMO_SIZE = 2**16
+_WORD_PATTERN = re.compile(r"\w+")
+_loaded_languages: set[str] = set()
+
+
+def clean_word(word: str) -> str:
+    return "".join(_WORD_PATTERN.findall(word.lower()))
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _word_frequency(word: str, language: str) -> float:
+    if language in _loaded_languages:
+        return float(word_frequency(word, language))
+    start = time.perf_counter()
+    frequency = float(word_frequency(word, language))
+    _loaded_languages.add(language)
+    _logger.info(
+        f"Loading wordfreq tables for '{language}' took "
+        f"{time.perf_counter() - start:.2f}s"
+    )
+    return frequency
+
 
 class FrequencyDurationCalculator(DurationCalculator):
     type: Literal["frequency"] = "frequency"
@@ -16,14 +47,33 @@ class FrequencyDurationCalculator(DurationCalculator):
         1e-5,
         description="The larger, the larger the difference between word frequencies",
     )
-    _word_pattern: re.Pattern[str]
+    lexicon: Optional[Lexicon] = None
 
     def model_post_init(self, context: Any, /) -> None:
-        self._word_pattern = re.compile(r"\w+")
+        if self.lexicon is not None and self.lexicon.language != self.language:
+            raise ValueError(
+                f"Lexicon {self.lexicon.path} was compiled for "
+                f"'{self.lexicon.language}', not '{self.language}'"
+            )
+
+    def calculate_durations(self, words: Sequence[str]) -> list[float]:
+        unique_words = list(dict.fromkeys(words))
+        durations = dict(
+            zip(
+                unique_words,
+                self.frequencies_to_durations(
+                    np.fromiter(
+                        map(self._frequency, unique_words),
+                        dtype=np.float64,
+                        count=len(unique_words),
+                    )
+                ).tolist(),
+            )
+        )
+        return [durations[word] for word in words]
 
     def calculate_duration(self, word: str) -> float:
-        cleaned_word = "".join(self._word_pattern.findall(word.lower()))
-        frequency: float = word_frequency(cleaned_word, self.language)
+        frequency = self._frequency(word)
         if frequency == 0:
             return self.max_duration
         normalized_freq = frequency / self.base_frequency
@@ -31,3 +81,21 @@ class FrequencyDurationCalculator(DurationCalculator):
             self.max_duration - self.min_duration
         ) / (1 + normalized_freq)
         return max(self.min_duration, min(self.max_duration, duration))
+
+    def frequencies_to_durations(
+        self, frequencies: npt.NDArray[np.float64]
+    ) -> npt.NDArray[np.float64]:
+        durations = self.min_duration + (
+            self.max_duration - self.min_duration
+        ) / (1 + frequencies / self.base_frequency)
+        return np.where(
+            frequencies == 0,
+            self.max_duration,
+            np.clip(durations, self.min_duration, self.max_duration),
+        )
+
+    def _frequency(self, word: str) -> float:
+        cleaned_word = clean_word(word)
+        if self.lexicon is not None:
+            return self.lexicon.frequency(cleaned_word)
+        return _word_frequency(cleaned_word, self.language)
@@ -0,0 +1,113 @@
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable
+from collections.abc import Mapping
+from functools import lru_cache
+from pathlib import Path
+from typing import Annotated
+from typing import Any
+
+from pydantic import AfterValidator
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import NonNegativeFloat
+
+_MAGIC = b"OCRLEX01"
+_HEADER = struct.Struct("=8sQQ")
+_LANGUAGE_SIZE = 16
+_MEMO_SIZE = 2**16
+
+
+def _validate_lexicon_path(path: Path) -> Path:
+    if not path.is_file():
+        raise ValueError(f"Lexicon file does not exist: {path}")
+    with path.open("rb") as file:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not a compiled lexicon: {path}")
+    return path
+
+
+def write_lexicon(
+    path: Path, language: str, frequencies: Mapping[str, float]
+) -> None:
+    encoded_language = language.encode()
+    if len(encoded_language) > _LANGUAGE_SIZE:
+        raise ValueError(
+            f"Language code '{language}' is longer than {_LANGUAGE_SIZE} bytes"
+        )
+    encoded = sorted(
+        (word.encode(), frequency) for word, frequency in frequencies.items()
+    )
+    offsets = array("Q", [0])
+    for word, _ in encoded:
+        offsets.append(offsets[-1] + len(word))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    with temp_path.open("wb") as file:
+        file.write(_HEADER.pack(_MAGIC, len(encoded), len(encoded_language)))
+        file.write(encoded_language.ljust(_LANGUAGE_SIZE, b"\0"))
+        file.write(array("d", [frequency for _, frequency in encoded]))
+        file.write(offsets)
+        file.write(b"".join(word for word, _ in encoded))
+    temp_path.replace(path)
+
+
+class _Words:
+    def __init__(self, blob: memoryview, offsets: memoryview) -> None:
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return bytes(
+            self._blob[self._offsets[index] : self._offsets[index + 1]]
+        )
+
+
+class Lexicon(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    path: Annotated[Path, AfterValidator(_validate_lexicon_path)]
+    default_frequency: NonNegativeFloat = 0.0
+    _language: str
+    _frequencies: "memoryview[float]"
+    _words: _Words
+    _lookup: Callable[[str], float]
+
+    def model_post_init(self, context: Any, /) -> None:
+        with self.path.open("rb") as file:
+            view = memoryview(
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            )
+        _, n_words, language_length = _HEADER.unpack_from(view)
+        start = _HEADER.size + _LANGUAGE_SIZE
+        self._language = bytes(
+            view[_HEADER.size : _HEADER.size + language_length]
+        ).decode()
+        offsets_start = start + 8 * n_words
+        blob_start = offsets_start + 8 * (n_words + 1)
+        self._frequencies = view[start:offsets_start].cast("d")
+        self._words = _Words(
+            view[blob_start:], view[offsets_start:blob_start].cast("Q")
+        )
+        self._lookup = lru_cache(maxsize=_MEMO_SIZE)(self._search)
+
+    @property
+    def language(self) -> str:
+        return self._language
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def frequency(self, word: str) -> float:
+        return self._lookup(word)
+
+    def _search(self, word: str) -> float:
+        encoded = word.encode()
+        index = bisect_left(self._words, encoded)
+        if index < len(self._words) and self._words[index] == encoded:
+            return float(self._frequencies[index])
+        return self.default_frequency
@@ -1,79 +1,253 @@
 import logging
 import math
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Sequence
+from functools import lru_cache
 from typing import Any
 from typing import Literal
+from typing import Optional
 
 import torch
 from ocr.output.duration._base import DurationCalculator
-from transformers import AutoModelForCausalLM
+from ocr.output.duration.backend import AnyModelBackend
+from ocr.output.duration.backend import ModelBackend
+from ocr.output.duration.backend import TorchBackend
+from pydantic import Field
+from pydantic import PositiveInt
 from transformers import AutoTokenizer
-from transformers import PreTrainedModel
 from transformers import PreTrainedTokenizerBase
 
 _LOG_PROB_FLOOR = -10.0
 
 
+@lru_cache(maxsize=None)
+def _load_model(
+    model_name: str, device: str, backend: ModelBackend
+) -> tuple[PreTrainedTokenizerBase, Any]:
+    return AutoTokenizer.from_pretrained(model_name), backend.load(
+        model_name, device
+    )
+
+
 class TransformerDurationCalculator(DurationCalculator):
     type: Literal["transformer"] = "transformer"
     model_name: str = "eryk-mazus/polka-1.1b"
     min_duration: float = 0.5
     max_duration: float = 2.0
     context_window: int = 64
+    prefill_stride: PositiveInt = 16
+    batch_size: PositiveInt = 8
     device: str = "cpu"
+    backend: AnyModelBackend = Field(default_factory=TorchBackend)
     _tokenizer: PreTrainedTokenizerBase
-    _model: PreTrainedModel
-    _context_words: list[str]
+    _model: Any
+    _context: deque[list[int]]
+    _position: int
+    _past_key_values: Any
+    _past_length: int
+    _next_log_probs: Optional[torch.Tensor]
+    _previous_word: Optional[str]
     _logger: logging.Logger
 
     def model_post_init(self, context: Any, /) -> None:
-        self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-        self._model = AutoModelForCausalLM.from_pretrained(self.model_name)
-        self._model.to(self.device)
-        self._model.eval()
-        self._context_words = []
+        self._tokenizer, self._model = _load_model(
+            self.model_name, self.device, self.backend
+        )
         self._logger = logging.getLogger(__name__)
+        self.reset()
 
     def reset(self) -> None:
-        self._context_words = []
+        self._context = deque()
+        self._position = 0
+        self._past_key_values = None
+        self._past_length = 0
+        self._next_log_probs = None
+        self._previous_word = None
 
     def calculate_duration(self, word: str) -> float:
         probability = self._get_word_probability(word)
-        self._context_words.append(word)
-        if len(self._context_words) > self.context_window:
-            self._context_words = self._context_words[-self.context_window :]
+        self._previous_word = word
         return self._probability_to_duration(probability)
 
-    def _get_word_probability(self, word: str) -> float:
-        context_text = " ".join(self._context_words)
-        full_text = f"{context_text} {word}" if context_text else word
-        context_ids = (
-            self._tokenizer.encode(context_text, return_tensors="pt").to(
-                self.device
+    def calculate_durations(self, words: Sequence[str]) -> list[float]:
+        word_ids = self._split_word_ids(words)
+        stream = [*self._context, *(ids for ids in word_ids if ids)]
+        offset = self._position - len(self._context)
+        windows = []
+        start = len(self._context)
+        while start < len(stream):
+            position = offset + start
+            stride_start = position - position % self.prefill_stride
+            windows.append(
+                (
+                    self._context_start(stride_start) - offset,
+                    start,
+                    min(
+                        stride_start + self.prefill_stride - offset,
+                        len(stream),
+                    ),
+                )
             )
-            if context_text
-            else torch.tensor([[]], dtype=torch.long, device=self.device)
-        )
-        full_ids = self._tokenizer.encode(full_text, return_tensors="pt").to(
-            self.device
+            start = windows[-1][2]
+        log_probs: list[float] = []
+        for index in range(0, len(windows), self.batch_size):
+            log_probs.extend(
+                self._score_windows(
+                    stream, windows[index : index + self.batch_size]
+                )
+            )
+        self._position = offset + len(stream)
+        self._context = deque(
+            stream[
+                self._context_start(
+                    self._position - self._position % self.prefill_stride
+                )
+                - offset :
+            ]
         )
-        context_len = context_ids.shape[1]
-        target_ids = full_ids[:, context_len:]
-        if target_ids.shape[1] == 0:
+        self._past_key_values = None
+        self._next_log_probs = None
+        if words:
+            self._previous_word = words[-1]
+        scores = iter(log_probs)
+        return [
+            self._probability_to_duration(
+                math.exp(next(scores) if ids else _LOG_PROB_FLOOR)
+            )
+            for ids in word_ids
+        ]
+
+    def _get_word_probability(self, word: str) -> float:
+        word_ids = self._word_ids(word)
+        if not word_ids:
             self._logger.debug(
                 f"No target tokens for word '{word}', returning floor probability"
             )
             return math.exp(_LOG_PROB_FLOOR)
+        if (
+            not self._position % self.prefill_stride
+            and len(self._context) > self.context_window
+        ):
+            while len(self._context) > self.context_window:
+                self._context.popleft()
+            self._past_key_values = None
+        if self._past_key_values is None:
+            self._prefill()
+        log_probs = self._extend(word_ids)
+        self._context.append(word_ids)
+        self._position += 1
+        return math.exp(_mean(log_probs))
+
+    def _word_ids(self, word: str) -> list[int]:
+        (word_ids,) = self._split_word_ids((word,))
+        return word_ids
+
+    def _split_word_ids(self, words: Sequence[str]) -> list[list[int]]:
+        prefix = (
+            "" if self._previous_word is None else f"{self._previous_word} "
+        )
+        boundaries = []
+        position = len(prefix) - 1
+        for word in words:
+            boundaries.append(position)
+            position += len(word) + 1
+        encoding = self._tokenizer(
+            prefix + " ".join(words),
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+        )
+        word_ids: list[list[int]] = [[] for _ in words]
+        for token_id, (_, end) in zip(
+            encoding["input_ids"], encoding["offset_mapping"]
+        ):
+            index = bisect_left(boundaries, end) - 1
+            if index >= 0:
+                word_ids[index].append(token_id)
+        return word_ids
+
+    def _context_start(self, stride_start: int) -> int:
+        return max(stride_start - self.context_window, 0)
+
+    def _prefill(self) -> None:
+        self._next_log_probs = None
+        context_ids = [token for ids in self._context for token in ids]
+        if context_ids:
+            self._extend(context_ids)
+
+    def _extend(self, token_ids: list[int]) -> list[float]:
+        start_id = self._tokenizer.bos_token_id
+        if self._past_key_values is None:
+            self._past_length = 0
+            if start_id is not None:
+                token_ids = [start_id, *token_ids]
+        self._past_length += len(token_ids)
+        with torch.no_grad():
+            outputs = self._model(
+                torch.tensor([token_ids], device=self.device),
+                attention_mask=torch.ones(
+                    (1, self._past_length),
+                    dtype=torch.long,
+                    device=self.device,
+                ),
+                past_key_values=self._past_key_values,
+                use_cache=True,
+            )
+        log_probs = torch.log_softmax(outputs.logits[0].float(), dim=-1)
+        targets = torch.tensor(token_ids[1:], device=self.device)
+        scores: list[float] = (
+            log_probs[:-1].gather(1, targets[:, None])[:, 0].tolist()
+        )
+        if self._next_log_probs is not None:
+            scores.insert(0, self._next_log_probs[token_ids[0]].item())
+        self._past_key_values = outputs.past_key_values
+        self._next_log_probs = log_probs[-1]
+        return scores
+
+    def _score_windows(
+        self,
+        stream: Sequence[list[int]],
+        windows: Sequence[tuple[int, int, int]],
+    ) -> list[float]:
+        start_id = self._tokenizer.bos_token_id
+        sequences: list[list[int]] = []
+        spans: list[list[tuple[int, int]]] = []
+        for context_start, start, end in windows:
+            tokens = [] if start_id is None else [start_id]
+            for ids in stream[context_start:start]:
+                tokens.extend(ids)
+            spans.append([])
+            for ids in stream[start:end]:
+                spans[-1].append((len(tokens), len(tokens) + len(ids)))
+                tokens.extend(ids)
+            sequences.append(tokens)
+        length = max(map(len, sequences))
+        input_ids = torch.tensor(
+            [tokens + [0] * (length - len(tokens)) for tokens in sequences],
+            device=self.device,
+        )
+        attention_mask = torch.tensor(
+            [
+                [1] * len(tokens) + [0] * (length - len(tokens))
+                for tokens in sequences
+            ],
+            device=self.device,
+        )
         with torch.no_grad():
-            outputs = self._model(full_ids)
-        logits = outputs.logits
-        log_probs = torch.log_softmax(logits, dim=-1)
-        total_log_prob = 0.0
-        for i in range(target_ids.shape[1]):
-            token_idx = context_len + i
-            token_id = target_ids[0, i].item()
-            total_log_prob += log_probs[0, token_idx - 1, token_id].item()
-        mean_log_prob = total_log_prob / target_ids.shape[1]
-        return math.exp(mean_log_prob)
+            logits = (
+                self._model(input_ids, attention_mask=attention_mask)
+                .logits[:, :-1]
+                .float()
+            )
+        token_log_probs = (
+            logits.gather(2, input_ids[:, 1:, None])[..., 0]
+            - logits.logsumexp(dim=-1)
+        ).tolist()
+        return [
+            _mean(row[max(first, 1) - 1 : end - 1])
+            for row, word_spans in zip(token_log_probs, spans)
+            for first, end in word_spans
+        ]
 
     def _probability_to_duration(self, probability: float) -> float:
         log_prob = max(
@@ -85,3 +259,9 @@ class TransformerDurationCalculator(DurationCalculator):
             self.max_duration - self.min_duration
         )
         return max(self.min_duration, min(self.max_duration, duration))
+
+
+def _mean(log_probs: Sequence[float]) -> float:
+    if not log_probs:
+        return _LOG_PROB_FLOOR
+    return sum(log_probs) / len(log_probs)
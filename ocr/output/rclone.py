@@ -1,4 +1,5 @@
 import os
+from collections.abc import AsyncIterable
 from pathlib import Path
 from typing import Literal
 
@@ -14,4 +15,13 @@ class RClone(Output):
 
     async def _save_results(self, result: str) -> None:
         await self.local_output.save_results(result)
+        self._copy()
+
+    async def save_stream(self, pages: AsyncIterable[str]) -> None:
+        await self.local_output.save_stream(
+            self.apply_transformations_stream(pages)
+        )
+        self._copy()
+
+    def _copy(self) -> None:
         os.system(f"rclone copy {self.shared_directory} {self.output_path}")
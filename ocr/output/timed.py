@@ -1,9 +1,12 @@
+from collections.abc import AsyncIterable
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Literal
 
 from ocr.output._base import Output
 from ocr.output.duration import AnyDurationCalculator
 from ocr.output.duration import DefaultDurationCalculator
+from ocr.streaming import iterate
 from pydantic import BaseModel
 from pydantic import Field
 
@@ -21,15 +24,28 @@ class TimedOutput(Output):
     )
 
     async def _save_results(self, result: str) -> None:
+        await self._save_pages(iterate((result,)))
+
+    async def save_stream(self, pages: AsyncIterable[str]) -> None:
+        await self._save_pages(self.apply_transformations_stream(pages))
+
+    async def _save_pages(self, pages: AsyncIterable[str]) -> None:
         self.duration_calculator.reset()
         self.path.parent.mkdir(exist_ok=True, parents=True)
-        words = result.split()
-        self.path.write_text(
-            "\n".join(
-                WordDurationPair(
-                    word=word,
-                    duration=self.duration_calculator.calculate_duration(word),
-                ).model_dump_json()
-                for word in words
+        with self.path.open("w") as file:
+            separator = ""
+            async for page in pages:
+                for pair in await self._time_words(page.split()):
+                    file.write(separator + pair.model_dump_json())
+                    separator = "\n"
+                file.flush()
+
+    async def _time_words(
+        self, words: Sequence[str]
+    ) -> list[WordDurationPair]:
+        return [
+            WordDurationPair(word=word, duration=duration)
+            for word, duration in zip(
+                words, self.duration_calculator.calculate_durations(words)
             )
-        )
+        ]
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import Literal
 
 from ocr.output.timed import TimedOutput
@@ -10,19 +11,17 @@ class TimedSplitOutput(TimedOutput):
     type: Literal["timed-split"] = "timed-split"  # type: ignore[assignment]
     word_splitter: SplitLongWords = Field(default_factory=SplitLongWords)
 
-    async def _save_results(self, result: str) -> None:
-        self.duration_calculator.reset()
-        self.path.parent.mkdir(exist_ok=True, parents=True)
-        words = result.split()
-        pairs: list[str] = []
-        for word in words:
-            duration = self.duration_calculator.calculate_duration(word)
+    async def _time_words(
+        self, words: Sequence[str]
+    ) -> list[WordDurationPair]:
+        pairs: list[WordDurationPair] = []
+        for word, duration in zip(
+            words, self.duration_calculator.calculate_durations(words)
+        ):
             split_result = await self.word_splitter.transform(word)
             parts = split_result.split()
             pairs.extend(
-                WordDurationPair(
-                    word=part, duration=duration / len(parts)
-                ).model_dump_json()
+                WordDurationPair(word=part, duration=duration / len(parts))
                 for part in parts
             )
-        self.path.write_text("\n".join(pairs))
+        return pairs
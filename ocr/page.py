@@ -0,0 +1,34 @@
+import mmap
+from pathlib import Path
+from typing import NamedTuple
+from typing import Optional
+from typing import TypeAlias
+from typing import Union
+
+
+class Page(NamedTuple):
+    name: str
+    number: int
+    content: bytes
+    text: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Page(name={self.name!r}, number={self.number}, "
+            f"size={len(self.content)})"
+        )
+
+    def __str__(self) -> str:
+        return self.name
+
+
+PageSource: TypeAlias = Union[Path, Page]
+
+
+def read_page(page: PageSource) -> bytes | memoryview:
+    if isinstance(page, Page):
+        return page.content
+    with page.open("rb") as file:
+        if not page.stat().st_size:
+            return b""
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
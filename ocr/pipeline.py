@@ -0,0 +1,117 @@
+from collections.abc import AsyncIterator
+from typing import Any
+from typing import Optional
+
+from ocr.input import AnyInput
+from ocr.journal import Journal
+from ocr.output import AnyOutput
+from ocr.page import Page
+from ocr.page import PageSource
+from ocr.streaming import broadcast
+from ocr.text_extractor import TextExtractor
+from ocr.transfomations import TransformationsApplier
+
+
+class Pipeline(TransformationsApplier):
+    input: AnyInput
+    outputs: tuple[AnyOutput, ...]
+    journal: Optional[Journal] = None
+    _n_pages: int
+    _n_characters: int
+
+    def model_post_init(self, context: Any, /) -> None:
+        document_level = [
+            t.type for t in self.transformations if not t.page_local
+        ]
+        if self.input.continuous and document_level:
+            raise ValueError(
+                "Document-level transformations never finish on a "
+                f"never-ending input: {document_level}"
+            )
+        self._n_pages = 0
+        self._n_characters = 0
+
+    @property
+    def n_pages(self) -> int:
+        return self._n_pages
+
+    @property
+    def n_characters(self) -> int:
+        return self._n_characters
+
+    async def run(
+        self, text_extractor: TextExtractor, streaming: bool = False
+    ) -> None:
+        if self.journal is None:
+            await self._run(text_extractor, streaming)
+            return
+        with self.journal.session():
+            self._use_journal(self.journal)
+            try:
+                await self._run(text_extractor, streaming)
+            finally:
+                self._use_journal(None)
+
+    async def _run(
+        self, text_extractor: TextExtractor, streaming: bool
+    ) -> None:
+        images = self._resume_stream(self.input.iter_images())
+        first_image = await anext(images, None)
+        if first_image is None:
+            return
+        texts = text_extractor.iter_texts(
+            _prepend(first_image, images),
+            self.input.release_image,
+            self._record,
+        )
+        if streaming or self.input.continuous:
+            await broadcast(
+                self.apply_transformations_stream(texts),
+                [output.save_stream for output in self.outputs],
+            )
+            return
+        transformed_result = await self.apply_transformations(
+            "\n".join([text async for text in texts])
+        )
+        for output in self.outputs:
+            await output.save_results(transformed_result)
+
+    def _record(self, image: PageSource, text: str) -> None:
+        self._n_pages += 1
+        self._n_characters += len(text)
+        self.input.record_text(image, text)
+        if self.journal is not None:
+            self.journal.record_page(image.name, text)
+
+    def _use_journal(self, journal: Optional[Journal]) -> None:
+        self.use_journal(journal)
+        self.input.use_journal(journal)
+        for output in self.outputs:
+            output.use_journal(journal)
+
+    def _resume(self, number: int, image: PageSource) -> PageSource:
+        if self.journal is None or (
+            isinstance(image, Page) and image.text is not None
+        ):
+            return image
+        text = self.journal.page_text(image.name)
+        if text is None:
+            return image
+        self.input.release_image(image)
+        return Page(image.name, number, b"", text)
+
+    async def _resume_stream(
+        self, images: AsyncIterator[PageSource]
+    ) -> AsyncIterator[PageSource]:
+        number = 0
+        async for image in images:
+            yield self._resume(number, image)
+            number += 1
+
+
+async def _prepend(
+    first_image: PageSource, images: AsyncIterator[PageSource]
+) -> AsyncIterator[PageSource]:
+    yield first_image
+    async for image in images:
+        yield image
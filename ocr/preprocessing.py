@@ -0,0 +1,104 @@
+import logging
+import threading
+from enum import StrEnum
+from io import BytesIO
+from typing import Annotated
+from typing import Any
+from typing import Optional
+
+from PIL import Image
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import Field
+from pydantic import PositiveInt
+
+_logger = logging.getLogger(__name__)
+
+
+class ImageFormat(StrEnum):
+    PNG = "PNG"
+    JPEG = "JPEG"
+    WEBP = "WEBP"
+
+
+class PagePreprocessor(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    target_dpi: Optional[PositiveInt] = None
+    source_dpi: Optional[PositiveInt] = None
+    max_dimension: Optional[PositiveInt] = None
+    grayscale: bool = False
+    binarization_threshold: Optional[Annotated[int, Field(ge=0, le=255)]] = (
+        None
+    )
+    format: ImageFormat = ImageFormat.PNG
+    quality: Annotated[int, Field(ge=1, le=100)] = 85
+    _lock: threading.Lock
+    _n_pages: int
+    _bytes_before: int
+    _bytes_after: int
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._lock = threading.Lock()
+        self._n_pages = 0
+        self._bytes_before = 0
+        self._bytes_after = 0
+
+    def process(self, content: bytes | memoryview, name: str) -> bytes:
+        with Image.open(BytesIO(content)) as image:
+            processed = self._transform(image)
+            if self.format != ImageFormat.PNG and processed.mode not in (
+                "L",
+                "RGB",
+            ):
+                processed = processed.convert("RGB")
+            options: dict[str, bool | int] = (
+                {"optimize": True}
+                if self.format == ImageFormat.PNG
+                else {"quality": self.quality}
+            )
+            buffer = BytesIO()
+            processed.save(buffer, format=self.format.value, **options)
+        result = buffer.getvalue()
+        with self._lock:
+            self._n_pages += 1
+            self._bytes_before += len(content)
+            self._bytes_after += len(result)
+        _logger.debug(
+            f"Preprocessed {name}: {len(content)} -> {len(result)} bytes"
+        )
+        return result
+
+    def log_stats(self) -> None:
+        if not self._n_pages:
+            return
+        _logger.info(
+            f"Preprocessed {self._n_pages} pages: "
+            f"{self._bytes_before / self._n_pages:.0f} -> "
+            f"{self._bytes_after / self._n_pages:.0f} bytes per page "
+            f"({self._bytes_after / self._bytes_before:.1%} of original)"
+        )
+
+    def _transform(self, image: Image.Image) -> Image.Image:
+        scale = 1.0
+        dpi = image.info.get("dpi")
+        source_dpi = float(dpi[0]) if dpi else self.source_dpi
+        if self.target_dpi is not None and source_dpi:
+            scale = min(scale, self.target_dpi / source_dpi)
+        if self.max_dimension is not None:
+            scale = min(scale, self.max_dimension / max(image.size))
+        if scale < 1.0:
+            image = image.resize(
+                (
+                    max(1, round(image.width * scale)),
+                    max(1, round(image.height * scale)),
+                ),
+                Image.Resampling.LANCZOS,
+            )
+        if self.grayscale or self.binarization_threshold is not None:
+            image = image.convert("L")
+        if self.binarization_threshold is not None:
+            threshold = self.binarization_threshold
+            image = image.point(
+                [0 if value < threshold else 255 for value in range(256)]
+            )
+        return image
@@ -0,0 +1,40 @@
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic import SecretStr
+
+
+class SharedResource(BaseModel):
+    def resource_key(self) -> str:
+        return json.dumps(
+            [type(self).__qualname__, self.model_dump()],
+            default=_reveal,
+            sort_keys=True,
+        )
+
+
+def share_resources(models: Iterable[BaseModel]) -> dict[str, SharedResource]:
+    resources: dict[str, SharedResource] = {}
+    for model in models:
+        _share(model, resources)
+    return resources
+
+
+def _share(model: BaseModel, resources: dict[str, SharedResource]) -> None:
+    for name, value in model:
+        if isinstance(value, SharedResource):
+            shared = resources.setdefault(value.resource_key(), value)
+            if shared is not value:
+                setattr(model, name, shared)
+            continue
+        for item in value if isinstance(value, tuple) else (value,):
+            if isinstance(item, BaseModel):
+                _share(item, resources)
+
+
+def _reveal(value: Any) -> str:
+    if isinstance(value, SecretStr):
+        return value.get_secret_value()
+    return str(value)
@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import AsyncIterable
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from collections.abc import Coroutine
+from collections.abc import Iterable
+from collections.abc import Sequence
+from typing import Any
+from typing import Optional
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+async def iterate(items: Iterable[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
+
+
+async def split_lines(deltas: AsyncIterable[str]) -> AsyncIterator[str]:
+    buffer = ""
+    async for delta in deltas:
+        *lines, buffer = (buffer + delta).split("\n")
+        for line in lines:
+            yield line
+    yield buffer
+
+
+async def broadcast(
+    items: AsyncIterable[T],
+    consumers: Sequence[
+        Callable[[AsyncIterable[T]], Coroutine[Any, Any, None]]
+    ],
+    buffer_size: int = 16,
+) -> None:
+    queues: list[asyncio.Queue[Optional[T]]] = [
+        asyncio.Queue(maxsize=buffer_size) for _ in consumers
+    ]
+
+    async def produce() -> None:
+        async for item in items:
+            for queue in queues:
+                await queue.put(item)
+        for queue in queues:
+            await queue.put(None)
+
+    async def drain(queue: asyncio.Queue[Optional[T]]) -> AsyncIterator[T]:
+        while (item := await queue.get()) is not None:
+            yield item
+
+    async with asyncio.TaskGroup() as group:
+        group.create_task(produce())
+        for consumer, queue in zip(consumers, queues):
+            group.create_task(consumer(drain(queue)))
@@ -1,26 +1,193 @@
 import asyncio
+import logging
 from asyncio import Semaphore
+from asyncio import Task
+from collections.abc import AsyncIterable
+from collections.abc import AsyncIterator
+from collections.abc import Callable
 from collections.abc import Iterable
-from pathlib import Path
+from collections.abc import Sequence
+from contextlib import asynccontextmanager
+from typing import Annotated
+from typing import Any
+from typing import Optional
 
-from ocr.vision_client import VisionClient
+from ocr.page import PageSource
+from ocr.streaming import iterate
+from ocr.vision_client import AnyVisionClient
+from ocr.vision_client import MAX_BATCH_SIZE
 from pydantic import BaseModel
+from pydantic import Field
+from pydantic import PositiveFloat
 from pydantic import PositiveInt
 
+_logger = logging.getLogger(__name__)
+_Batch = tuple[tuple[PageSource, ...], Task[Sequence[str | Exception]]]
+
+
+class ExtractionStatus(BaseModel):
+    queued: int = 0
+    in_flight: int = 0
+    done: int = 0
+    failed: int = 0
+
 
 class TextExtractor(BaseModel):
-    vision_client: VisionClient
+    vision_client: AnyVisionClient
     n_tasks: PositiveInt = 12
     return_exceptions: bool = False
+    batch_size: Annotated[PositiveInt, Field(le=MAX_BATCH_SIZE)] = 1
+    batch_timeout: PositiveFloat = 1.0
+    _status: ExtractionStatus
+    _semaphore: Optional[Semaphore]
 
-    async def extract_from_images(self, images: Iterable[Path]) -> str:
-        tasks = [self._extract_single(image) for image in images]
-        async with Semaphore(self.n_tasks):
-            results = await asyncio.gather(*tasks)
-            return "\n".join(results)
+    def model_post_init(self, context: Any, /) -> None:
+        self._status = ExtractionStatus()
+        self._semaphore = None
 
-    async def _extract_single(self, image_path: Path) -> str:
-        text = await asyncio.to_thread(
-            self.vision_client.extract_text, image_path
+    @property
+    def status(self) -> ExtractionStatus:
+        return self._status.model_copy()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Semaphore]:
+        if self._semaphore is not None:
+            yield self._semaphore
+            return
+        async with self.vision_client.session(self.n_tasks):
+            self._semaphore = Semaphore(self.n_tasks)
+            try:
+                yield self._semaphore
+            finally:
+                self._semaphore = None
+
+    async def extract_from_images(
+        self,
+        images: Iterable[PageSource],
+        release: Optional[Callable[[PageSource], None]] = None,
+        record: Optional[Callable[[PageSource, str], None]] = None,
+    ) -> str:
+        return "\n".join(
+            [
+                text
+                async for text in self.iter_texts(
+                    iterate(images), release, record
+                )
+            ]
         )
-        return text
+
+    async def iter_texts(
+        self,
+        images: AsyncIterable[PageSource],
+        release: Optional[Callable[[PageSource], None]] = None,
+        record: Optional[Callable[[PageSource, str], None]] = None,
+    ) -> AsyncIterator[str]:
+        batches: asyncio.Queue[Optional[_Batch]] = asyncio.Queue(
+            maxsize=self.n_tasks
+        )
+        async with self.session() as semaphore:
+            producer = asyncio.create_task(
+                self._schedule_batches(images, semaphore, batches)
+            )
+            try:
+                while (batch := await batches.get()) is not None:
+                    batch_images, task = batch
+                    results = await task
+                    if release is not None:
+                        for image in batch_images:
+                            release(image)
+                    for image, result in zip(batch_images, results):
+                        if not isinstance(result, Exception):
+                            if record is not None:
+                                record(image, result)
+                            yield result
+                            continue
+                        if not self.return_exceptions:
+                            raise result
+                        _logger.error(
+                            f"Failed to extract text from {image}: {result}"
+                        )
+                await producer
+            finally:
+                producer.cancel()
+                while not batches.empty():
+                    if (batch := batches.get_nowait()) is not None:
+                        batch[1].cancel()
+
+    async def _schedule_batches(
+        self,
+        images: AsyncIterable[PageSource],
+        semaphore: Semaphore,
+        batches: "asyncio.Queue[Optional[_Batch]]",
+    ) -> None:
+        batch: list[PageSource] = []
+        iterator = aiter(images)
+        try:
+            while True:
+                next_image = asyncio.ensure_future(anext(iterator, None))
+                try:
+                    if batch:
+                        done, _ = await asyncio.wait(
+                            (next_image,), timeout=self.batch_timeout
+                        )
+                        if not done:
+                            await self._schedule_batch(
+                                tuple(batch), semaphore, batches
+                            )
+                            batch = []
+                    image = await next_image
+                finally:
+                    next_image.cancel()
+                if image is None:
+                    break
+                self._status.queued += 1
+                batch.append(image)
+                if len(batch) == self.batch_size:
+                    await self._schedule_batch(
+                        tuple(batch), semaphore, batches
+                    )
+                    batch = []
+            if batch:
+                await self._schedule_batch(tuple(batch), semaphore, batches)
+        except Exception:
+            await batches.put(None)
+            raise
+        await batches.put(None)
+
+    async def _schedule_batch(
+        self,
+        images: tuple[PageSource, ...],
+        semaphore: Semaphore,
+        batches: "asyncio.Queue[Optional[_Batch]]",
+    ) -> None:
+        task = asyncio.create_task(self._extract_batch(images, semaphore))
+        try:
+            await batches.put((images, task))
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+    async def _extract_batch(
+        self, images: Sequence[PageSource], semaphore: Semaphore
+    ) -> Sequence[str | Exception]:
+        async with semaphore:
+            self._status.queued -= len(images)
+            self._status.in_flight += len(images)
+            try:
+                results = await self._extract(images)
+            finally:
+                self._status.in_flight -= len(images)
+        failed = sum(isinstance(result, Exception) for result in results)
+        self._status.failed += failed
+        self._status.done += len(results) - failed
+        return results
+
+    async def _extract(
+        self, images: Sequence[PageSource]
+    ) -> Sequence[str | Exception]:
+        try:
+            if len(images) == 1:
+                return (await self.vision_client.extract_text(images[0]),)
+            return await self.vision_client.extract_texts(images)
+        except Exception as e:
+            return len(images) * (e,)
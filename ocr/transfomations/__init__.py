@@ -1,8 +1,14 @@
 import logging
+from collections.abc import AsyncIterable
+from collections.abc import AsyncIterator
+from collections.abc import Iterable
+from itertools import takewhile
 from typing import Annotated
+from typing import Optional
 from typing import TypeAlias
 from typing import Union
 
+from ocr.journal import Journal
 from ocr.transfomations.duplicate_long_words import DuplicateLongWords
 from ocr.transfomations.join_words_moving_center import JoinWordsMovingCenter
 from ocr.transfomations.transformation import Transformation
@@ -46,11 +52,71 @@ except ImportError as e:
 
 class TransformationsApplier(BaseModel):
     transformations: tuple[AnyTransformation, ...] = ()
+    _journal: Optional[Journal] = None
+
+    def use_journal(self, journal: Optional[Journal]) -> None:
+        self._journal = journal
 
     async def apply_transformations(self, text: str) -> str:
-        for t in self.transformations:
-            text = await t.transform(text)
+        return await self._apply(self.transformations, text)
+
+    async def apply_transformations_stream(
+        self, pages: AsyncIterable[str]
+    ) -> AsyncIterator[str]:
+        page_local = tuple(
+            takewhile(lambda t: t.page_local, self.transformations)
+        )
+        document_level = self.transformations[len(page_local) :]
+        if not document_level:
+            async for page in pages:
+                yield await self._apply(page_local, page)
+            return
+        text = "\n".join(
+            [await self._apply(page_local, page) async for page in pages]
+        )
+        *buffered, last = document_level
+        text = await self._apply(buffered, text)
+        async for piece in self._transform_stream(last, text):
+            yield piece
+
+    async def _apply(
+        self, transformations: Iterable[Transformation], text: str
+    ) -> str:
+        for t in transformations:
+            text = await self._transform(t, text)
         return text
 
+    async def _transform_stream(
+        self, transformation: Transformation, text: str
+    ) -> AsyncIterator[str]:
+        if self._journal is None or not transformation.checkpointed:
+            async for piece in transformation.transform_stream(text):
+                yield piece
+            return
+        transformed = self._journal.transformed_text(transformation, text)
+        if transformed is not None:
+            yield transformed
+            return
+        pieces = []
+        async for piece in transformation.transform_stream(text):
+            pieces.append(piece)
+            yield piece
+        self._journal.record_transformation(
+            transformation, text, "\n".join(pieces)
+        )
+
+    async def _transform(
+        self, transformation: Transformation, text: str
+    ) -> str:
+        if self._journal is None or not transformation.checkpointed:
+            return await transformation.transform(text)
+        transformed = self._journal.transformed_text(transformation, text)
+        if transformed is None:
+            transformed = await transformation.transform(text)
+            self._journal.record_transformation(
+                transformation, text, transformed
+            )
+        return transformed
+
 
 __all__.append("TransformationsApplier")
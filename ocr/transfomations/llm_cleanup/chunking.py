@@ -0,0 +1,71 @@
+from collections.abc import Sequence
+from difflib import SequenceMatcher
+from typing import Optional
+
+_SIMILARITY_THRESHOLD = 0.9
+
+
+def split_chunks(
+    text: str, max_characters: float, overlap_lines: int
+) -> list[str]:
+    lines = text.split("\n")
+    chunks: list[str] = []
+    start = 0
+    while start < len(lines):
+        end = start + 1
+        size = len(lines[start])
+        while (
+            end < len(lines) and size + 1 + len(lines[end]) <= max_characters
+        ):
+            size += 1 + len(lines[end])
+            end += 1
+        if end < len(lines):
+            blank = _last_blank_line(lines, (start + end) // 2, end)
+            if blank is not None:
+                end = blank + 1
+        context_start = max(start - overlap_lines, 0)
+        chunks.append("\n".join(lines[context_start:end]))
+        start = end
+    return chunks
+
+
+def continue_lines(
+    lines: Sequence[str], chunk: str, overlap_lines: int
+) -> list[str]:
+    chunk_lines = chunk.split("\n")
+    window = 2 * overlap_lines
+    if lines and window:
+        del chunk_lines[
+            : _overlap_length(lines[-window:], chunk_lines[:window])
+        ]
+    return chunk_lines
+
+
+def _last_blank_line(
+    lines: Sequence[str], start: int, end: int
+) -> Optional[int]:
+    return next(
+        (
+            index
+            for index in range(end - 1, start - 1, -1)
+            if not lines[index].strip()
+        ),
+        None,
+    )
+
+
+def _overlap_length(tail: Sequence[str], head: Sequence[str]) -> int:
+    scores = {
+        length: (
+            SequenceMatcher(
+                None,
+                "\n".join(line.strip() for line in tail[-length:]),
+                "\n".join(line.strip() for line in head[:length]),
+            ).ratio()
+        )
+        for length in range(1, min(len(tail), len(head)) + 1)
+    }
+    length, score = max(
+        scores.items(), key=lambda item: (item[1], item[0]), default=(0, 0.0)
+    )
+    return length if score >= _SIMILARITY_THRESHOLD else 0
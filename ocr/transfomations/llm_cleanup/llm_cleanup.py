@@ -1,15 +1,27 @@
+import asyncio
+import random
+from collections.abc import AsyncIterator
 from enum import IntEnum
 from logging import getLogger
 from logging import INFO
 from logging import Logger
 from typing import Any
+from typing import ClassVar
 from typing import Literal
+from typing import Optional
 
+from ocr.streaming import split_lines
+from ocr.transfomations.llm_cleanup.chunking import continue_lines
+from ocr.transfomations.llm_cleanup.chunking import split_chunks
 from ocr.transfomations.llm_cleanup.provider import Anthropic
 from ocr.transfomations.llm_cleanup.provider import AnyProvider
 from ocr.transfomations.llm_cleanup.provider.message import Message
 from ocr.transfomations.transformation import Transformation
 from pydantic import Field
+from pydantic import NonNegativeFloat
+from pydantic import NonNegativeInt
+from pydantic import PositiveFloat
+from pydantic import PositiveInt
 
 
 class LogLevel(IntEnum):
@@ -23,8 +35,15 @@ class LogLevel(IntEnum):
 
 class LLMCleanup(Transformation):
     type: Literal["llm-cleanup"] = "llm-cleanup"
+    checkpointed: ClassVar[bool] = True
     logging_level: LogLevel = LogLevel(INFO)
     llm_provider: AnyProvider = Field(default_factory=Anthropic)
+    chunk_tokens: Optional[PositiveInt] = None
+    characters_per_token: PositiveFloat = 3.0
+    overlap_lines: NonNegativeInt = 2
+    max_concurrency: PositiveInt = 4
+    num_retries: NonNegativeInt = 3
+    retry_delay: NonNegativeFloat = 1.0
     _logger: Logger
 
     def model_post_init(self, context: Any, /) -> None:
@@ -73,13 +92,109 @@ Don't include example in response
     """
 
     async def transform(self, text: str) -> str:
-        cleaned_content: str = await self.llm_provider.clean(
-            messages=(
-                Message("system", self.system_prompt),
-                Message("user", text),
-            ),
-        )
+        if self.chunk_tokens is None:
+            cleaned_content = await self._clean(text)
+        else:
+            cleaned_content = "\n".join(
+                [
+                    line
+                    async for line in self._clean_chunks(
+                        text, self.chunk_tokens
+                    )
+                ]
+            )
         self._logger.debug(
             f"Cleaned data of length {len(text)} to {len(cleaned_content)} characters"
         )
+        self.llm_provider.log_stats()
+        return cleaned_content
+
+    async def transform_stream(self, text: str) -> AsyncIterator[str]:
+        if self.chunk_tokens is None:
+            lines = split_lines(self._clean_stream(text))
+        else:
+            lines = self._clean_chunks(text, self.chunk_tokens)
+        async for line in lines:
+            yield line
+        self.llm_provider.log_stats()
+
+    async def _clean_chunks(
+        self, text: str, chunk_tokens: int
+    ) -> AsyncIterator[str]:
+        chunks = split_chunks(
+            text,
+            chunk_tokens * self.characters_per_token,
+            self.overlap_lines,
+        )
+        semaphore = asyncio.Semaphore(
+            self.max_concurrency
+            if self.llm_provider.batch is None
+            else len(chunks)
+        )
+
+        async def clean_chunk(index: int, chunk: str) -> str:
+            async with semaphore:
+                cleaned = await self._clean(chunk)
+            self._logger.debug(
+                f"Cleaned chunk {index + 1}/{len(chunks)} of length {len(chunk)}"
+            )
+            return cleaned
+
+        tasks = [
+            asyncio.create_task(clean_chunk(index, chunk))
+            for index, chunk in enumerate(chunks)
+        ]
+        try:
+            tail: list[str] = []
+            for task in tasks:
+                lines = continue_lines(tail, await task, self.overlap_lines)
+                for line in lines:
+                    yield line
+                tail = (
+                    (tail + lines)[-2 * self.overlap_lines :]
+                    if self.overlap_lines
+                    else []
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _clean(self, text: str) -> str:
+        messages = self._messages(text)
+        for attempt in range(self.num_retries):
+            try:
+                cleaned_content: str = await self.llm_provider.clean(
+                    messages=messages
+                )
+                return cleaned_content
+            except Exception as e:
+                await self._backoff(attempt, e)
+        cleaned_content = await self.llm_provider.clean(messages=messages)
         return cleaned_content
+
+    async def _clean_stream(self, text: str) -> AsyncIterator[str]:
+        messages = self._messages(text)
+        for attempt in range(self.num_retries + 1):
+            started = False
+            try:
+                async for delta in self.llm_provider.stream(messages):
+                    started = True
+                    yield delta
+                return
+            except Exception as e:
+                if started or attempt == self.num_retries:
+                    raise
+                await self._backoff(attempt, e)
+
+    async def _backoff(self, attempt: int, error: Exception) -> None:
+        delay = self.retry_delay * 2**attempt * random.random()
+        self._logger.warning(
+            f"LLM cleanup failed ({error}), retrying in {delay:.2f}s"
+        )
+        await asyncio.sleep(delay)
+
+    def _messages(self, text: str) -> tuple[Message, ...]:
+        return (
+            Message("system", self.system_prompt),
+            Message("user", text),
+        )
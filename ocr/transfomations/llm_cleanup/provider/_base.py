@@ -1,17 +1,87 @@
+import hashlib
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import AsyncIterator
 from collections.abc import Iterable
+from collections.abc import Sequence
 from typing import Optional
 
+from ocr.cache import DiskCache
+from ocr.resources import SharedResource
+from ocr.transfomations.llm_cleanup.provider.batch import BatchBackend
+from ocr.transfomations.llm_cleanup.provider.batch import BatchMode
 from ocr.transfomations.llm_cleanup.provider.message import Message
-from pydantic import BaseModel
 from pydantic import PositiveFloat
 
 
-class LLMProvider(BaseModel, ABC):
+class LLMProvider(SharedResource, BatchBackend, ABC):
     type: str
+    model: str
+    base_url: Optional[str] = None
     timeout: Optional[PositiveFloat] = None
+    cache: Optional[DiskCache] = None
+    bypass_cache: bool = False
+    batch: Optional[BatchMode] = None
 
-    @abstractmethod
     async def clean(self, messages: Iterable[Message]) -> str:
+        messages = tuple(messages)
+        if self.cache is None:
+            return await self._complete(messages)
+        key = self._cache_key(messages)
+        if not self.bypass_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        cleaned = await self._complete(messages)
+        self.cache.set(key, cleaned)
+        return cleaned
+
+    async def stream(self, messages: Iterable[Message]) -> AsyncIterator[str]:
+        messages = tuple(messages)
+        if self.batch is not None:
+            yield await self.clean(messages)
+            return
+        if self.cache is None:
+            async for delta in self._stream(messages):
+                yield delta
+            return
+        key = self._cache_key(messages)
+        if not self.bypass_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        deltas = []
+        async for delta in self._stream(messages):
+            deltas.append(delta)
+            yield delta
+        self.cache.set(key, "".join(deltas))
+
+    def log_stats(self) -> None:
+        if self.cache is not None:
+            self.cache.log_stats("LLM cleanup")
+
+    async def _complete(self, messages: Sequence[Message]) -> str:
+        if self.batch is None:
+            return await self._clean(messages)
+        return await self.batch.complete(
+            self, self._cache_key(messages), messages
+        )
+
+    async def _clean(self, messages: Sequence[Message]) -> str:
+        return "".join([delta async for delta in self._stream(messages)])
+
+    @abstractmethod
+    def _stream(self, messages: Sequence[Message]) -> AsyncIterator[str]:
         pass
+
+    def _cache_key(self, messages: Sequence[Message]) -> str:
+        digest = hashlib.sha256(f"{self.type}\0{self.model}".encode())
+        for message in messages:
+            digest.update(
+                b"\0"
+                + message.role.encode()
+                + b"\0"
+                + hashlib.sha256(message.content.encode()).digest()
+            )
+        return digest.hexdigest()
@@ -1,15 +1,25 @@
-from collections.abc import Iterable
+import logging
+import time
+from collections.abc import AsyncIterator
+from collections.abc import Mapping
+from collections.abc import Sequence
 from typing import Annotated
 from typing import Any
 from typing import Literal
 
 from anthropic import AsyncAnthropic
+from anthropic.types import TextBlockParam
+from anthropic.types import Usage
 from ocr.transfomations.llm_cleanup.provider._base import LLMProvider
+from ocr.transfomations.llm_cleanup.provider.batch import BatchRequestError
 from ocr.transfomations.llm_cleanup.provider.message import Message
 from pydantic import AfterValidator
+from pydantic import BaseModel
 from pydantic import PositiveInt
 from pydantic import SecretStr
 
+_logger = logging.getLogger(__name__)
+
 
 def _validate_api_key(key: SecretStr) -> SecretStr:
     if not key.get_secret_value():
@@ -17,6 +27,16 @@ def _validate_api_key(key: SecretStr) -> SecretStr:
     return key
 
 
+class TokenUsage(BaseModel):
+    requests: int = 0
+    seconds: float = 0.0
+    first_token_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0
+    cache_read_input_tokens: int = 0
+
+
 class Anthropic(LLMProvider):
     type: Literal["anthropic"] = "anthropic"
     anthropic_api_key: Annotated[
@@ -25,27 +45,151 @@ class Anthropic(LLMProvider):
     _client: AsyncAnthropic
     model: str = "claude-haiku-4-5"
     max_tokens: PositiveInt = 64000
+    prompt_caching: bool = False
+    _usage: TokenUsage
 
     def model_post_init(self, context: Any, /) -> None:
         self._client = AsyncAnthropic(
             api_key=self.anthropic_api_key.get_secret_value(),
+            base_url=self.base_url,
             timeout=self.timeout,
         )
+        self._usage = TokenUsage()
+
+    @property
+    def usage(self) -> TokenUsage:
+        return self._usage.model_copy()
+
+    def log_stats(self) -> None:
+        super().log_stats()
+        usage = self._usage
+        if not usage.requests:
+            return
+        _logger.info(
+            f"Anthropic usage: {usage.requests} requests, "
+            f"{usage.input_tokens} input tokens, "
+            f"{usage.cache_read_input_tokens} cache read tokens, "
+            f"{usage.cache_creation_input_tokens} cache write tokens, "
+            f"{usage.output_tokens} output tokens, "
+            f"{usage.first_token_seconds / usage.requests:.2f}s average "
+            f"time to first token, "
+            f"{usage.seconds / usage.requests:.2f}s average latency"
+        )
+        if self.prompt_caching and not (
+            usage.cache_creation_input_tokens or usage.cache_read_input_tokens
+        ):
+            _logger.warning(
+                "Prompt caching is enabled but nothing was cached. Anthropic "
+                "only caches prompt prefixes above a model-specific minimum "
+                "length (1024-4096 tokens), so the system prompt is probably "
+                "too short."
+            )
+
+    async def submit_batch(
+        self, requests: Mapping[str, Sequence[Message]]
+    ) -> str:
+        batch = await self._client.messages.batches.create(
+            requests=[
+                {"custom_id": key, "params": self._params(messages)}  # type: ignore[typeddict-item,unused-ignore]
+                for key, messages in requests.items()
+            ]
+        )
+        return str(batch.id)
+
+    async def batch_finished(self, batch_id: str) -> bool:
+        batch = await self._client.messages.batches.retrieve(batch_id)
+        return bool(batch.processing_status == "ended")
 
-    async def clean(self, messages: Iterable[Message]) -> str:
-        messages_list = list(messages)
-        system_messages = [m for m in messages_list if m.role == "system"]
-        user_messages = [m for m in messages_list if m.role != "system"]
+    async def batch_results(
+        self, batch_id: str
+    ) -> dict[str, str | BatchRequestError]:
+        results: dict[str, str | BatchRequestError] = {}
+        async for entry in await self._client.messages.batches.results(
+            batch_id
+        ):
+            if entry.result.type != "succeeded":
+                results[entry.custom_id] = BatchRequestError(entry.result.type)
+                continue
+            message = entry.result.message
+            text = "".join(
+                block.text for block in message.content if block.type == "text"
+            )
+            if message.stop_reason == "max_tokens":
+                results[entry.custom_id] = BatchRequestError(
+                    f"response was cut off at {self.max_tokens} tokens"
+                )
+            elif not text:
+                results[entry.custom_id] = BatchRequestError("empty content")
+            else:
+                results[entry.custom_id] = text
+        return results
+
+    async def _stream(self, messages: Sequence[Message]) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        first_token = None
+        empty = True
+        async with self._client.messages.stream(
+            **self._params(messages)
+        ) as stream:
+            async for delta in stream.text_stream:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                empty = empty and not delta
+                yield delta
+            message = await stream.get_final_message()
+        self._record_usage(
+            message.usage, time.perf_counter() - start, first_token or 0.0
+        )
+        if empty:
+            raise ValueError("Anthropic returned empty content")
+        if message.stop_reason == "max_tokens":
+            raise ValueError(
+                f"Anthropic response was cut off at {self.max_tokens} tokens"
+            )
+
+    def _params(self, messages: Sequence[Message]) -> dict[str, Any]:
+        system_messages = [m for m in messages if m.role == "system"]
+        user_messages = [m for m in messages if m.role != "system"]
         system_content = (
             "\n\n".join(m.content for m in system_messages)
             if system_messages
             else None
         )
-        response = await self._client.messages.create(
-            model=self.model,
-            max_tokens=self.max_tokens,
-            system=system_content,
-            messages=[m.as_dict() for m in user_messages],
+        params: dict[str, Any] = {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "messages": [m.as_dict() for m in user_messages],
+        }
+        if system_content is not None:
+            params["system"] = self._system(system_content)
+        return params
+
+    def _system(self, system_content: str) -> str | list[TextBlockParam]:
+        if not self.prompt_caching:
+            return system_content
+        return [
+            {
+                "type": "text",
+                "text": system_content,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
+    def _record_usage(
+        self, usage: Usage, seconds: float, first_token_seconds: float
+    ) -> None:
+        cache_creation = usage.cache_creation_input_tokens or 0
+        cache_read = usage.cache_read_input_tokens or 0
+        self._usage.requests += 1
+        self._usage.seconds += seconds
+        self._usage.first_token_seconds += first_token_seconds
+        self._usage.input_tokens += usage.input_tokens
+        self._usage.output_tokens += usage.output_tokens
+        self._usage.cache_creation_input_tokens += cache_creation
+        self._usage.cache_read_input_tokens += cache_read
+        _logger.debug(
+            f"Anthropic request took {seconds:.2f}s "
+            f"({first_token_seconds:.2f}s to first token): "
+            f"{usage.input_tokens} input, {cache_read} cache read, "
+            f"{cache_creation} cache write, {usage.output_tokens} output tokens"
         )
-        text_block = response.content[0]
-        return str(text_block.text)
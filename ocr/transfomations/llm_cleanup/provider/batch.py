@@ -0,0 +1,189 @@
+import asyncio
+import json
+import logging
+import os
+from abc import ABC
+from abc import abstractmethod
+from collections.abc import Coroutine
+from collections.abc import Iterable
+from collections.abc import Mapping
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from ocr.transfomations.llm_cleanup.provider.message import Message
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import NonNegativeFloat
+from pydantic import PositiveFloat
+from pydantic import PositiveInt
+
+_logger = logging.getLogger(__name__)
+_POLL_RETRIES = 5
+
+
+class BatchRequestError(RuntimeError):
+    def __init__(self, message: str) -> None:
+        super().__init__(f"Batch request failed: {message}")
+
+
+class BatchBackend(ABC):
+    @abstractmethod
+    async def submit_batch(
+        self, requests: Mapping[str, Sequence[Message]]
+    ) -> str:
+        pass
+
+    @abstractmethod
+    async def batch_finished(self, batch_id: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def batch_results(
+        self, batch_id: str
+    ) -> Mapping[str, str | BatchRequestError]:
+        pass
+
+
+class BatchMode(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    state_path: Path = Path("llm_batches.json")
+    collect_seconds: NonNegativeFloat = 5.0
+    max_requests: PositiveInt = 10000
+    poll_seconds: PositiveFloat = 60.0
+    _batches: Optional[dict[str, list[str]]]
+    _queue: dict[str, Sequence[Message]]
+    _futures: dict[str, "asyncio.Future[str | BatchRequestError]"]
+    _collector: Optional["asyncio.Task[None]"]
+    _tasks: set["asyncio.Task[None]"]
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._batches = None
+        self._queue = {}
+        self._futures = {}
+        self._collector = None
+        self._tasks = set()
+
+    async def complete(
+        self,
+        backend: BatchBackend,
+        key: str,
+        messages: Sequence[Message],
+    ) -> str:
+        self._load(backend)
+        future = self._futures.get(key)
+        if future is None:
+            future = self._futures[key] = (
+                asyncio.get_running_loop().create_future()
+            )
+            self._queue[key] = messages
+            if len(self._queue) >= self.max_requests:
+                self._flush(backend)
+            elif self._collector is None:
+                self._collector = asyncio.create_task(self._collect(backend))
+        result = await asyncio.shield(future)
+        if isinstance(result, BatchRequestError):
+            if self._futures.get(key) is future:
+                del self._futures[key]
+            raise result
+        return result
+
+    def _load(self, backend: BatchBackend) -> None:
+        if self._batches is not None:
+            return
+        self._batches = (
+            json.loads(self.state_path.read_text())
+            if self.state_path.exists()
+            else {}
+        )
+        loop = asyncio.get_running_loop()
+        for batch_id, keys in self._batches.items():
+            _logger.info(
+                f"Resuming LLM batch {batch_id} with {len(keys)} requests"
+            )
+            for key in keys:
+                self._futures[key] = loop.create_future()
+            self._start(self._poll(backend, batch_id))
+
+    async def _collect(self, backend: BatchBackend) -> None:
+        size = -1
+        while size != len(self._queue):
+            size = len(self._queue)
+            await asyncio.sleep(self.collect_seconds)
+        self._collector = None
+        self._flush(backend)
+
+    def _flush(self, backend: BatchBackend) -> None:
+        if not self._queue:
+            return
+        requests, self._queue = self._queue, {}
+        self._start(self._submit(backend, requests))
+
+    async def _submit(
+        self,
+        backend: BatchBackend,
+        requests: Mapping[str, Sequence[Message]],
+    ) -> None:
+        try:
+            batch_id = await backend.submit_batch(requests)
+        except Exception as e:
+            self._resolve(requests, {}, str(e))
+            return
+        _logger.info(
+            f"Submitted LLM batch {batch_id} with {len(requests)} requests"
+        )
+        self._save(batch_id, list(requests))
+        await self._poll(backend, batch_id)
+
+    async def _poll(self, backend: BatchBackend, batch_id: str) -> None:
+        keys = self._batches_state()[batch_id]
+        failures = 0
+        while True:
+            try:
+                if await backend.batch_finished(batch_id):
+                    results = await backend.batch_results(batch_id)
+                    break
+                failures = 0
+            except Exception as e:
+                failures += 1
+                if failures > _POLL_RETRIES:
+                    self._resolve(keys, {}, str(e))
+                    return
+                _logger.warning(f"Polling LLM batch {batch_id} failed ({e})")
+            await asyncio.sleep(self.poll_seconds)
+        _logger.info(f"LLM batch {batch_id} finished")
+        self._resolve(keys, results, "missing from batch results")
+        self._save(batch_id, None)
+
+    def _resolve(
+        self,
+        keys: Iterable[str],
+        results: Mapping[str, str | BatchRequestError],
+        error: str,
+    ) -> None:
+        for key in keys:
+            future = self._futures.get(key)
+            if future is not None and not future.done():
+                future.set_result(results.get(key, BatchRequestError(error)))
+
+    def _save(self, batch_id: str, keys: Optional[list[str]]) -> None:
+        batches = self._batches_state()
+        if keys is None:
+            del batches[batch_id]
+        else:
+            batches[batch_id] = keys
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.state_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(batches))
+        os.replace(temp_path, self.state_path)
+
+    def _batches_state(self) -> dict[str, list[str]]:
+        if self._batches is None:
+            raise RuntimeError("Batch state is used before it was loaded")
+        return self._batches
+
+    def _start(self, coroutine: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
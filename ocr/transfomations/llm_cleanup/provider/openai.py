@@ -1,14 +1,22 @@
-from collections.abc import Iterable
+import json
+from collections.abc import AsyncIterator
+from collections.abc import Mapping
+from collections.abc import Sequence
 from typing import Annotated
 from typing import Any
+from typing import Final
 from typing import Literal
 
 from ocr.transfomations.llm_cleanup.provider._base import LLMProvider
+from ocr.transfomations.llm_cleanup.provider.batch import BatchRequestError
 from ocr.transfomations.llm_cleanup.provider.message import Message
 from openai import AsyncOpenAI
 from pydantic import AfterValidator
 from pydantic import SecretStr
 
+_BATCH_ENDPOINT: Final = "/v1/chat/completions"
+_FINISHED_STATUSES = frozenset(("completed", "failed", "expired", "cancelled"))
+
 
 def _validate_api_key(key: SecretStr) -> SecretStr:
     if not key.get_secret_value():
@@ -27,15 +35,87 @@ class OpenAI(LLMProvider):
     def model_post_init(self, context: Any, /) -> None:
         self._client = AsyncOpenAI(
             api_key=self.openai_api_key.get_secret_value(),
+            base_url=self.base_url,
             timeout=self.timeout,
         )
 
-    async def clean(self, messages: Iterable[Message]) -> str:
+    async def submit_batch(
+        self, requests: Mapping[str, Sequence[Message]]
+    ) -> str:
+        lines = (
+            json.dumps(
+                {
+                    "custom_id": key,
+                    "method": "POST",
+                    "url": _BATCH_ENDPOINT,
+                    "body": {
+                        "model": self.model,
+                        "messages": [m.as_dict() for m in messages],
+                    },
+                }
+            )
+            for key, messages in requests.items()
+        )
+        file = await self._client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        batch = await self._client.batches.create(
+            input_file_id=file.id,
+            endpoint=_BATCH_ENDPOINT,
+            completion_window="24h",
+        )
+        return str(batch.id)
+
+    async def batch_finished(self, batch_id: str) -> bool:
+        batch = await self._client.batches.retrieve(batch_id)
+        return batch.status in _FINISHED_STATUSES
+
+    async def batch_results(
+        self, batch_id: str
+    ) -> dict[str, str | BatchRequestError]:
+        batch = await self._client.batches.retrieve(batch_id)
+        results: dict[str, str | BatchRequestError] = {}
+        for file_id in (batch.error_file_id, batch.output_file_id):
+            if file_id is None:
+                continue
+            content = await self._client.files.content(file_id)
+            for line in content.text.splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    results[entry["custom_id"]] = _parse_result(entry)
+        return results
+
+    async def _stream(self, messages: Sequence[Message]) -> AsyncIterator[str]:
         response = await self._client.chat.completions.create(
             model=self.model,
             messages=[m.as_dict() for m in messages],
+            stream=True,
         )
-        content = response.choices[0].message.content
-        if not isinstance(content, str):
+        finish_reason = None
+        empty = True
+        async for chunk in response:  # type: ignore[union-attr,unused-ignore]
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            finish_reason = choice.finish_reason or finish_reason
+            if choice.delta.content:
+                empty = False
+                yield choice.delta.content
+        if empty:
             raise ValueError("OpenAI returned empty content")
-        return content
+        if finish_reason == "length":
+            raise ValueError("OpenAI response was cut off at the token limit")
+
+
+def _parse_result(entry: dict[str, Any]) -> str | BatchRequestError:
+    response = entry.get("response") or {}
+    if entry.get("error") or response.get("status_code") != 200:
+        return BatchRequestError(
+            str(entry.get("error") or response.get("body"))
+        )
+    choice = response["body"]["choices"][0]
+    if choice.get("finish_reason") == "length":
+        return BatchRequestError("response was cut off at the token limit")
+    if not choice["message"].get("content"):
+        return BatchRequestError("empty content")
+    return str(choice["message"]["content"])
@@ -6,6 +6,7 @@ from collections.abc import Sequence
 from itertools import combinations
 from itertools import count
 from typing import Any
+from typing import ClassVar
 from typing import Literal
 
 from ocr.transfomations.transformation import Transformation
@@ -15,6 +16,7 @@ from pyphen import Pyphen
 
 class SplitLongWords(Transformation):
     type: Literal["split-long-words"] = "split-long-words"
+    page_local: ClassVar[bool] = True
     max_syllable_group_length: PositiveInt = 9
     separator: str = " "
     lang: str = "pl_PL"
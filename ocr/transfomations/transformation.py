@@ -1,5 +1,7 @@
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import AsyncIterator
+from typing import ClassVar
 
 from pydantic import BaseModel
 from pydantic import ConfigDict
@@ -8,7 +10,12 @@ from pydantic import ConfigDict
 class Transformation(BaseModel, ABC):
     model_config = ConfigDict(extra="forbid")
     type: str
+    page_local: ClassVar[bool] = False
+    checkpointed: ClassVar[bool] = False
 
     @abstractmethod
     async def transform(self, text: str) -> str:
         pass
+
+    async def transform_stream(self, text: str) -> AsyncIterator[str]:
+        yield await self.transform(text)
@@ -0,0 +1,25 @@
+from typing import Annotated
+from typing import TypeAlias
+from typing import Union
+
+from ocr.vision_client._base import MAX_BATCH_SIZE
+from ocr.vision_client._base import VisionApiError
+from ocr.vision_client._base import VisionClient
+from ocr.vision_client.asynchronous import AsyncVisionClient
+from ocr.vision_client.rate_limiter import RateLimiter
+from ocr.vision_client.sync import SyncVisionClient
+from pydantic import Field
+
+AnyVisionClient: TypeAlias = Annotated[
+    Union[SyncVisionClient, AsyncVisionClient],
+    Field(union_mode="left_to_right"),
+]
+__all__ = [
+    "AnyVisionClient",
+    "AsyncVisionClient",
+    "MAX_BATCH_SIZE",
+    "RateLimiter",
+    "SyncVisionClient",
+    "VisionApiError",
+    "VisionClient",
+]
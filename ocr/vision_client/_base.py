@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import logging
+import random
+from abc import ABC
+from abc import abstractmethod
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+from contextlib import asynccontextmanager
+from enum import StrEnum
+from typing import Optional
+
+from google.api_core import exceptions
+from google.cloud import vision_v1
+from ocr.cache import DiskCache
+from ocr.page import Page
+from ocr.page import PageSource
+from ocr.page import read_page
+from ocr.preprocessing import PagePreprocessor
+from ocr.vision_client.rate_limiter import RateLimiter
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import NonNegativeFloat
+from pydantic import NonNegativeInt
+from pydantic import SecretStr
+
+_logger = logging.getLogger(__name__)
+MAX_BATCH_SIZE = 16
+_RETRYABLE_CODES = frozenset((4, 8, 13, 14))
+_RETRYABLE_EXCEPTIONS = (
+    exceptions.TooManyRequests,
+    exceptions.ServiceUnavailable,
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+)
+
+
+class VisionApiError(RuntimeError):
+    def __init__(self, message: str, retryable: bool = False) -> None:
+        super().__init__(f"Vision API error: {message}")
+        self.retryable = retryable
+
+
+class FeatureType(StrEnum):
+    TEXT_DETECTION = "TEXT_DETECTION"
+    DOCUMENT_TEXT_DETECTION = "DOCUMENT_TEXT_DETECTION"
+
+
+class VisionClient(BaseModel, ABC):
+    model_config = ConfigDict(extra="forbid")
+    type: str
+    token: SecretStr
+    feature_type: FeatureType = FeatureType.TEXT_DETECTION
+    language_hints: tuple[str, ...] = ()
+    cache: Optional[DiskCache] = None
+    preprocessor: Optional[PagePreprocessor] = None
+    rate_limiter: Optional[RateLimiter] = None
+    num_retries: NonNegativeInt = 5
+    retry_delay: NonNegativeFloat = 1.0
+
+    @asynccontextmanager
+    async def session(self, concurrency: int) -> AsyncIterator[None]:
+        try:
+            async with self._session(concurrency), self._limit(concurrency):
+                yield
+        finally:
+            if self.cache is not None:
+                self.cache.log_stats("Vision")
+            if self.preprocessor is not None:
+                self.preprocessor.log_stats()
+
+    async def extract_text(self, image: PageSource) -> str:
+        (result,) = await self.extract_texts((image,))
+        if isinstance(result, RuntimeError):
+            raise result
+        return result
+
+    async def extract_texts(
+        self, images: Sequence[PageSource]
+    ) -> tuple[str | RuntimeError, ...]:
+        if len(images) > MAX_BATCH_SIZE:
+            raise ValueError(
+                f"Vision API accepts at most {MAX_BATCH_SIZE} images per request, got {len(images)}"
+            )
+        contents = tuple(map(read_page, images))
+        keys = tuple(map(self._cache_key, contents))
+        results: list[str | RuntimeError | None] = [
+            self._lookup(image, key) for image, key in zip(images, keys)
+        ]
+        missing = tuple(
+            index for index, result in enumerate(results) if result is None
+        )
+        if missing:
+            payloads = await self._preprocess(
+                tuple(images[index] for index in missing),
+                tuple(contents[index] for index in missing),
+            )
+            for index, result in zip(
+                missing, await self._annotate_with_retry(payloads)
+            ):
+                if self.cache is not None and isinstance(result, str):
+                    self.cache.set(keys[index], result)
+                results[index] = result
+        return tuple(result or "" for result in results)
+
+    @asynccontextmanager
+    async def _session(self, concurrency: int) -> AsyncIterator[None]:
+        yield
+
+    @asynccontextmanager
+    async def _limit(self, concurrency: int) -> AsyncIterator[None]:
+        if self.rate_limiter is None:
+            yield
+            return
+        async with self.rate_limiter.session(concurrency):
+            yield
+
+    async def _annotate_with_retry(
+        self, payloads: Sequence[bytes | memoryview]
+    ) -> list[str | VisionApiError]:
+        requests = tuple(map(self._build_request, payloads))
+        results: list[str | VisionApiError] = ["" for _ in requests]
+        pending = tuple(range(len(requests)))
+        for attempt in range(self.num_retries + 1):
+            if attempt:
+                delay = self.retry_delay * 2 ** (attempt - 1) * random.random()
+                _logger.warning(
+                    f"Vision API request for {len(pending)} images failed "
+                    f"({results[pending[0]]}), retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            for index, result in zip(
+                pending,
+                await self._annotate_once(
+                    tuple(requests[index] for index in pending),
+                    sum(len(payloads[index]) for index in pending),
+                ),
+            ):
+                results[index] = result
+            pending = tuple(
+                index
+                for index in pending
+                if isinstance(result := results[index], VisionApiError)
+                and result.retryable
+            )
+            if not pending:
+                break
+        return results
+
+    async def _annotate_once(
+        self,
+        requests: Sequence[vision_v1.AnnotateImageRequest],
+        n_bytes: int,
+    ) -> list[str | VisionApiError]:
+        rate_limiter = self.rate_limiter
+        if rate_limiter is None:
+            return await self._call(requests)
+        async with rate_limiter.acquire(len(requests), n_bytes) as generation:
+            results = await self._call(requests)
+            rate_limiter.record(
+                generation,
+                any(
+                    isinstance(result, VisionApiError) and result.retryable
+                    for result in results
+                ),
+            )
+        return results
+
+    async def _call(
+        self, requests: Sequence[vision_v1.AnnotateImageRequest]
+    ) -> list[str | VisionApiError]:
+        try:
+            response = await self._annotate(requests)
+        except _RETRYABLE_EXCEPTIONS as e:
+            error = VisionApiError(str(e), retryable=True)
+            return [error for _ in requests]
+        return list(map(self._parse_response, response.responses))
+
+    @abstractmethod
+    async def _annotate(
+        self, requests: Sequence[vision_v1.AnnotateImageRequest]
+    ) -> vision_v1.BatchAnnotateImagesResponse:
+        pass
+
+    async def _preprocess(
+        self,
+        images: Sequence[PageSource],
+        contents: Sequence[bytes | memoryview],
+    ) -> Sequence[bytes | memoryview]:
+        preprocessor = self.preprocessor
+        if preprocessor is None:
+            return contents
+        return await asyncio.to_thread(
+            lambda: tuple(
+                preprocessor.process(content, image.name)
+                for image, content in zip(images, contents)
+            )
+        )
+
+    def _lookup(self, image: PageSource, key: str) -> Optional[str]:
+        if isinstance(image, Page) and image.text is not None:
+            return image.text
+        if self.cache is None:
+            return None
+        return self.cache.get(key)
+
+    def _cache_key(self, content: bytes | memoryview) -> str:
+        digest = hashlib.sha256(content)
+        for part in (
+            self.feature_type.value,
+            *self.language_hints,
+            self.preprocessor.model_dump_json() if self.preprocessor else "",
+        ):
+            digest.update(b"\0" + part.encode())
+        return digest.hexdigest()
+
+    def _build_request(
+        self, content: bytes | memoryview
+    ) -> vision_v1.AnnotateImageRequest:
+        return vision_v1.AnnotateImageRequest(
+            image=vision_v1.Image(content=bytes(content)),
+            features=[vision_v1.Feature(type_=self.feature_type.value)],
+            image_context=vision_v1.ImageContext(
+                language_hints=list(self.language_hints)
+            ),
+        )
+
+    @staticmethod
+    def _parse_response(
+        response: vision_v1.AnnotateImageResponse,
+    ) -> str | VisionApiError:
+        if response.error.message:
+            return VisionApiError(
+                response.error.message,
+                retryable=response.error.code in _RETRYABLE_CODES,
+            )
+        if not response.text_annotations:
+            return ""
+        description = response.text_annotations[0].description
+        return str(description) if description else ""
@@ -0,0 +1,50 @@
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+from contextlib import asynccontextmanager
+from typing import Any
+from typing import Literal
+from typing import Optional
+
+from google.auth.api_key import Credentials
+from google.cloud import vision_v1
+from google.cloud.vision_v1 import ImageAnnotatorAsyncClient
+from google.cloud.vision_v1.services.image_annotator.transports import (
+    ImageAnnotatorGrpcAsyncIOTransport,
+)
+from ocr.vision_client._base import VisionClient
+
+
+class AsyncVisionClient(VisionClient):
+    type: Literal["async"] = "async"
+    host: str = ImageAnnotatorGrpcAsyncIOTransport.DEFAULT_HOST
+    _client: Optional[ImageAnnotatorAsyncClient]
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._client = None
+
+    @asynccontextmanager
+    async def _session(self, concurrency: int) -> AsyncIterator[None]:
+        transport = self._create_transport()
+        self._client = ImageAnnotatorAsyncClient(transport=transport)
+        try:
+            yield
+        finally:
+            self._client = None
+            await transport.close()  # type: ignore[no-untyped-call]
+
+    async def _annotate(
+        self, requests: Sequence[vision_v1.AnnotateImageRequest]
+    ) -> vision_v1.BatchAnnotateImagesResponse:
+        if self._client is None:
+            raise RuntimeError(
+                "AsyncVisionClient can only be used inside session()"
+            )
+        return await self._client.batch_annotate_images(
+            requests=list(requests)
+        )
+
+    def _create_transport(self) -> ImageAnnotatorGrpcAsyncIOTransport:
+        return ImageAnnotatorGrpcAsyncIOTransport(
+            host=self.host,
+            credentials=Credentials(token=self.token.get_secret_value()),  # type: ignore[no-untyped-call]
+        )
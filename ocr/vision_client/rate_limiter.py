@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Annotated
+from typing import Any
+from typing import Optional
+
+from pydantic import BaseModel
+from pydantic import ConfigDict
+from pydantic import Field
+from pydantic import PositiveFloat
+from pydantic import PositiveInt
+
+_logger = logging.getLogger(__name__)
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: float, burst_seconds: float) -> None:
+        self._rate = per_minute / 60
+        self._capacity = max(self._rate * burst_seconds, 1.0)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+
+    def reserve(self, amount: float) -> float:
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        self._tokens -= amount
+        return max(0.0, -self._tokens / self._rate)
+
+
+class RateLimiter(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    requests_per_minute: Optional[PositiveFloat] = None
+    bytes_per_minute: Optional[PositiveFloat] = None
+    burst_seconds: PositiveFloat = 1.0
+    adaptive: bool = True
+    min_concurrency: PositiveInt = 1
+    increase_after: PositiveInt = 8
+    decrease_factor: Annotated[float, Field(gt=0, lt=1)] = 0.5
+    _buckets: tuple[tuple[_TokenBucket, bool], ...]
+    _condition: Optional[asyncio.Condition]
+    _max_concurrency: int
+    _limit: float
+    _in_flight: int
+    _successes: int
+    _generation: int
+    _throttled: int
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._buckets = ()
+        self._condition = None
+        self._max_concurrency = 0
+        self._limit = 0.0
+        self._in_flight = 0
+        self._successes = 0
+        self._generation = 0
+        self._throttled = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @asynccontextmanager
+    async def session(self, concurrency: int) -> AsyncIterator[None]:
+        self._buckets = tuple(
+            (_TokenBucket(per_minute, self.burst_seconds), counts_bytes)
+            for per_minute, counts_bytes in (
+                (self.requests_per_minute, False),
+                (self.bytes_per_minute, True),
+            )
+            if per_minute is not None
+        )
+        self._condition = asyncio.Condition()
+        self._max_concurrency = concurrency
+        self._limit = float(concurrency)
+        self._throttled = 0
+        try:
+            yield
+        finally:
+            self._condition = None
+            _logger.info(
+                f"Vision rate limiter: throttled {self._throttled} times, "
+                f"final concurrency limit {self.limit}/{concurrency}"
+            )
+
+    @asynccontextmanager
+    async def acquire(
+        self, n_requests: int, n_bytes: int
+    ) -> AsyncIterator[int]:
+        condition = self._condition
+        if condition is None:
+            raise RuntimeError("RateLimiter can only be used inside session()")
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        try:
+            delay = max(
+                (
+                    bucket.reserve(n_bytes if counts_bytes else n_requests)
+                    for bucket, counts_bytes in self._buckets
+                ),
+                default=0.0,
+            )
+            if delay:
+                await asyncio.sleep(delay)
+            yield self._generation
+        finally:
+            async with condition:
+                self._in_flight -= 1
+                condition.notify_all()
+
+    def record(self, generation: int, throttled: bool) -> None:
+        if throttled:
+            self._throttled += 1
+        if not self.adaptive:
+            return
+        if not throttled:
+            self._successes += 1
+            if self._successes >= self.increase_after:
+                self._limit = min(self._max_concurrency, self._limit + 1)
+                self._successes = 0
+            return
+        if generation != self._generation:
+            return
+        self._generation += 1
+        self._successes = 0
+        self._limit = max(
+            self.min_concurrency, self._limit * self.decrease_factor
+        )
+        _logger.warning(
+            f"Vision API is throttling, concurrency limit lowered to "
+            f"{self.limit}"
+        )
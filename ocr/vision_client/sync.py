@@ -0,0 +1,48 @@
+import asyncio
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any
+from typing import Literal
+from typing import Optional
+
+from google.auth.api_key import Credentials
+from google.cloud import vision_v1
+from google.cloud.vision_v1 import ImageAnnotatorClient
+from ocr.vision_client._base import VisionClient
+
+
+class SyncVisionClient(VisionClient):
+    type: Literal["sync"] = "sync"
+    _client: ImageAnnotatorClient
+    _executor: Optional[ThreadPoolExecutor]
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._client = ImageAnnotatorClient(
+            credentials=Credentials(token=self.token.get_secret_value())  # type: ignore[no-untyped-call]
+        )
+        self._executor = None
+
+    @asynccontextmanager
+    async def _session(self, concurrency: int) -> AsyncIterator[None]:
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="vision"
+        ) as executor:
+            self._executor = executor
+            try:
+                yield
+            finally:
+                self._executor = None
+
+    async def _annotate(
+        self, requests: Sequence[vision_v1.AnnotateImageRequest]
+    ) -> vision_v1.BatchAnnotateImagesResponse:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._annotate_sync, requests
+        )
+
+    def _annotate_sync(
+        self, requests: Sequence[vision_v1.AnnotateImageRequest]
+    ) -> vision_v1.BatchAnnotateImagesResponse:
+        return self._client.batch_annotate_images(requests=list(requests))
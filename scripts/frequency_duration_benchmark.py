@@ -0,0 +1,90 @@
+import logging
+import random
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Optional
+
+from ocr.output.duration.frequency import FrequencyDurationCalculator
+from ocr.output.duration.lexicon import Lexicon
+from pydantic import PositiveInt
+from pydantic_settings import BaseSettings
+from pydantic_settings import CliApp
+from pydantic_settings import SettingsConfigDict
+from wordfreq import top_n_list
+from wordfreq import word_frequency
+
+_logger = logging.getLogger(__name__)
+_PUNCTUATION = ("", "", "", "", ",", ".", "!", "?", ";")
+
+
+class Benchmark(BaseSettings):
+    model_config = SettingsConfigDict(
+        cli_parse_args=True,
+        cli_kebab_case=True,
+    )
+    n_tokens: PositiveInt = 200_000
+    vocabulary_size: PositiveInt = 20_000
+    page_words: PositiveInt = 300
+    language: str = "pl"
+    lexicon: Optional[Path] = None
+
+    def cli_cmd(self) -> None:
+        start = time.perf_counter()
+        calculator = FrequencyDurationCalculator(
+            language=self.language,
+            lexicon=(
+                None if self.lexicon is None else Lexicon(path=self.lexicon)
+            ),
+        )
+        calculator.calculate_duration("a")
+        _logger.info(
+            f"First call: {time.perf_counter() - start:.4f}s "
+            f"({'wordfreq' if self.lexicon is None else self.lexicon})"
+        )
+        words = self._generate_words()
+        self._measure(
+            "wordfreq per token",
+            lambda: [word_frequency(word, self.language) for word in words],
+        )
+        self._measure(
+            "calculate_duration per token",
+            lambda: list(map(calculator.calculate_duration, words)),
+        )
+        self._measure(
+            f"calculate_durations per {self.page_words}-word page",
+            lambda: [
+                duration
+                for index in range(0, len(words), self.page_words)
+                for duration in calculator.calculate_durations(
+                    words[index : index + self.page_words]
+                )
+            ],
+        )
+
+    def _measure(self, name: str, run: Callable[[], list[float]]) -> None:
+        start = time.perf_counter()
+        n_results = len(run())
+        elapsed = time.perf_counter() - start
+        _logger.info(
+            f"{name}: {n_results} tokens in {elapsed:.2f}s "
+            f"({n_results / elapsed:.0f} tokens/s)"
+        )
+
+    def _generate_words(self) -> list[str]:
+        generator = random.Random(0)
+        vocabulary = top_n_list(self.language, self.vocabulary_size)
+        words = generator.choices(
+            vocabulary,
+            weights=[1 / rank for rank in range(1, len(vocabulary) + 1)],
+            k=self.n_tokens,
+        )
+        return [
+            (word.capitalize() if generator.random() < 0.1 else word)
+            + generator.choice(_PUNCTUATION)
+            for word in words
+        ]
+
+
+if __name__ == "__main__":
+    CliApp.run(Benchmark)
@@ -0,0 +1,63 @@
+import logging
+import os
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ocr.input.pdf import PdfInput
+from PIL import Image
+from PIL import ImageDraw
+from pydantic import PositiveInt
+from pydantic_settings import BaseSettings
+from pydantic_settings import CliApp
+from pydantic_settings import SettingsConfigDict
+
+_logger = logging.getLogger(__name__)
+
+
+class Benchmark(BaseSettings):
+    model_config = SettingsConfigDict(
+        cli_parse_args=True,
+        cli_kebab_case=True,
+    )
+    n_pages: PositiveInt = 64
+    window_size: PositiveInt = 4
+    n_processes: tuple[PositiveInt, ...] = (1, 4, os.cpu_count() or 1)
+
+    def cli_cmd(self) -> None:
+        with TemporaryDirectory() as directory:
+            pdf_path = Path(directory) / "book.pdf"
+            self._generate_pdf(pdf_path)
+            for n_processes in self.n_processes:
+                pdf_input = PdfInput(
+                    pdf_path=pdf_path,
+                    number_of_pages=self.n_pages,
+                    window_size=self.window_size,
+                    n_processes=n_processes,
+                    temp_directory=Path(directory) / f"pages_{n_processes}",
+                )
+                start = time.perf_counter()
+                images = pdf_input.get_images()
+                elapsed = time.perf_counter() - start
+                _logger.info(
+                    f"n_processes={n_processes}: rendered {len(images)} pages "
+                    f"in {elapsed:.2f}s ({len(images) / elapsed:.1f} pages/s)"
+                )
+
+    def _generate_pdf(self, pdf_path: Path) -> None:
+        pages = []
+        for page_number in range(1, self.n_pages + 1):
+            page = Image.new("RGB", (1240, 1754), "white")
+            draw = ImageDraw.Draw(page)
+            for line in range(60):
+                draw.text(
+                    (80, 80 + line * 26),
+                    f"Page {page_number}, line {line}: " + "lorem ipsum " * 8,
+                    fill="black",
+                )
+            pages.append(page)
+        pages[0].save(pdf_path, "PDF", save_all=True, append_images=pages[1:])
+
+
+if __name__ == "__main__":
+    CliApp.run(Benchmark)
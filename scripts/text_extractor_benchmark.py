@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+import tracemalloc
+from collections.abc import Sequence
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from typing import Literal
+
+from google.cloud import vision_v1
+from ocr.text_extractor import TextExtractor
+from ocr.vision_client import AsyncVisionClient
+from ocr.vision_client import SyncVisionClient
+from ocr.vision_client import VisionClient
+from pydantic import NonNegativeFloat
+from pydantic import PositiveInt
+from pydantic import SecretStr
+from pydantic_settings import BaseSettings
+from pydantic_settings import CliApp
+from pydantic_settings import SettingsConfigDict
+
+_logger = logging.getLogger(__name__)
+
+
+def _stub_response(
+    requests: Sequence[vision_v1.AnnotateImageRequest], text_length: int
+) -> vision_v1.BatchAnnotateImagesResponse:
+    return vision_v1.BatchAnnotateImagesResponse(
+        responses=[
+            vision_v1.AnnotateImageResponse(
+                text_annotations=[
+                    {
+                        "description": (
+                            request.image.content.decode().ljust(
+                                text_length, "x"
+                            )
+                        )
+                    }
+                ]
+            )
+            for request in requests
+        ]
+    )
+
+
+class StubSyncVisionClient(SyncVisionClient):
+    latency: NonNegativeFloat = 0.05
+    text_length: PositiveInt = 2000
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._executor = None
+
+    def _annotate_sync(
+        self, requests: Sequence[vision_v1.AnnotateImageRequest]
+    ) -> vision_v1.BatchAnnotateImagesResponse:
+        time.sleep(self.latency)
+        return _stub_response(requests, self.text_length)
+
+
+class StubAsyncVisionClient(AsyncVisionClient):
+    latency: NonNegativeFloat = 0.05
+    text_length: PositiveInt = 2000
+
+    async def _annotate(
+        self, requests: Sequence[vision_v1.AnnotateImageRequest]
+    ) -> vision_v1.BatchAnnotateImagesResponse:
+        await asyncio.sleep(self.latency)
+        return _stub_response(requests, self.text_length)
+
+
+class Benchmark(BaseSettings):
+    model_config = SettingsConfigDict(
+        cli_parse_args=True,
+        cli_kebab_case=True,
+    )
+    n_pages: PositiveInt = 2000
+    n_tasks: tuple[PositiveInt, ...] = (1, 4, 12, 32, 64)
+    latency: NonNegativeFloat = 0.05
+    batch_size: PositiveInt = 1
+    vision_client_type: Literal["sync", "async"] = "sync"
+
+    async def cli_cmd(self) -> None:
+        vision_client: VisionClient = (
+            StubSyncVisionClient(token=SecretStr("stub"), latency=self.latency)
+            if self.vision_client_type == "sync"
+            else StubAsyncVisionClient(
+                token=SecretStr("stub"), latency=self.latency
+            )
+        )
+        with TemporaryDirectory() as directory:
+            images = tuple(
+                Path(directory) / f"page_{index}.png"
+                for index in range(self.n_pages)
+            )
+            for image in images:
+                image.write_text(image.stem)
+            for n_tasks in self.n_tasks:
+                await self._run(vision_client, images, n_tasks)
+
+    async def _run(
+        self,
+        vision_client: VisionClient,
+        images: Sequence[Path],
+        n_tasks: int,
+    ) -> None:
+        extractor = TextExtractor(
+            vision_client=vision_client,
+            n_tasks=n_tasks,
+            batch_size=self.batch_size,
+        )
+        tracemalloc.start()
+        start = time.perf_counter()
+        await extractor.extract_from_images(images)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        _logger.info(
+            f"{self.vision_client_type} client, n_tasks={n_tasks}: "
+            f"{self.n_pages / elapsed:.1f} pages/s, {elapsed:.2f}s total, "
+            f"peak memory {peak / 2**20:.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    CliApp.run(Benchmark)
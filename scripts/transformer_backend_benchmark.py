@@ -0,0 +1,165 @@
+import logging
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+from ocr.output.duration.backend import AnyModelBackend
+from ocr.output.duration.backend import ModelBackend
+from ocr.output.duration.transformer import TransformerDurationCalculator
+from pydantic import PositiveFloat
+from pydantic import PositiveInt
+from pydantic import TypeAdapter
+from pydantic_settings import BaseSettings
+from pydantic_settings import CliApp
+from pydantic_settings import SettingsConfigDict
+from scripts.transformer_duration_benchmark import generate_words
+from scripts.transformer_duration_benchmark import save_model
+from transformers import AutoTokenizer
+
+_logger = logging.getLogger(__name__)
+_REFERENCE_BACKEND = "torch"
+
+
+class BackendRun(NamedTuple):
+    load_seconds: float
+    memory_bytes: int
+    score_seconds: float
+    durations: list[float]
+
+
+def _peak_memory() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _prepare_backend(model_name: str, backend: ModelBackend) -> None:
+    backend.load(model_name, "cpu")
+
+
+def _run_backend(
+    model_name: str,
+    backend: ModelBackend,
+    context_window: int,
+    page_words: int,
+    words: list[str],
+) -> BackendRun:
+    memory = _peak_memory()
+    start = time.perf_counter()
+    calculator = TransformerDurationCalculator(
+        model_name=model_name, context_window=context_window, backend=backend
+    )
+    load_seconds = time.perf_counter() - start
+    memory_bytes = _peak_memory() - memory
+    start = time.perf_counter()
+    durations = [
+        duration
+        for index in range(0, len(words), page_words)
+        for duration in calculator.calculate_durations(
+            words[index : index + page_words]
+        )
+    ]
+    return BackendRun(
+        load_seconds, memory_bytes, time.perf_counter() - start, durations
+    )
+
+
+class Benchmark(BaseSettings):
+    model_config = SettingsConfigDict(
+        cli_parse_args=True,
+        cli_kebab_case=True,
+    )
+    model_name: Optional[str] = None
+    backends: tuple[str, ...] = ("torch-int8", "onnx")
+    onnx_directory: Optional[Path] = None
+    n_words: PositiveInt = 2000
+    vocabulary_size: PositiveInt = 2000
+    context_window: PositiveInt = 64
+    page_words: PositiveInt = 300
+    tolerance: PositiveFloat = 0.05
+
+    def cli_cmd(self) -> None:
+        words = generate_words(self.n_words, self.vocabulary_size)
+        with TemporaryDirectory() as directory:
+            model_name = self.model_name
+            if model_name is None:
+                model_name = directory
+                save_model(Path(directory), words)
+            tokenizer = AutoTokenizer.from_pretrained(model_name)  # type: ignore[no-untyped-call,unused-ignore]
+            n_tokens = len(
+                tokenizer(" ".join(words), add_special_tokens=False)[
+                    "input_ids"
+                ]
+            )
+            onnx_directory = self.onnx_directory or Path(directory, "onnx")
+            reference = self._run(
+                _REFERENCE_BACKEND, model_name, words, n_tokens, {}
+            )
+            for name in self.backends:
+                durations = self._run(
+                    name,
+                    model_name,
+                    words,
+                    n_tokens,
+                    (
+                        {"export_directory": onnx_directory}
+                        if name == "onnx"
+                        else {}
+                    ),
+                )
+                differences = [
+                    abs(duration - expected)
+                    for duration, expected in zip(durations, reference)
+                ]
+                mean_difference = sum(differences) / len(differences)
+                _logger.info(
+                    f"{name}: max difference {max(differences):.4f}s, mean "
+                    f"difference {mean_difference:.4f}s from "
+                    f"{_REFERENCE_BACKEND}"
+                )
+                if mean_difference > self.tolerance:
+                    _logger.warning(
+                        f"{name} exceeds the {self.tolerance}s tolerance"
+                    )
+
+    def _run(
+        self,
+        name: str,
+        model_name: str,
+        words: list[str],
+        n_tokens: int,
+        options: dict[str, Any],
+    ) -> list[float]:
+        backend: ModelBackend = TypeAdapter(AnyModelBackend).validate_python(
+            {"type": name, **options}
+        )
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            executor.submit(_prepare_backend, model_name, backend).result()
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            run = executor.submit(
+                _run_backend,
+                model_name,
+                backend,
+                self.context_window,
+                self.page_words,
+                words,
+            ).result()
+        _logger.info(
+            f"{name}: loaded in {run.load_seconds:.2f}s using "
+            f"{run.memory_bytes / 2**20:.0f} MiB, scored {n_tokens} tokens "
+            f"in {run.score_seconds:.2f}s "
+            f"({n_tokens / run.score_seconds:.0f} tokens/s)"
+        )
+        return run.durations
+
+
+if __name__ == "__main__":
+    CliApp.run(Benchmark)
@@ -0,0 +1,184 @@
+import logging
+import math
+import random
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import torch
+from ocr.output.duration.transformer import _LOG_PROB_FLOOR
+from ocr.output.duration.transformer import TransformerDurationCalculator
+from pydantic import PositiveInt
+from pydantic_settings import BaseSettings
+from pydantic_settings import CliApp
+from pydantic_settings import SettingsConfigDict
+from tokenizers import decoders
+from tokenizers import models
+from tokenizers import pre_tokenizers
+from tokenizers import processors
+from tokenizers import Tokenizer
+from tokenizers import trainers
+from transformers import LlamaConfig
+from transformers import LlamaForCausalLM
+from transformers import PreTrainedTokenizerFast
+
+_logger = logging.getLogger(__name__)
+_SYLLABLES = ("ka", "mi", "no", "prze", "sty", "wa", "rze", "go", "ła", "ciu")
+
+
+class FullContextDurationCalculator(TransformerDurationCalculator):
+    _context_words: list[str]
+
+    def reset(self) -> None:
+        super().reset()
+        self._context_words = []
+
+    def calculate_duration(self, word: str) -> float:
+        if not self._position % self.prefill_stride:
+            self._context_words = self._context_words[
+                max(len(self._context_words) - self.context_window, 0) :
+            ]
+        duration = super().calculate_duration(word)
+        self._context_words.append(word)
+        self._position += 1
+        return duration
+
+    def _get_word_probability(self, word: str) -> float:
+        context_text = " ".join(self._context_words)
+        full_text = f"{context_text} {word}" if context_text else word
+        context_len = (
+            len(self._tokenizer.encode(context_text)) if context_text else 0
+        )
+        full_ids = self._tokenizer.encode(full_text, return_tensors="pt")
+        target_ids = full_ids[0, max(context_len, 1) :]
+        if not len(target_ids):
+            return math.exp(_LOG_PROB_FLOOR)
+        with torch.no_grad():
+            log_probs = torch.log_softmax(
+                self._model(full_ids).logits[0], dim=-1
+            )
+        positions = torch.arange(len(target_ids)) + max(context_len, 1) - 1
+        return math.exp(log_probs[positions, target_ids].mean().item())
+
+
+class Benchmark(BaseSettings):
+    model_config = SettingsConfigDict(
+        cli_parse_args=True,
+        cli_kebab_case=True,
+    )
+    n_words: PositiveInt = 2000
+    vocabulary_size: PositiveInt = 2000
+    context_window: PositiveInt = 64
+    prefill_strides: tuple[PositiveInt, ...] = (1, 16, 64)
+    page_words: PositiveInt = 300
+
+    def cli_cmd(self) -> None:
+        words = generate_words(self.n_words, self.vocabulary_size)
+        with TemporaryDirectory() as directory:
+            save_model(Path(directory), words)
+            reference = self._run(
+                FullContextDurationCalculator(
+                    model_name=directory,
+                    context_window=self.context_window,
+                    prefill_stride=1,
+                ),
+                words,
+            )
+            for prefill_stride in self.prefill_strides:
+                for bulk in (False, True):
+                    durations = self._run(
+                        TransformerDurationCalculator(
+                            model_name=directory,
+                            context_window=self.context_window,
+                            prefill_stride=prefill_stride,
+                        ),
+                        words,
+                        bulk,
+                    )
+                    differences = [
+                        abs(duration - expected)
+                        for duration, expected in zip(durations, reference)
+                    ]
+                    _logger.info(
+                        f"prefill_stride={prefill_stride}, bulk={bulk}: max "
+                        f"difference {max(differences):.4f}s, mean difference "
+                        f"{sum(differences) / len(differences):.4f}s"
+                    )
+
+    def _run(
+        self,
+        calculator: TransformerDurationCalculator,
+        words: list[str],
+        bulk: bool = False,
+    ) -> list[float]:
+        start = time.perf_counter()
+        if bulk:
+            durations = [
+                duration
+                for index in range(0, len(words), self.page_words)
+                for duration in calculator.calculate_durations(
+                    words[index : index + self.page_words]
+                )
+            ]
+        else:
+            durations = list(map(calculator.calculate_duration, words))
+        elapsed = time.perf_counter() - start
+        _logger.info(
+            f"{type(calculator).__name__}"
+            f"(prefill_stride={calculator.prefill_stride}, bulk={bulk}): "
+            f"{len(words)} words in {elapsed:.2f}s "
+            f"({len(words) / elapsed:.0f} words/s)"
+        )
+        return durations
+
+
+def generate_words(n_words: int, vocabulary_size: int) -> list[str]:
+    generator = random.Random(0)
+    vocabulary = [
+        "".join(generator.choices(_SYLLABLES, k=generator.randint(1, 4)))
+        for _ in range(vocabulary_size)
+    ]
+    return generator.choices(
+        vocabulary,
+        weights=[1 / rank for rank in range(1, len(vocabulary) + 1)],
+        k=n_words,
+    )
+
+
+def save_model(directory: Path, words: list[str]) -> None:
+    tokenizer = Tokenizer(models.BPE(unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Metaspace()
+    tokenizer.decoder = decoders.Metaspace()
+    tokenizer.train_from_iterator(
+        [" ".join(words)],
+        trainers.BpeTrainer(
+            vocab_size=512, special_tokens=["<unk>", "<s>", "</s>"]
+        ),
+    )
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="<s> $A", special_tokens=[("<s>", 1)]
+    )
+    PreTrainedTokenizerFast(  # type: ignore[no-untyped-call,unused-ignore]
+        tokenizer_object=tokenizer,
+        bos_token="<s>",
+        eos_token="</s>",
+        unk_token="<unk>",
+    ).save_pretrained(directory)
+    torch.manual_seed(0)
+    LlamaForCausalLM(  # type: ignore[no-untyped-call,unused-ignore]
+        LlamaConfig(  # type: ignore[no-untyped-call,unused-ignore]
+            vocab_size=tokenizer.get_vocab_size(),
+            hidden_size=64,
+            intermediate_size=128,
+            num_hidden_layers=2,
+            num_attention_heads=4,
+            num_key_value_heads=4,
+            max_position_embeddings=2048,
+            bos_token_id=1,
+            eos_token_id=2,
+        )
+    ).save_pretrained(directory)
+
+
+if __name__ == "__main__":
+    CliApp.run(Benchmark)
@@ -0,0 +1,171 @@
+import csv
+import json
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from ocr.batch import BatchJob
+from ocr.batch import BatchOCR
+from ocr.resources import share_resources
+from ocr.transfomations import LLMCleanup
+from ocr.transfomations import Transformation
+from pydantic import SecretStr
+from tests.fake_vision_client import FakeVisionClient
+
+
+class TestBatchOCR(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+        self.client = FakeVisionClient(token=SecretStr("token"), latency=0.01)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _job(self, name: str, *pages: str) -> dict[str, Any]:
+        book = self.directory / name
+        book.mkdir()
+        for index, page in enumerate(pages):
+            path = book / f"page_{index}.png"
+            path.write_text(page)
+            mtime = 1_000_000 + index
+            os.utime(path, (mtime, mtime))
+        return {
+            "name": name,
+            "input": {"type": "directory", "input_directory": str(book)},
+            "outputs": [
+                {
+                    "type": "combined",
+                    "path": str(self.directory / f"{name}.txt"),
+                }
+            ],
+        }
+
+    def _batch(self, manifest: Path, **fields: Any) -> BatchOCR:
+        return BatchOCR(
+            manifest=manifest,
+            text_extractor={
+                "vision_client": self.client,
+                "n_tasks": 3,
+            },
+            summary_path=self.directory / "summary.jsonl",
+            _cli_parse_args=[],
+            **fields,
+        )
+
+    def _summaries(self) -> dict[str, dict[str, Any]]:
+        lines = (self.directory / "summary.jsonl").read_text().splitlines()
+        return {summary["name"]: summary for summary in map(json.loads, lines)}
+
+    async def test_jsonl_jobs_share_one_concurrency_budget(self) -> None:
+        jobs = [
+            self._job(name, *(f"{name} {index}" for index in range(6)))
+            for name in ("alpha", "beta", "gamma")
+        ]
+        manifest = self.directory / "jobs.jsonl"
+        manifest.write_text("\n".join(map(json.dumps, jobs)))
+        batch = self._batch(manifest, max_jobs=3)
+        await batch.cli_cmd()
+        self.assertLessEqual(self.client.annotator.peak, 3)
+        names = [text.split()[0] for text in self.client.annotator.texts]
+        self.assertLess(
+            max(map(names.index, ("alpha", "beta", "gamma"))),
+            min(
+                len(names) - names[::-1].index(name) - 1
+                for name in ("alpha", "beta", "gamma")
+            ),
+        )
+        for name in ("alpha", "beta", "gamma"):
+            self.assertEqual(
+                (self.directory / f"{name}.txt").read_text(),
+                "\n".join(f"{name} {index}" for index in range(6)),
+            )
+        summaries = self._summaries()
+        self.assertEqual(summaries["beta"]["status"], "done")
+        self.assertEqual(summaries["beta"]["pages"], 6)
+        self.assertEqual(summaries["beta"]["characters"], 36)
+
+    async def test_failed_job_does_not_stop_others(self) -> None:
+        jobs = [
+            self._job("good", "a", "b"),
+            self._job("bad", "a", "fail"),
+        ]
+        manifest = self.directory / "jobs.csv"
+        with manifest.open("w", newline="") as file:
+            writer = csv.DictWriter(
+                file, fieldnames=["name", "input", "outputs"]
+            )
+            writer.writeheader()
+            for job in jobs:
+                writer.writerow(
+                    {
+                        "name": job["name"],
+                        "input": json.dumps(job["input"]),
+                        "outputs": json.dumps(job["outputs"]),
+                    }
+                )
+        await self._batch(manifest, streaming=True).cli_cmd()
+        summaries = self._summaries()
+        self.assertEqual(summaries["good"]["status"], "done")
+        self.assertEqual(summaries["bad"]["status"], "failed")
+        self.assertIn("fail", summaries["bad"]["error"])
+        self.assertEqual((self.directory / "good.txt").read_text(), "a\nb")
+
+    def test_duplicate_job_names_are_rejected(self) -> None:
+        job = self._job("book", "a")
+        manifest = self.directory / "jobs.jsonl"
+        manifest.write_text("\n".join(map(json.dumps, (job, job))))
+        with self.assertRaisesRegex(ValueError, "Duplicate"):
+            self._batch(manifest)._load_jobs()
+
+
+class TestShareResources(unittest.TestCase):
+    def test_identical_llm_providers_are_shared(self) -> None:
+        def job(name: str, api_key: str) -> BatchJob:
+            cleanup = {
+                "type": "llm-cleanup",
+                "llm_provider": {
+                    "type": "anthropic",
+                    "anthropic_api_key": api_key,
+                },
+            }
+            return BatchJob.model_validate(
+                {
+                    "name": name,
+                    "input": {"type": "directory", "input_directory": "."},
+                    "outputs": [
+                        {
+                            "type": "combined",
+                            "path": f"{name}.txt",
+                            "transformations": [cleanup],
+                        }
+                    ],
+                    "transformations": [cleanup],
+                }
+            )
+
+        jobs = (job("a", "key"), job("b", "key"), job("c", "other-key"))
+        resources = share_resources(jobs)
+        transformations: list[Transformation] = [
+            transformation
+            for job in jobs
+            for transformation in (
+                *job.transformations,
+                *job.outputs[0].transformations,
+            )
+        ]
+        providers = [
+            transformation.llm_provider
+            for transformation in transformations
+            if isinstance(transformation, LLMCleanup)
+        ]
+        self.assertEqual(len(resources), 2)
+        self.assertEqual(len({id(provider) for provider in providers}), 2)
+        self.assertIs(providers[0], providers[3])
+        self.assertIsNot(providers[0], providers[4])
+
+
+if __name__ == "__main__":
+    unittest.main()
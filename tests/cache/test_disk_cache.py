@@ -0,0 +1,52 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ocr.cache import DiskCache
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_get_returns_stored_value(self) -> None:
+        cache = DiskCache(directory=self.directory)
+        cache.set("abcdef", "text")
+        self.assertEqual(cache.get("abcdef"), "text")
+        self.assertIsNone(cache.get("012345"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_entries_persist_between_instances(self) -> None:
+        DiskCache(directory=self.directory).set("abcdef", "text")
+        self.assertEqual(
+            DiskCache(directory=self.directory).get("abcdef"), "text"
+        )
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = DiskCache(directory=self.directory, max_entries=2)
+        cache.set("aa", "first")
+        cache.set("bb", "second")
+        cache.get("aa")
+        cache.set("cc", "third")
+        self.assertIsNone(cache.get("bb"))
+        self.assertEqual(cache.get("aa"), "first")
+        self.assertEqual(cache.get("cc"), "third")
+
+    def test_size_limit_is_respected(self) -> None:
+        cache = DiskCache(directory=self.directory, max_size_bytes=10)
+        cache.set("aa", "12345")
+        cache.set("bb", "12345")
+        cache.set("cc", "12345")
+        self.assertIsNone(cache.get("aa"))
+        self.assertEqual(
+            sum(path.stat().st_size for path in self.directory.glob("*/*")),
+            10,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
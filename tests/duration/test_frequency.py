@@ -1,6 +1,7 @@
 import unittest
 
 from ocr.output.duration.frequency import FrequencyDurationCalculator
+from ocr.output.duration.frequency import _word_frequency
 
 
 class TestFrequencyDurationCalculator(unittest.TestCase):
@@ -42,6 +43,37 @@ class TestFrequencyDurationCalculator(unittest.TestCase):
         for rare_duration in rare_durations:
             self.assertGreater(rare_duration, calculator.min_duration)
 
+    def test_bulk_durations_match_per_word_durations(self) -> None:
+        calculator = FrequencyDurationCalculator()
+        words = "Ala ma kota, a kot ma Alę. Ala ma kota!".split()
+        self.assertEqual(
+            calculator.calculate_durations(words),
+            list(map(calculator.calculate_duration, words)),
+        )
+        self.assertEqual(calculator.calculate_durations([]), [])
+
+    def test_bulk_durations_of_unknown_words_and_punctuation(self) -> None:
+        calculator = FrequencyDurationCalculator()
+        words = ["kot", "—", "qxzvjw", "...", "Qxzvjw!", "kot"]
+        durations = calculator.calculate_durations(words)
+        self.assertEqual(
+            durations, list(map(calculator.calculate_duration, words))
+        )
+        self.assertEqual(durations[1:5], [calculator.max_duration] * 4)
+        self.assertLess(durations[0], calculator.max_duration)
+
+    def test_repeated_words_hit_the_memo(self) -> None:
+        calculator = FrequencyDurationCalculator()
+        words = ["Zapamiętany", "zapamiętany,", "ZAPAMIĘTANY!"] * 3
+        before = _word_frequency.cache_info()
+        calculator.calculate_durations(words)
+        for word in words:
+            calculator.calculate_duration(word)
+        after = _word_frequency.cache_info()
+        misses = after.misses - before.misses
+        self.assertLessEqual(misses, 1)
+        self.assertEqual(after.hits - before.hits + misses, 3 + len(words))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ocr.output.duration.compile_lexicon import CompileLexicon
+from ocr.output.duration.frequency import FrequencyDurationCalculator
+from ocr.output.duration.lexicon import Lexicon
+from ocr.output.duration.lexicon import write_lexicon
+from pydantic import ValidationError
+from wordfreq import top_n_list
+
+
+class TestLexicon(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.path = Path(self._directory.name) / "pl.lexicon"
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_lookup_finds_every_word(self) -> None:
+        frequencies = {"ala": 1e-4, "kot": 2e-5, "źdźbło": 3e-7, "a": 0.01}
+        write_lexicon(self.path, "pl", frequencies)
+        lexicon = Lexicon(path=self.path, default_frequency=1e-9)
+        self.assertEqual(lexicon.language, "pl")
+        self.assertEqual(len(lexicon), 4)
+        for word, frequency in frequencies.items():
+            self.assertEqual(lexicon.frequency(word), frequency)
+        for word in ("", "al", "kota", "żaba", "zz"):
+            self.assertEqual(lexicon.frequency(word), 1e-9)
+
+    def test_long_language_code_is_rejected(self) -> None:
+        for language in ("zh-Hant-TW-x-abc", "ł" * 8):
+            write_lexicon(self.path, language, {"a": 0.5})
+            self.assertEqual(Lexicon(path=self.path).language, language)
+        with self.assertRaises(ValueError):
+            write_lexicon(self.path.with_name("long"), "ł" * 9, {"a": 0.5})
+        self.assertFalse(self.path.with_name("long").exists())
+
+    def test_compiled_lexicon_matches_wordfreq(self) -> None:
+        CompileLexicon(
+            language="pl", path=self.path, top_n=2000, _cli_parse_args=[]
+        ).cli_cmd()
+        words = top_n_list("pl", 3000) + ["Kota,", "żółć!", "xyzzyq"]
+        calculator = FrequencyDurationCalculator()
+        with_lexicon = FrequencyDurationCalculator(
+            lexicon=Lexicon(path=self.path)
+        )
+        covered = set(top_n_list("pl", 2000))
+        for word, expected, duration in zip(
+            words,
+            calculator.calculate_durations(words),
+            with_lexicon.calculate_durations(words),
+        ):
+            if word in covered:
+                self.assertEqual(duration, expected, word)
+            else:
+                self.assertIn(duration, (expected, calculator.max_duration))
+
+    def test_language_mismatch_is_rejected(self) -> None:
+        write_lexicon(self.path, "en", {"the": 0.05})
+        with self.assertRaises(ValueError):
+            FrequencyDurationCalculator(lexicon=Lexicon(path=self.path))
+
+    def test_invalid_file_is_rejected(self) -> None:
+        self.path.write_bytes(b"not a lexicon")
+        with self.assertRaises(ValidationError):
+            Lexicon(path=self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+try:
+    from ocr.output.duration.transformer import TransformerDurationCalculator
+    from scripts.transformer_duration_benchmark import (
+        FullContextDurationCalculator,
+    )
+    from scripts.transformer_duration_benchmark import generate_words
+    from scripts.transformer_duration_benchmark import save_model
+    from tokenizers import Tokenizer
+except ImportError:
+    TransformerDurationCalculator = None  # type: ignore[assignment,misc]
+
+_CONTEXT_WINDOW = 8
+_PREFILL_STRIDE = 4
+_PAGE_WORDS = 7
+
+
+@unittest.skipUnless(TransformerDurationCalculator, "torch is not installed")
+class TestTransformerDurationCalculator(unittest.TestCase):
+    _directory: TemporaryDirectory[str]
+    model_name: str
+    words: list[str]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._directory = TemporaryDirectory()
+        cls.model_name = cls._directory.name
+        vocabulary = generate_words(60, 100)
+        save_model(Path(cls.model_name), vocabulary)
+        cls.words = [
+            (
+                f" {word}"
+                if index % _PREFILL_STRIDE == 1
+                else f"{word}przestyciu" if index % 5 == 2 else word
+            )
+            for index, word in enumerate(vocabulary)
+        ]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._directory.cleanup()
+
+    def _calculator(self) -> TransformerDurationCalculator:
+        return TransformerDurationCalculator(
+            model_name=self.model_name,
+            context_window=_CONTEXT_WINDOW,
+            prefill_stride=_PREFILL_STRIDE,
+        )
+
+    def _reference(self) -> list[float]:
+        calculator = FullContextDurationCalculator(
+            model_name=self.model_name,
+            context_window=_CONTEXT_WINDOW,
+            prefill_stride=_PREFILL_STRIDE,
+        )
+        return list(map(calculator.calculate_duration, self.words))
+
+    def assertDurationsEqual(
+        self, durations: list[float], expected: list[float]
+    ) -> None:
+        self.assertEqual(len(durations), len(expected))
+        for duration, expected_duration in zip(durations, expected):
+            self.assertAlmostEqual(duration, expected_duration, places=4)
+
+    def test_cached_durations_match_full_recompute(self) -> None:
+        self.assertGreater(len(self.words), _CONTEXT_WINDOW + _PREFILL_STRIDE)
+        calculator = self._calculator()
+        self.assertDurationsEqual(
+            list(map(calculator.calculate_duration, self.words)),
+            self._reference(),
+        )
+
+    def test_bulk_durations_match_per_word_and_full_recompute(self) -> None:
+        tokenizer = Tokenizer.from_file(
+            str(Path(self.model_name, "tokenizer.json"))
+        )
+        self.assertTrue(
+            any(
+                len(tokenizer.encode(word, add_special_tokens=False).ids) > 1
+                for word in self.words
+                if word.endswith("przestyciu")
+            )
+        )
+        calculator = self._calculator()
+        per_word = list(map(calculator.calculate_duration, self.words))
+        calculator.reset()
+        bulk = [
+            duration
+            for index in range(0, len(self.words), _PAGE_WORDS)
+            for duration in calculator.calculate_durations(
+                self.words[index : index + _PAGE_WORDS]
+            )
+        ]
+        calculator.reset()
+        mixed = [
+            duration
+            for index in range(0, len(self.words), _PAGE_WORDS)
+            for duration in (
+                calculator.calculate_durations(
+                    self.words[index : index + _PAGE_WORDS]
+                )
+                if index % 2
+                else list(
+                    map(
+                        calculator.calculate_duration,
+                        self.words[index : index + _PAGE_WORDS],
+                    )
+                )
+            )
+        ]
+        reference = self._reference()
+        self.assertDurationsEqual(bulk, per_word)
+        self.assertDurationsEqual(bulk, reference)
+        self.assertDurationsEqual(mixed, reference)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+try:
+    from ocr.output.duration.backend import QuantizedTorchBackend
+    from ocr.output.duration.backend import TorchBackend
+    from ocr.output.duration.backend.onnx_runtime import OnnxBackend
+    from ocr.output.duration.transformer import TransformerDurationCalculator
+    from scripts.transformer_duration_benchmark import generate_words
+    from scripts.transformer_duration_benchmark import save_model
+except ImportError:
+    OnnxBackend = None  # type: ignore[assignment,misc]
+
+_TOLERANCE = 0.05
+_PAGE_WORDS = 7
+
+
+@unittest.skipUnless(OnnxBackend, "optimum or torch is not installed")
+class TestTransformerBackends(unittest.TestCase):
+    _directory: TemporaryDirectory[str]
+    model_name: str
+    words: list[str]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._directory = TemporaryDirectory()
+        cls.model_name = str(Path(cls._directory.name, "model"))
+        cls.words = generate_words(60, 100)
+        save_model(Path(cls.model_name), cls.words)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._directory.cleanup()
+
+    def _durations(
+        self,
+        backend: TorchBackend | OnnxBackend,
+        bulk: bool,
+    ) -> list[float]:
+        calculator = TransformerDurationCalculator(
+            model_name=self.model_name,
+            context_window=8,
+            prefill_stride=4,
+            backend=backend,
+        )
+        if not bulk:
+            return list(map(calculator.calculate_duration, self.words))
+        return [
+            duration
+            for index in range(0, len(self.words), _PAGE_WORDS)
+            for duration in calculator.calculate_durations(
+                self.words[index : index + _PAGE_WORDS]
+            )
+        ]
+
+    def test_backends_match_torch(self) -> None:
+        backends: dict[str, TorchBackend | OnnxBackend] = {
+            "torch-int8": QuantizedTorchBackend(),
+            "onnx": OnnxBackend(
+                export_directory=Path(self._directory.name, "onnx")
+            ),
+        }
+        for bulk in (False, True):
+            expected = self._durations(TorchBackend(), bulk)
+            for name, backend in backends.items():
+                with self.subTest(backend=name, bulk=bulk):
+                    durations = self._durations(backend, bulk)
+                    self.assertEqual(len(durations), len(expected))
+                    for duration, expected_duration in zip(
+                        durations, expected
+                    ):
+                        self.assertAlmostEqual(
+                            duration, expected_duration, delta=_TOLERANCE
+                        )
+
+
+if __name__ == "__main__":
+    unittest.main()
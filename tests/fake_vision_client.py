@@ -0,0 +1,111 @@
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any
+from typing import Optional
+
+from google.api_core import exceptions
+from google.cloud import vision_v1
+from ocr.vision_client import SyncVisionClient
+
+
+class FakeAnnotatorClient:
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.batches: list[list[bytes]] = []
+        self.limit: Optional[int] = None
+        self.raise_for = 0
+        self.throttle_once: set[str] = set()
+        self.always_error: dict[str, int] = {}
+        self.max_concurrent: Optional[int] = None
+        self.peak = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def contents(self) -> list[bytes]:
+        return [content for batch in self.batches for content in batch]
+
+    @property
+    def texts(self) -> list[str]:
+        return [content.decode() for content in self.contents]
+
+    @property
+    def requests(self) -> list[list[str]]:
+        return [
+            [content.decode() for content in batch] for batch in self.batches
+        ]
+
+    @property
+    def batch_sizes(self) -> list[int]:
+        return list(map(len, self.batches))
+
+    @property
+    def n_images(self) -> int:
+        return len(self.contents)
+
+    def batch_annotate_images(
+        self, requests: Sequence[vision_v1.AnnotateImageRequest]
+    ) -> vision_v1.BatchAnnotateImagesResponse:
+        contents = [request.image.content for request in requests]
+        with self._lock:
+            if (
+                self.limit is not None
+                and self.n_images + len(contents) > self.limit
+            ):
+                raise ConnectionError("connection lost")
+            self.batches.append(contents)
+            self._in_flight += 1
+            self.peak = max(self.peak, self._in_flight)
+            overloaded = (
+                self.max_concurrent is not None
+                and self._in_flight > self.max_concurrent
+            )
+        try:
+            time.sleep(self.latency)
+            if len(self.batches) <= self.raise_for:
+                raise exceptions.ResourceExhausted(  # type: ignore[no-untyped-call]
+                    "quota exceeded"
+                )
+            return vision_v1.BatchAnnotateImagesResponse(
+                responses=[
+                    self._response(
+                        content.decode(errors="replace"), overloaded
+                    )
+                    for content in contents
+                ]
+            )
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _response(
+        self, text: str, overloaded: bool
+    ) -> vision_v1.AnnotateImageResponse:
+        code = self.always_error.get(
+            text, 3 if text.startswith("fail") else None
+        )
+        if overloaded or text in self.throttle_once:
+            self.throttle_once.discard(text)
+            code = 8
+        if code is not None:
+            return vision_v1.AnnotateImageResponse(
+                error={"code": code, "message": f"error {code} for {text}"}
+            )
+        return vision_v1.AnnotateImageResponse(
+            text_annotations=[{"description": text}]
+        )
+
+
+class FakeVisionClient(SyncVisionClient):
+    latency: float = 0.0
+    _client: Any
+    _annotator: FakeAnnotatorClient
+
+    def model_post_init(self, context: Any, /) -> None:
+        self._annotator = self._client = FakeAnnotatorClient(self.latency)
+        self._executor = None
+
+    @property
+    def annotator(self) -> FakeAnnotatorClient:
+        return self._annotator
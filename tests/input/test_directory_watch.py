@@ -0,0 +1,116 @@
+import asyncio
+import os
+import unittest
+from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterator
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from ocr.input.directory import DirectoryInput
+from ocr.input.watcher import PollingWatcher
+from ocr.page import PageSource
+from ocr.pipeline import Pipeline
+from ocr.transfomations import DuplicateLongWords
+
+try:
+    from ocr.input.watcher.inotify import InotifyWatcher
+except ImportError:
+    InotifyWatcher = None  # type: ignore[assignment,misc]
+
+
+def _path(image: PageSource) -> Path:
+    if not isinstance(image, Path):
+        raise TypeError(f"{image} was not read from a file")
+    return image
+
+
+class TestDirectoryWatch(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _input(self, **fields: Any) -> DirectoryInput:
+        return DirectoryInput(
+            **{
+                "input_directory": self.directory,
+                "watch": True,
+                "settle_time": 0.2,
+                "watcher": PollingWatcher(rescan_interval=0.02),
+                **fields,
+            }
+        )
+
+    def _images(self, **fields: Any) -> AsyncGenerator[PageSource, None]:
+        images = self._input(**fields).iter_images()
+        if not isinstance(images, AsyncGenerator):
+            raise TypeError(f"{images} cannot be closed")
+        self.addAsyncCleanup(images.aclose)
+        return images
+
+    def _write(self, name: str, content: str, mtime: float) -> Path:
+        path = self.directory / name
+        path.write_text(content)
+        os.utime(path, (mtime, mtime))
+        return path
+
+    async def _next(self, images: AsyncIterator[PageSource]) -> PageSource:
+        return await asyncio.wait_for(anext(images), 5)
+
+    async def test_existing_and_new_files_are_yielded_in_order(self) -> None:
+        self._write("b.png", "b", 2)
+        self._write("a.png", "a", 1)
+        images = self._images()
+        self.assertEqual((await self._next(images)).name, "a.png")
+        self.assertEqual((await self._next(images)).name, "b.png")
+        self._write("c.png", "c", 3)
+        (self.directory / "notes.txt").write_text("ignored")
+        self.assertEqual((await self._next(images)).name, "c.png")
+
+    def test_document_level_transformations_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            Pipeline(
+                input=self._input(),
+                outputs=(),
+                transformations=(DuplicateLongWords(),),
+            )
+
+    async def test_skip_existing_only_yields_new_files(self) -> None:
+        self._write("old.png", "old", 1)
+        images = self._images(skip_existing=True)
+        next_image = asyncio.ensure_future(self._next(images))
+        await asyncio.sleep(0.1)
+        self._write("new.png", "new", 2)
+        self.assertEqual((await next_image).name, "new.png")
+
+    async def test_partially_written_files_are_debounced(self) -> None:
+        images = self._images()
+        next_image = asyncio.ensure_future(self._next(images))
+        path = self.directory / "page.png"
+        with path.open("w") as file:
+            for part in range(5):
+                file.write(f"part {part};")
+                file.flush()
+                await asyncio.sleep(0.05)
+                self.assertFalse(next_image.done())
+        image = await next_image
+        self.assertEqual(
+            _path(image).read_text(), "".join(f"part {i};" for i in range(5))
+        )
+
+    @unittest.skipIf(InotifyWatcher is None, "watchdog is not installed")
+    async def test_inotify_wakes_up_without_rescanning(self) -> None:
+        images = self._images(
+            settle_time=0, watcher=InotifyWatcher(rescan_interval=60)
+        )
+        next_image = asyncio.ensure_future(self._next(images))
+        await asyncio.sleep(0.2)
+        self._write("page.png", "page", 1)
+        self.assertEqual((await next_image).name, "page.png")
+
+
+if __name__ == "__main__":
+    unittest.main()
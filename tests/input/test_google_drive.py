@@ -0,0 +1,353 @@
+import hashlib
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+from google.auth.credentials import AnonymousCredentials
+from google.auth.credentials import Credentials
+from googleapiclient.errors import HttpError
+from ocr.input.drive_manifest import DriveManifest
+from ocr.input.google_drive import GoogleDriveInput
+from ocr.input.google_drive_directory import GoogleDriveDirectoryInput
+from ocr.journal import Journal
+from ocr.output import CombinedOutput
+from ocr.page import Page
+from ocr.pipeline import Pipeline
+from ocr.text_extractor import TextExtractor
+from pydantic import SecretStr
+from tests.fake_vision_client import FakeVisionClient
+
+
+class FakeDrive:
+    def __init__(self) -> None:
+        self.folders: dict[str, list[dict[str, str]]] = {}
+        self.contents: dict[str, bytes] = {}
+        self.failures: dict[str, int] = {}
+        self.latency = 0.0
+        self.list_requests = 0
+        self.ranges: list[str] = []
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.peak = 0
+
+    def add_file(self, folder_id: str, name: str, content: bytes) -> None:
+        file_id = f"{folder_id}-{name}"
+        self.folders.setdefault(folder_id, []).append(
+            {
+                "id": file_id,
+                "name": name,
+                "modifiedTime": name,
+                "md5Checksum": hashlib.md5(content).hexdigest(),
+            }
+        )
+        self.contents[file_id] = content
+
+    def update_file(self, folder_id: str, name: str, content: bytes) -> None:
+        self.folders[folder_id] = [
+            file for file in self.folders[folder_id] if file["name"] != name
+        ]
+        self.add_file(folder_id, name, content)
+        self.folders[folder_id][-1]["modifiedTime"] += " (updated)"
+
+    def handler(self) -> type[BaseHTTPRequestHandler]:
+        drive = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                query = {
+                    key: values[0]
+                    for key, values in parse_qs(url.query).items()
+                }
+                if url.path == "/drive/v3/files":
+                    self._list(query)
+                else:
+                    self._media(url.path.rsplit("/", 1)[1])
+
+            def _list(self, query: dict[str, str]) -> None:
+                with drive._lock:
+                    drive.list_requests += 1
+                folder_id = query["q"].split("'")[1]
+                files = sorted(
+                    drive.folders.get(folder_id, ()),
+                    key=lambda file: file[query["orderBy"].split()[0]],
+                    reverse="desc" in query["orderBy"],
+                )
+                start = int(query.get("pageToken", 0))
+                end = start + int(query["pageSize"])
+                body: dict[str, Any] = {"files": files[start:end]}
+                if end < len(files):
+                    body["nextPageToken"] = str(end)
+                self._send(200, json.dumps(body).encode(), "application/json")
+
+            def _media(self, file_id: str) -> None:
+                with drive._lock:
+                    if drive.failures.get(file_id, 0):
+                        drive.failures[file_id] -= 1
+                        failed = True
+                    else:
+                        failed = False
+                        drive._in_flight += 1
+                        drive.peak = max(drive.peak, drive._in_flight)
+                if failed:
+                    self._send(503, b"{}", "application/json")
+                    return
+                time.sleep(drive.latency)
+                with drive._lock:
+                    drive._in_flight -= 1
+                content = drive.contents[file_id]
+                first, last = map(
+                    int, self.headers["range"].split("=")[1].split("-")
+                )
+                drive.ranges.append(self.headers["range"])
+                chunk = content[first : last + 1]
+                self.send_response(206)
+                self.send_header(
+                    "Content-Range",
+                    f"bytes {first}-{first + len(chunk) - 1}/{len(content)}",
+                )
+                self.send_header("Content-Length", str(len(chunk)))
+                self.end_headers()
+                self.wfile.write(chunk)
+
+            def _send(
+                self, status: int, body: bytes, content_type: str
+            ) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+class FakeDriveInput(GoogleDriveInput):
+    def _load_credentials(self) -> Credentials:
+        return AnonymousCredentials()  # type: ignore[no-untyped-call]
+
+
+class FakeDriveDirectoryInput(GoogleDriveDirectoryInput):
+    def _load_credentials(self) -> Credentials:
+        return AnonymousCredentials()  # type: ignore[no-untyped-call]
+
+
+class FakeDriveTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+        self.credentials_path = self.directory / "credentials.json"
+        self.credentials_path.write_text("{}")
+        self.drive = FakeDrive()
+        for index in range(12):
+            self.drive.add_file(
+                "folder",
+                f"scan_{index:02d}.png",
+                f"page {index}".encode() * 10,
+            )
+        self.drive.add_file("folder", "notes.txt", b"not an image")
+        self.server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), self.drive.handler()
+        )
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self._directory.cleanup()
+
+    def _input(
+        self,
+        input_type: type[GoogleDriveInput] = FakeDriveInput,
+        **fields: Any,
+    ) -> GoogleDriveInput:
+        return input_type(
+            **{
+                "credentials_path": self.credentials_path,
+                "directory_id": "folder",
+                "temp_directory": self.directory / "pages",
+                "api_endpoint": (
+                    f"http://127.0.0.1:{self.server.server_port}/drive/v3/"
+                ),
+                "retry_delay": 0,
+                **fields,
+            }
+        )
+
+    def _expected(self) -> list[bytes]:
+        return [f"page {index}".encode() * 10 for index in range(12)]
+
+
+class TestGoogleDriveInput(FakeDriveTestCase):
+    def test_paginated_listing_is_downloaded_in_order(self) -> None:
+        images = self._input(page_size=5).get_images()
+        self.assertEqual(
+            [
+                image.read_bytes()
+                for image in images
+                if isinstance(image, Path)
+            ],
+            self._expected(),
+        )
+        self.assertEqual(self.drive.list_requests, 3)
+
+    def test_downloads_run_concurrently(self) -> None:
+        self.drive.latency = 0.05
+        self._input(n_workers=4).get_images()
+        self.assertGreater(self.drive.peak, 1)
+        self.assertLessEqual(self.drive.peak, 4)
+
+    def test_chunk_size_is_used(self) -> None:
+        images = self._input(chunk_size=16, in_memory=True).get_images()
+        self.assertEqual(
+            [image.content for image in images if isinstance(image, Page)],
+            self._expected(),
+        )
+        self.assertIn("bytes=16-31", self.drive.ranges)
+
+    def test_transient_errors_are_retried(self) -> None:
+        self.drive.failures = {
+            "folder-scan_03.png": 2,
+            "folder-scan_07.png": 1,
+        }
+        images = self._input(num_retries=2).get_images()
+        self.assertEqual(
+            [
+                image.read_bytes()
+                for image in images
+                if isinstance(image, Path)
+            ],
+            self._expected(),
+        )
+
+    def test_persistent_errors_are_raised(self) -> None:
+        self.drive.failures = {"folder-scan_03.png": 3}
+        with self.assertRaises(HttpError):
+            self._input(num_retries=2).get_images()
+
+    async def test_pages_are_streamed_in_order(self) -> None:
+        drive_input = self._input(n_workers=3, in_memory=True)
+        pages = [page async for page in drive_input.iter_images()]
+        self.assertEqual(
+            [page.number for page in pages if isinstance(page, Page)],
+            list(range(12)),
+        )
+
+    def test_directory_input_uses_latest_folder(self) -> None:
+        self.drive.folders["root"] = [
+            {"id": "old", "name": "old", "modifiedTime": "1"},
+            {"id": "folder", "name": "new", "modifiedTime": "2"},
+        ]
+        images = self._input(
+            FakeDriveDirectoryInput, directory_id="root", in_memory=True
+        ).get_images()
+        self.assertEqual(len(images), 12)
+
+
+class TestIncrementalDriveSync(FakeDriveTestCase):
+    def _manifest_input(self) -> GoogleDriveInput:
+        return self._input(
+            manifest=DriveManifest(path=self.directory / "manifest.json"),
+            in_memory=True,
+        )
+
+    async def _sync(self) -> tuple[str, int]:
+        drive_input = self._manifest_input()
+        client = FakeVisionClient(token=SecretStr("token"))
+        text = await TextExtractor(vision_client=client).extract_from_images(
+            drive_input.get_images(), record=drive_input.record_text
+        )
+        return text, client.annotator.n_images
+
+    async def test_unchanged_folder_costs_one_list_call(self) -> None:
+        first_text, first_requests = await self._sync()
+        self.drive.list_requests = 0
+        self.drive.ranges = []
+        second_text, second_requests = await self._sync()
+        self.assertEqual(first_text, second_text)
+        self.assertEqual(first_requests, 12)
+        self.assertEqual(second_requests, 0)
+        self.assertEqual(self.drive.list_requests, 1)
+        self.assertEqual(self.drive.ranges, [])
+
+    async def test_only_changed_files_are_downloaded(self) -> None:
+        await self._sync()
+        self.drive.update_file("folder", "scan_05.png", b"changed")
+        self.drive.add_file("folder", "scan_99.png", b"added")
+        self.drive.ranges = []
+        text, requests = await self._sync()
+        self.assertEqual(requests, 2)
+        self.assertEqual(len(self.drive.ranges), 2)
+        lines = text.split("\n")
+        self.assertEqual(lines[5], "changed")
+        self.assertEqual(lines[-1], "added")
+        self.assertEqual(lines[4], (b"page 4" * 10).decode())
+
+    async def test_removed_files_are_dropped_from_manifest(self) -> None:
+        await self._sync()
+        self.drive.folders["folder"] = self.drive.folders["folder"][:3]
+        await self._sync()
+        manifest_path = self.directory / "manifest.json"
+        self.assertEqual(len(json.loads(manifest_path.read_text())), 3)
+
+    async def test_duplicate_names_are_recorded_per_file(self) -> None:
+        self.drive.folders["folder"].append(
+            {
+                "id": "duplicate",
+                "name": "scan_03.png",
+                "modifiedTime": "scan_03.png",
+                "md5Checksum": "duplicate",
+            }
+        )
+        self.drive.contents["duplicate"] = b"duplicate"
+        first_text, first_requests = await self._sync()
+        second_text, second_requests = await self._sync()
+        self.assertEqual((first_requests, second_requests), (13, 0))
+        self.assertEqual(first_text, second_text)
+        entries = json.loads((self.directory / "manifest.json").read_text())
+        self.assertEqual(entries["duplicate"]["text"], "duplicate")
+        self.assertEqual(
+            entries["folder-scan_03.png"]["text"], (b"page 3" * 10).decode()
+        )
+
+    async def test_failed_pages_are_not_recorded(self) -> None:
+        drive_input = self._manifest_input()
+        images = drive_input.get_images()
+        drive_input.record_text(images[0], "text")
+        self.drive.ranges = []
+        self._manifest_input().get_images()
+        self.assertEqual(len(self.drive.ranges), 11)
+
+
+class TestDriveJournal(FakeDriveTestCase):
+    async def test_resume_skips_downloads_of_completed_pages(self) -> None:
+        output = self.directory / "result.txt"
+        for resume in (False, True):
+            self.drive.ranges = []
+            client = FakeVisionClient(token=SecretStr("token"))
+            await Pipeline(
+                input=self._input(in_memory=True),
+                outputs=(CombinedOutput(path=output),),
+                journal=Journal(path=self.directory / "run.db", resume=resume),
+            ).run(TextExtractor(vision_client=client))
+        self.assertEqual(self.drive.ranges, [])
+        self.assertEqual(client.annotator.n_images, 0)
+        self.assertEqual(
+            output.read_text(),
+            "\n".join(content.decode() for content in self._expected()),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+import shutil
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from ocr.input.pdf import PdfInput
+from ocr.output import CombinedOutput
+from ocr.page import Page
+from ocr.page import PageSource
+from ocr.pipeline import Pipeline
+from ocr.text_extractor import TextExtractor
+from PIL import Image
+from pydantic import SecretStr
+from tests.fake_vision_client import FakeVisionClient
+
+
+class FakeRenderer:
+    def __init__(self) -> None:
+        self.windows: list[tuple[int, int]] = []
+        self.pages_on_disk: list[int] = []
+
+    def __call__(
+        self,
+        pdf_path: Path,
+        first_page: int,
+        last_page: int,
+        output_folder: Path | None = None,
+        output_file: str = "",
+        **kwargs: Any,
+    ) -> list[str] | list[Image.Image]:
+        self.windows.append((first_page, last_page))
+        if output_folder is None:
+            return [
+                Image.new("L", (page, 1))
+                for page in range(first_page, last_page + 1)
+            ]
+        self.pages_on_disk.append(
+            len(list(output_folder.parent.rglob("*.png")))
+        )
+        paths = []
+        for page in range(first_page, last_page + 1):
+            path = output_folder / f"{output_file}{page:04d}.png"
+            path.write_text(str(page))
+            paths.append(str(path))
+        return paths
+
+
+def _path(image: PageSource) -> Path:
+    if not isinstance(image, Path):
+        raise TypeError(f"{image} was not rendered to a file")
+    return image
+
+
+def _page(image: PageSource) -> Page:
+    if not isinstance(image, Page):
+        raise TypeError(f"{image} was not rendered in memory")
+    return image
+
+
+class TestPdfInput(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+        self.pdf_path = self.directory / "book.pdf"
+        self.pdf_path.write_bytes(b"%PDF-1.4")
+        self.renderer = FakeRenderer()
+        patcher = patch("ocr.input.pdf.convert_from_path", self.renderer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.process_pool = MagicMock(
+            side_effect=lambda max_workers, mp_context: ThreadPoolExecutor(
+                max_workers
+            )
+        )
+        patcher = patch("ocr.input.pdf.ProcessPoolExecutor", self.process_pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _input(self, **fields: Any) -> PdfInput:
+        return PdfInput(
+            pdf_path=self.pdf_path,
+            temp_directory=self.directory / "pages",
+            **fields,
+        )
+
+    def test_pages_are_rendered_in_windows(self) -> None:
+        pdf_input = self._input(
+            start_page=3, number_of_pages=10, window_size=4
+        )
+        images = pdf_input.get_images()
+        self.assertEqual(
+            [_path(image).read_text() for image in images],
+            [str(page) for page in range(3, 13)],
+        )
+        self.assertEqual(self.renderer.windows, [(3, 6), (7, 10), (11, 12)])
+
+    async def test_windows_are_rendered_lazily(self) -> None:
+        pdf_input = self._input(number_of_pages=20, window_size=5)
+        images = pdf_input.iter_images()
+        first_image = await anext(images)
+        self.assertEqual(_path(first_image).read_text(), "1")
+        self.assertLessEqual(len(self.renderer.windows), 2)
+        remaining = [image async for image in images]
+        self.assertEqual(len(remaining), 19)
+        self.assertEqual(len(self.renderer.windows), 4)
+
+    def test_process_pool_keeps_page_order(self) -> None:
+        pdf_input = self._input(
+            number_of_pages=23, window_size=3, n_processes=4
+        )
+        images = pdf_input.get_images()
+        self.assertEqual(
+            [_path(image).read_text() for image in images],
+            [str(page) for page in range(1, 24)],
+        )
+        self.assertEqual(
+            self.process_pool.call_args.kwargs[
+                "mp_context"
+            ].get_start_method(),
+            "forkserver",
+        )
+
+    async def test_process_pool_streams_pages_in_order(self) -> None:
+        pdf_input = self._input(
+            number_of_pages=23, window_size=3, n_processes=4
+        )
+        images = [image async for image in pdf_input.iter_images()]
+        self.assertEqual(
+            [_path(image).read_text() for image in images],
+            [str(page) for page in range(1, 24)],
+        )
+
+    async def test_released_pages_are_deleted(self) -> None:
+        pdf_input = self._input(number_of_pages=3)
+        async for image in pdf_input.iter_images():
+            pdf_input.release_image(image)
+            self.assertFalse(_path(image).exists())
+        self.assertEqual(list((self.directory / "pages").iterdir()), [])
+
+    async def test_keep_images_preserves_pages(self) -> None:
+        pdf_input = self._input(number_of_pages=2, keep_images=True)
+        async for image in pdf_input.iter_images():
+            pdf_input.release_image(image)
+            self.assertTrue(_path(image).exists())
+
+    async def test_in_memory_pages_skip_temp_files(self) -> None:
+        pdf_input = self._input(
+            start_page=2, number_of_pages=5, window_size=2, in_memory=True
+        )
+        pages = [_page(page) async for page in pdf_input.iter_images()]
+        self.assertEqual([page.number for page in pages], [2, 3, 4, 5, 6])
+        self.assertEqual(
+            [Image.open(BytesIO(page.content)).width for page in pages],
+            [2, 3, 4, 5, 6],
+        )
+        self.assertFalse((self.directory / "pages").exists())
+
+    async def test_buffered_run_renders_windows_lazily(self) -> None:
+        output = self.directory / "book.txt"
+        await Pipeline(
+            input=self._input(number_of_pages=20, window_size=2),
+            outputs=(CombinedOutput(path=output),),
+        ).run(
+            TextExtractor(
+                vision_client=FakeVisionClient(token=SecretStr("token")),
+                n_tasks=1,
+            )
+        )
+        self.assertEqual(
+            output.read_text(), "\n".join(str(page) for page in range(1, 21))
+        )
+        self.assertEqual(len(self.renderer.windows), 10)
+        self.assertLessEqual(max(self.renderer.pages_on_disk), 6)
+
+
+@unittest.skipUnless(shutil.which("pdftoppm"), "poppler is not installed")
+class TestPdfInputWithPoppler(unittest.TestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+        self.pdf_path = self.directory / "book.pdf"
+        pages = [
+            Image.new("RGB", (100 + 10 * page, 50), "white")
+            for page in range(5)
+        ]
+        pages[0].save(
+            self.pdf_path, "PDF", save_all=True, append_images=pages[1:]
+        )
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_stale_pages_are_not_picked_up(self) -> None:
+        temp_directory = self.directory / "pages"
+        temp_directory.mkdir()
+        (temp_directory / "page_1_-9.png").write_bytes(b"stale")
+        pdf_input = PdfInput(
+            pdf_path=self.pdf_path,
+            number_of_pages=5,
+            window_size=2,
+            dpi=72,
+            temp_directory=temp_directory,
+        )
+        images = pdf_input.get_images()
+        widths = [Image.open(_path(image)).width for image in images]
+        self.assertEqual(len(widths), 5)
+        self.assertEqual(widths, sorted(set(widths)))
+        for image in images:
+            pdf_input.release_image(image)
+        self.assertEqual(
+            list(temp_directory.iterdir()), [temp_directory / "page_1_-9.png"]
+        )
+
+    def test_process_pool_renders_pages(self) -> None:
+        pdf_input = PdfInput(
+            pdf_path=self.pdf_path,
+            number_of_pages=5,
+            window_size=2,
+            n_processes=2,
+            dpi=72,
+            temp_directory=self.directory / "pages",
+        )
+        widths = [
+            Image.open(_path(image)).width for image in pdf_input.get_images()
+        ]
+        self.assertEqual(widths, sorted(set(widths)))
+        self.assertEqual(len(widths), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import unittest
+from collections.abc import Sequence
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest.mock import patch
+
+from ocr.input import DirectoryInput
+from ocr.input import PdfInput
+from ocr.journal import Journal
+from ocr.output import CombinedOutput
+from ocr.pipeline import Pipeline
+from ocr.text_extractor import TextExtractor
+from ocr.transfomations import LLMCleanup
+from ocr.transfomations.llm_cleanup.provider import Anthropic
+from ocr.transfomations.llm_cleanup.provider.message import Message
+from pydantic import SecretStr
+from tests.input.test_pdf import FakeRenderer
+from tests.fake_vision_client import FakeVisionClient
+
+
+class UppercaseProvider(Anthropic):
+    _calls: int = 0
+
+    async def _clean(self, messages: Sequence[Message]) -> str:
+        self._calls += 1
+        return messages[-1].content.upper()
+
+
+class TestJournal(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+        self.images = self.directory / "images"
+        self.images.mkdir()
+        for index in range(6):
+            path = self.images / f"page_{index}.png"
+            path.write_text(f"text {index}")
+            os.utime(path, (1_000_000 + index, 1_000_000 + index))
+        self.output = self.directory / "result.txt"
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _pipeline(
+        self, resume: bool, **fields: Any
+    ) -> tuple[Pipeline, TextExtractor, FakeVisionClient]:
+        pipeline = Pipeline(
+            **{
+                "input": DirectoryInput(input_directory=self.images),
+                "outputs": (CombinedOutput(path=self.output),),
+                "journal": Journal(
+                    path=self.directory / "run.db", resume=resume
+                ),
+                **fields,
+            }
+        )
+        client = FakeVisionClient(token=SecretStr("token"))
+        extractor = TextExtractor(vision_client=client, n_tasks=1)
+        return pipeline, extractor, client
+
+    async def test_resume_skips_completed_pages(self) -> None:
+        for streaming in (False, True):
+            with self.subTest(streaming=streaming):
+                pipeline, extractor, client = self._pipeline(resume=False)
+                client.annotator.limit = 4
+                with self.assertRaises((ConnectionError, ExceptionGroup)):
+                    await pipeline.run(extractor, streaming)
+                pipeline, extractor, client = self._pipeline(resume=True)
+                await pipeline.run(extractor, streaming)
+                self.assertEqual(client.annotator.n_images, 2)
+                self.assertEqual(
+                    self.output.read_text(),
+                    "\n".join(f"text {index}" for index in range(6)),
+                )
+                self.output.unlink()
+
+    async def test_resume_renders_only_missing_pdf_pages(self) -> None:
+        pdf_path = self.directory / "book.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+        renderers = []
+        for resume, limit in ((False, 4), (True, 1000)):
+            renderer = FakeRenderer()
+            renderers.append(renderer)
+            pipeline, extractor, client = self._pipeline(
+                resume=resume,
+                input=PdfInput(
+                    pdf_path=pdf_path,
+                    number_of_pages=6,
+                    window_size=8,
+                    temp_directory=self.directory / "pages",
+                ),
+            )
+            client.annotator.limit = limit
+            with patch("ocr.input.pdf.convert_from_path", renderer):
+                try:
+                    await pipeline.run(extractor)
+                except ConnectionError:
+                    pass
+        self.assertEqual(renderers[0].windows, [(1, 6)])
+        self.assertEqual(renderers[1].windows, [(5, 6)])
+        self.assertEqual(client.annotator.n_images, 2)
+        self.assertEqual(
+            self.output.read_text(),
+            "\n".join(str(page) for page in range(1, 7)),
+        )
+
+    async def test_without_resume_journal_starts_over(self) -> None:
+        pipeline, extractor, client = self._pipeline(resume=False)
+        await pipeline.run(extractor)
+        pipeline, extractor, client = self._pipeline(resume=False)
+        await pipeline.run(extractor)
+        self.assertEqual(client.annotator.n_images, 6)
+
+    async def test_llm_cleanup_result_is_reused(self) -> None:
+        providers = []
+        for resume in (False, True):
+            provider = UppercaseProvider(anthropic_api_key=SecretStr("key"))
+            providers.append(provider)
+            pipeline, extractor, client = self._pipeline(
+                resume=resume,
+                transformations=(LLMCleanup(llm_provider=provider),),
+            )
+            await pipeline.run(extractor)
+            self.assertEqual(
+                self.output.read_text(),
+                "\n".join(f"TEXT {index}" for index in range(6)),
+            )
+        self.assertEqual([provider._calls for provider in providers], [1, 0])
+        self.assertEqual(client.annotator.n_images, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from io import BytesIO
+from typing import Optional
+
+from ocr.preprocessing import ImageFormat
+from ocr.preprocessing import PagePreprocessor
+from PIL import Image
+from PIL import ImageDraw
+
+
+def _page(
+    size: tuple[int, int] = (400, 600), dpi: Optional[int] = 300
+) -> bytes:
+    image = Image.merge("RGB", 3 * (Image.effect_noise(size, 20),))
+    draw = ImageDraw.Draw(image)
+    for line in range(0, size[1], 20):
+        draw.text((20, line), "Lorem ipsum dolor sit amet " * 4, fill="black")
+    buffer = BytesIO()
+    image.save(
+        buffer, format="PNG", **({} if dpi is None else {"dpi": (dpi, dpi)})
+    )
+    return buffer.getvalue()
+
+
+def _open(content: bytes) -> Image.Image:
+    return Image.open(BytesIO(content))
+
+
+class TestPagePreprocessor(unittest.TestCase):
+    def test_default_keeps_size_and_format(self) -> None:
+        result = _open(PagePreprocessor().process(_page(), "page.png"))
+        self.assertEqual(result.format, "PNG")
+        self.assertEqual(result.size, (400, 600))
+
+    def test_max_dimension_keeps_aspect_ratio(self) -> None:
+        preprocessor = PagePreprocessor(max_dimension=300)
+        result = _open(preprocessor.process(_page(), "page.png"))
+        self.assertEqual(result.size, (200, 300))
+
+    def test_target_dpi_downscales_page(self) -> None:
+        preprocessor = PagePreprocessor(target_dpi=150)
+        result = _open(preprocessor.process(_page(dpi=300), "page.png"))
+        self.assertEqual(result.size, (200, 300))
+
+    def test_target_dpi_does_not_upscale(self) -> None:
+        preprocessor = PagePreprocessor(target_dpi=600)
+        result = _open(preprocessor.process(_page(dpi=300), "page.png"))
+        self.assertEqual(result.size, (400, 600))
+
+    def test_target_dpi_needs_source_dpi(self) -> None:
+        page = _page(dpi=None)
+        preprocessor = PagePreprocessor(target_dpi=150)
+        self.assertEqual(
+            _open(preprocessor.process(page, "page.png")).size, (400, 600)
+        )
+        preprocessor = PagePreprocessor(target_dpi=150, source_dpi=300)
+        self.assertEqual(
+            _open(preprocessor.process(page, "page.png")).size, (200, 300)
+        )
+
+    def test_grayscale(self) -> None:
+        preprocessor = PagePreprocessor(grayscale=True)
+        result = _open(preprocessor.process(_page(), "page.png"))
+        self.assertEqual(result.mode, "L")
+
+    def test_binarization_leaves_two_levels(self) -> None:
+        preprocessor = PagePreprocessor(binarization_threshold=128)
+        result = _open(preprocessor.process(_page(), "page.png"))
+        self.assertEqual(
+            {value for _, value in result.getcolors() or ()}, {0, 255}
+        )
+
+    def test_lossy_formats_are_smaller(self) -> None:
+        page = _page()
+        for image_format in (ImageFormat.JPEG, ImageFormat.WEBP):
+            preprocessor = PagePreprocessor(format=image_format, quality=60)
+            result = preprocessor.process(page, "page.png")
+            self.assertEqual(_open(result).format, image_format.value)
+            self.assertLess(len(result), len(page))
+
+    def test_bytes_are_counted(self) -> None:
+        preprocessor = PagePreprocessor(format=ImageFormat.JPEG)
+        page = _page()
+        results = [preprocessor.process(page, "page.png") for _ in range(3)]
+        self.assertEqual(preprocessor._n_pages, 3)
+        self.assertEqual(preprocessor._bytes_before, 3 * len(page))
+        self.assertEqual(preprocessor._bytes_after, sum(map(len, results)))
+
+
+if __name__ == "__main__":
+    unittest.main()
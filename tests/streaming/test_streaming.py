@@ -0,0 +1,191 @@
+import asyncio
+import unittest
+from collections.abc import AsyncIterable
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from google.cloud import vision_v1
+from ocr.output import CombinedOutput
+from ocr.output import TimedOutput
+from ocr.streaming import broadcast
+from ocr.streaming import iterate
+from ocr.streaming import split_lines
+from ocr.text_extractor import TextExtractor
+from ocr.transfomations import DuplicateLongWords
+from ocr.transfomations import SplitLongWords
+from ocr.transfomations import TransformationsApplier
+from ocr.vision_client import AsyncVisionClient
+from pydantic import SecretStr
+
+
+class EchoVisionClient(AsyncVisionClient):
+    async def _annotate(
+        self, requests: Sequence[vision_v1.AnnotateImageRequest]
+    ) -> vision_v1.BatchAnnotateImagesResponse:
+        await asyncio.sleep(0)
+        return vision_v1.BatchAnnotateImagesResponse(
+            responses=[
+                vision_v1.AnnotateImageResponse(
+                    text_annotations=[
+                        {"description": request.image.content.decode()}
+                    ]
+                )
+                for request in requests
+            ]
+        )
+
+
+class TestStreaming(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _images(self, *contents: str) -> list[Path]:
+        paths = []
+        for index, content in enumerate(contents):
+            path = self.directory / f"page_{index}.png"
+            path.write_text(content)
+            paths.append(path)
+        return paths
+
+    async def test_pages_are_yielded_before_input_is_exhausted(
+        self,
+    ) -> None:
+        images = self._images("first page", "second page")
+        released = asyncio.Event()
+
+        async def slow_images() -> AsyncIterator[Path]:
+            yield images[0]
+            await released.wait()
+            yield images[1]
+
+        extractor = TextExtractor(
+            vision_client=EchoVisionClient(token=SecretStr("token"))
+        )
+        pages = extractor.iter_texts(slow_images())
+        self.assertEqual(await anext(pages), "first page")
+        released.set()
+        self.assertEqual([page async for page in pages], ["second page"])
+
+    async def test_stream_keeps_page_order(self) -> None:
+        contents = [f"page {index}" for index in range(40)]
+        extractor = TextExtractor(
+            vision_client=EchoVisionClient(token=SecretStr("token")),
+            n_tasks=5,
+            batch_size=3,
+        )
+        pages = [
+            page
+            async for page in extractor.iter_texts(
+                iterate(self._images(*contents))
+            )
+        ]
+        self.assertEqual(pages, contents)
+
+    async def test_page_local_transformations_are_applied_per_page(
+        self,
+    ) -> None:
+        applier = TransformationsApplier(
+            transformations=(SplitLongWords(max_syllable_group_length=5),)
+        )
+        pages = ["prawdopodobnie", "niepodległość"]
+        streamed = [
+            page
+            async for page in applier.apply_transformations_stream(
+                iterate(pages)
+            )
+        ]
+        self.assertEqual(len(streamed), 2)
+        self.assertEqual(
+            "\n".join(streamed),
+            await applier.apply_transformations("\n".join(pages)),
+        )
+
+    async def test_document_transformations_buffer_pages(self) -> None:
+        applier = TransformationsApplier(
+            transformations=(
+                SplitLongWords(max_syllable_group_length=5),
+                DuplicateLongWords(),
+            )
+        )
+        pages = ["prawdopodobnie", "niepodległość"]
+        streamed = [
+            page
+            async for page in applier.apply_transformations_stream(
+                iterate(pages)
+            )
+        ]
+        self.assertEqual(
+            streamed, [await applier.apply_transformations("\n".join(pages))]
+        )
+
+    async def test_streamed_outputs_match_buffered_outputs(self) -> None:
+        pages = ["jeden dwa", "trzy cztery pięć", "sześć"]
+        streamed_paths = (
+            self.directory / "streamed.txt",
+            self.directory / "streamed.jsonl",
+        )
+        buffered_paths = (
+            self.directory / "buffered.txt",
+            self.directory / "buffered.jsonl",
+        )
+        streamed = (
+            CombinedOutput(path=streamed_paths[0]),
+            TimedOutput(path=streamed_paths[1]),
+        )
+        buffered = (
+            CombinedOutput(path=buffered_paths[0]),
+            TimedOutput(path=buffered_paths[1]),
+        )
+        await broadcast(
+            iterate(pages), [output.save_stream for output in streamed]
+        )
+        for output in buffered:
+            await output.save_results("\n".join(pages))
+        for streamed_path, buffered_path in zip(
+            streamed_paths, buffered_paths
+        ):
+            self.assertEqual(
+                streamed_path.read_text(), buffered_path.read_text()
+            )
+
+    async def test_appending_output_continues_previous_runs(self) -> None:
+        path = self.directory / "appended.txt"
+        await CombinedOutput(path=path, append=True).save_stream(
+            iterate(["first", "second"])
+        )
+        await CombinedOutput(path=path, append=True).save_stream(
+            iterate(["third"])
+        )
+        await CombinedOutput(path=path, append=True).save_results("fourth")
+        self.assertEqual(path.read_text(), "first\nsecond\nthird\nfourth")
+
+    async def test_broadcast_feeds_every_consumer(self) -> None:
+        received: list[list[int]] = [[], []]
+
+        def collect(index: int) -> Any:
+            async def consume(items: AsyncIterable[int]) -> None:
+                async for item in items:
+                    received[index].append(item)
+
+            return consume
+
+        await broadcast(iterate(range(50)), [collect(0), collect(1)])
+        self.assertEqual(received, [list(range(50)), list(range(50))])
+
+    async def test_split_lines_regroups_deltas(self) -> None:
+        deltas = ["fir", "st\nsec", "ond\n", "\nla", "st"]
+        self.assertEqual(
+            [line async for line in split_lines(iterate(deltas))],
+            ["first", "second", "", "last"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import asyncio
+import unittest
+from collections.abc import AsyncIterator
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ocr.page import Page
+from ocr.text_extractor import ExtractionStatus
+from ocr.text_extractor import TextExtractor
+from pydantic import SecretStr
+from tests.fake_vision_client import FakeVisionClient
+
+
+class TestBatching(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.client = FakeVisionClient(token=SecretStr("token"))
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _images(self, *contents: str) -> tuple[Path, ...]:
+        paths = []
+        for index, content in enumerate(contents):
+            path = Path(self._directory.name) / f"page_{index}.png"
+            path.write_text(content)
+            paths.append(path)
+        return tuple(paths)
+
+    async def test_pages_are_grouped_into_batches(self) -> None:
+        contents = tuple(f"text {i}" for i in range(37))
+        extractor = TextExtractor(
+            vision_client=self.client, batch_size=16, n_tasks=2
+        )
+        result = await extractor.extract_from_images(self._images(*contents))
+        self.assertEqual(result.split("\n"), list(contents))
+        self.assertEqual(
+            sorted(self.client.annotator.batch_sizes), [5, 16, 16]
+        )
+
+    async def test_single_page_batches_without_batch_size(self) -> None:
+        extractor = TextExtractor(vision_client=self.client)
+        await extractor.extract_from_images(self._images("a", "b", "c"))
+        self.assertEqual(self.client.annotator.batch_sizes, [1, 1, 1])
+
+    async def test_failing_page_raises_without_return_exceptions(
+        self,
+    ) -> None:
+        extractor = TextExtractor(vision_client=self.client, batch_size=4)
+        with self.assertRaisesRegex(RuntimeError, "fail-b"):
+            await extractor.extract_from_images(
+                self._images("a", "fail-b", "c")
+            )
+
+    async def test_failing_page_only_marks_that_page(self) -> None:
+        extractor = TextExtractor(
+            vision_client=self.client, batch_size=4, return_exceptions=True
+        )
+        result = await extractor.extract_from_images(
+            self._images("a", "fail-b", "c", "d", "e")
+        )
+        self.assertEqual(result, "a\nc\nd\ne")
+        self.assertEqual(sorted(self.client.annotator.batch_sizes), [1, 4])
+        self.assertEqual(
+            extractor.status,
+            ExtractionStatus(queued=0, in_flight=0, done=4, failed=1),
+        )
+
+    async def test_partial_batch_is_flushed_when_input_stalls(self) -> None:
+        arrived = asyncio.Event()
+
+        async def pages() -> AsyncIterator[Page]:
+            for index in range(3):
+                yield Page(
+                    f"page_{index}.png", index, f"text {index}".encode()
+                )
+            await arrived.wait()
+            yield Page("page_3.png", 3, b"text 3")
+
+        extractor = TextExtractor(
+            vision_client=self.client, batch_size=16, batch_timeout=0.05
+        )
+        texts = extractor.iter_texts(pages())
+        first_texts = [await anext(texts) for _ in range(3)]
+        self.assertEqual(first_texts, ["text 0", "text 1", "text 2"])
+        self.assertEqual(extractor.status.done, 3)
+        arrived.set()
+        self.assertEqual([text async for text in texts], ["text 3"])
+        self.assertEqual(self.client.annotator.batch_sizes, [3, 1])
+
+    def test_batch_size_is_limited_by_vision_api(self) -> None:
+        with self.assertRaises(ValueError):
+            TextExtractor(vision_client=self.client, batch_size=17)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ocr.text_extractor import TextExtractor
+from pydantic import SecretStr
+from tests.fake_vision_client import FakeVisionClient
+
+
+class TestTextExtractor(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _images(self, n_images: int) -> tuple[Path, ...]:
+        paths = []
+        for index in range(n_images):
+            path = Path(self._directory.name) / f"page_{index}.png"
+            path.write_text(path.stem)
+            paths.append(path)
+        return tuple(paths)
+
+    async def test_concurrency_is_bounded_by_n_tasks(self) -> None:
+        client = FakeVisionClient(token=SecretStr("token"), latency=0.01)
+        extractor = TextExtractor(vision_client=client, n_tasks=3)
+        await extractor.extract_from_images(self._images(30))
+        self.assertEqual(client.annotator.peak, 3)
+
+    async def test_results_keep_input_order(self) -> None:
+        client = FakeVisionClient(token=SecretStr("token"))
+        extractor = TextExtractor(vision_client=client, n_tasks=8)
+        images = self._images(50)
+        result = await extractor.extract_from_images(iter(images))
+        self.assertEqual(result.split("\n"), [image.stem for image in images])
+
+    async def test_failure_raises_without_return_exceptions(self) -> None:
+        client = FakeVisionClient(token=SecretStr("token"))
+        client.annotator.always_error = {"page_2": 3}
+        extractor = TextExtractor(vision_client=client, n_tasks=2)
+        with self.assertRaises(RuntimeError):
+            await extractor.extract_from_images(self._images(5))
+
+    async def test_failed_pages_are_skipped_with_return_exceptions(
+        self,
+    ) -> None:
+        client = FakeVisionClient(token=SecretStr("token"))
+        client.annotator.always_error = {"page_2": 3}
+        extractor = TextExtractor(
+            vision_client=client, n_tasks=2, return_exceptions=True
+        )
+        result = await extractor.extract_from_images(self._images(4))
+        self.assertEqual(result, "page_0\npage_1\npage_3")
+
+
+if __name__ == "__main__":
+    unittest.main()
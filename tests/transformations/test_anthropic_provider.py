@@ -0,0 +1,82 @@
+import unittest
+from typing import Any
+
+from anthropic.types import Usage
+from ocr.transfomations import LLMCleanup
+from pydantic import SecretStr
+from tests.transformations.test_llm_cache import FakeAnthropic
+from tests.transformations.test_llm_cache import FakeLLMClient
+from tests.transformations.test_llm_cache import FakeStream
+
+
+class UncachedLLMClient(FakeLLMClient):
+    def stream(self, **kwargs: Any) -> FakeStream:
+        stream = super().stream(**kwargs)
+        stream._usage = Usage(input_tokens=10, output_tokens=5)
+        return stream
+
+
+class TestAnthropicPromptCaching(unittest.IsolatedAsyncioTestCase):
+    def _cleanup(self, **fields: Any) -> tuple[LLMCleanup, FakeLLMClient]:
+        provider = FakeAnthropic(anthropic_api_key=SecretStr("key"), **fields)
+        client = FakeLLMClient()
+        provider._client = client
+        return LLMCleanup(llm_provider=provider), client
+
+    async def test_system_prompt_is_plain_text_by_default(self) -> None:
+        cleanup, client = self._cleanup()
+        await cleanup.transform("text")
+        self.assertEqual(client.requests[0]["system"], cleanup.system_prompt)
+
+    async def test_system_prompt_is_marked_cacheable(self) -> None:
+        cleanup, client = self._cleanup(prompt_caching=True)
+        await cleanup.transform("text")
+        self.assertEqual(
+            client.requests[0]["system"],
+            [
+                {
+                    "type": "text",
+                    "text": cleanup.system_prompt,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        )
+        self.assertEqual(
+            client.requests[0]["messages"],
+            [{"role": "user", "content": "text"}],
+        )
+
+    async def test_usage_is_accumulated_and_logged(self) -> None:
+        cleanup, _ = self._cleanup(prompt_caching=True)
+        with self.assertLogs(
+            "ocr.transfomations.llm_cleanup.provider.anthropic"
+        ) as logs:
+            await cleanup.transform("first")
+            await cleanup.transform("second")
+        usage = cleanup.llm_provider.usage
+        self.assertEqual(usage.requests, 2)
+        self.assertEqual(usage.input_tokens, 20)
+        self.assertEqual(usage.output_tokens, 10)
+        self.assertEqual(usage.cache_creation_input_tokens, 2000)
+        self.assertEqual(usage.cache_read_input_tokens, 2000)
+        self.assertIn("2000 cache read tokens", logs.output[-1])
+
+    async def test_short_prompt_warns_that_nothing_was_cached(self) -> None:
+        for client, warned in (
+            (UncachedLLMClient(), True),
+            (FakeLLMClient(), False),
+        ):
+            cleanup, _ = self._cleanup(prompt_caching=True)
+            cleanup.llm_provider._client = client
+            with self.assertLogs(
+                "ocr.transfomations.llm_cleanup.provider.anthropic"
+            ) as logs:
+                await cleanup.transform("text")
+            self.assertEqual(
+                any(record.levelname == "WARNING" for record in logs.records),
+                warned,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+import asyncio
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import SimpleNamespace
+from typing import Any
+
+from ocr.transfomations import LLMCleanup
+from ocr.transfomations.llm_cleanup.provider.batch import BatchMode
+from pydantic import SecretStr
+from tests.transformations.test_llm_cache import FakeAnthropic
+from tests.transformations.test_llm_cache import FakeOpenAI
+
+
+def _clean(text: str) -> str:
+    return text.replace("teh", "the").upper()
+
+
+class AnthropicBatchServer:
+    def __init__(
+        self, polls: int = 2, failures: int = 0, truncations: int = 0
+    ) -> None:
+        self.batches: dict[str, list[dict[str, Any]]] = {}
+        self.polls = polls
+        self.failures = failures
+        self.truncations = truncations
+        self._polled: dict[str, int] = {}
+
+    async def create(self, requests: list[dict[str, Any]]) -> SimpleNamespace:
+        batch_id = f"msgbatch_{len(self.batches)}"
+        self.batches[batch_id] = requests
+        return SimpleNamespace(id=batch_id)
+
+    async def retrieve(self, batch_id: str) -> SimpleNamespace:
+        self._polled[batch_id] = self._polled.get(batch_id, 0) + 1
+        ended = self._polled[batch_id] > self.polls
+        return SimpleNamespace(
+            processing_status="ended" if ended else "in_progress"
+        )
+
+    async def results(self, batch_id: str) -> Any:
+        return self._results(self.batches[batch_id])
+
+    async def _results(self, requests: list[dict[str, Any]]) -> Any:
+        for request in requests:
+            if self.failures:
+                self.failures -= 1
+                yield SimpleNamespace(
+                    custom_id=request["custom_id"],
+                    result=SimpleNamespace(type="errored"),
+                )
+                continue
+            text = request["params"]["messages"][-1]["content"]
+            truncated = self.truncations > 0
+            self.truncations -= truncated
+            yield SimpleNamespace(
+                custom_id=request["custom_id"],
+                result=SimpleNamespace(
+                    type="succeeded",
+                    message=SimpleNamespace(
+                        content=[
+                            SimpleNamespace(type="text", text=_clean(text))
+                        ],
+                        stop_reason="max_tokens" if truncated else "end_turn",
+                    ),
+                ),
+            )
+
+
+class OpenAIBatchServer:
+    def __init__(self) -> None:
+        self.files: dict[str, str] = {}
+        self.batches = self
+        self.created: list[dict[str, Any]] = []
+
+    async def create(self, **kwargs: Any) -> SimpleNamespace:
+        if "file" in kwargs:
+            file_id = f"file-{len(self.files)}"
+            self.files[file_id] = kwargs["file"][1].decode()
+            return SimpleNamespace(id=file_id)
+        self.created.append(kwargs)
+        return SimpleNamespace(id=f"batch_{len(self.created)}")
+
+    async def retrieve(self, batch_id: str) -> SimpleNamespace:
+        requests = map(json.loads, self.files["file-0"].splitlines())
+        self.files["file-out"] = "\n".join(
+            json.dumps(
+                {
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "choices": [
+                                {
+                                    "finish_reason": "stop",
+                                    "message": {
+                                        "content": _clean(
+                                            request["body"]["messages"][-1][
+                                                "content"
+                                            ]
+                                        )
+                                    },
+                                }
+                            ]
+                        },
+                    },
+                    "error": None,
+                }
+            )
+            for request in requests
+        )
+        return SimpleNamespace(
+            status="completed", output_file_id="file-out", error_file_id=None
+        )
+
+    async def content(self, file_id: str) -> SimpleNamespace:
+        return SimpleNamespace(text=self.files[file_id])
+
+
+class TestLLMBatch(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._temp_dir = TemporaryDirectory()
+        self.state_path = Path(self._temp_dir.name) / "batches.json"
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    def _provider(self, server: AnthropicBatchServer) -> FakeAnthropic:
+        provider = FakeAnthropic(
+            anthropic_api_key=SecretStr("key"),
+            batch=BatchMode(
+                state_path=self.state_path,
+                collect_seconds=0.01,
+                poll_seconds=0.01,
+            ),
+        )
+        provider._client = SimpleNamespace(
+            messages=SimpleNamespace(batches=server)
+        )
+        return provider
+
+    async def test_requests_of_all_books_share_one_batch(self) -> None:
+        server = AnthropicBatchServer()
+        provider = self._provider(server)
+        cleanups = [
+            LLMCleanup(llm_provider=provider, chunk_tokens=10),
+            LLMCleanup(llm_provider=provider),
+        ]
+        books = [
+            "\n".join(f"book {book} line {i} of teh text" for i in range(20))
+            for book in range(2)
+        ]
+        results = await asyncio.gather(
+            *(
+                cleanup.transform(book)
+                for cleanup, book in zip(cleanups, books)
+            )
+        )
+        self.assertEqual(results, list(map(_clean, books)))
+        (requests,) = server.batches.values()
+        self.assertGreater(len(requests), 5)
+        self.assertEqual(json.loads(self.state_path.read_text()), {})
+
+    async def test_persisted_batch_is_resumed(self) -> None:
+        server = AnthropicBatchServer()
+        provider = self._provider(server)
+        cleanup = LLMCleanup(llm_provider=provider)
+        messages = cleanup._messages("teh text")
+        key = provider._cache_key(messages)
+        await server.create(
+            [{"custom_id": key, "params": provider._params(messages)}]
+        )
+        self.state_path.write_text(json.dumps({"msgbatch_0": [key]}))
+        self.assertEqual(await cleanup.transform("teh text"), "THE TEXT")
+        self.assertEqual(len(server.batches), 1)
+        self.assertEqual(json.loads(self.state_path.read_text()), {})
+
+    async def test_failed_requests_are_resubmitted(self) -> None:
+        server = AnthropicBatchServer(polls=0, failures=1)
+        cleanup = LLMCleanup(
+            llm_provider=self._provider(server), retry_delay=0
+        )
+        self.assertEqual(await cleanup.transform("teh text"), "THE TEXT")
+        self.assertEqual(len(server.batches), 2)
+
+    async def test_truncated_results_are_resubmitted(self) -> None:
+        server = AnthropicBatchServer(polls=0, truncations=1)
+        cleanup = LLMCleanup(
+            llm_provider=self._provider(server), retry_delay=0
+        )
+        self.assertEqual(await cleanup.transform("teh text"), "THE TEXT")
+        self.assertEqual(len(server.batches), 2)
+
+    async def test_openai_batch_round_trip(self) -> None:
+        server = OpenAIBatchServer()
+        provider = FakeOpenAI(
+            openai_api_key=SecretStr("key"),
+            batch=BatchMode(
+                state_path=self.state_path, collect_seconds=0, poll_seconds=1
+            ),
+        )
+        provider._client = SimpleNamespace(files=server, batches=server)
+        cleanup = LLMCleanup(llm_provider=provider)
+        self.assertEqual(await cleanup.transform("teh text"), "THE TEXT")
+        (created,) = server.created
+        self.assertEqual(created["endpoint"], "/v1/chat/completions")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+from typing import Optional
+
+from anthropic.types import Usage
+from ocr.cache import DiskCache
+from ocr.transfomations import LLMCleanup
+from ocr.transfomations.llm_cleanup.provider import Anthropic
+from ocr.transfomations.llm_cleanup.provider import OpenAI
+from pydantic import SecretStr
+
+
+class FakeStream:
+    def __init__(
+        self, deltas: list[str], usage: Usage, stop_reason: str = "end_turn"
+    ) -> None:
+        self._deltas = deltas
+        self._usage = usage
+        self._stop_reason = stop_reason
+
+    async def __aenter__(self) -> "FakeStream":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        pass
+
+    @property
+    async def text_stream(self) -> AsyncIterator[str]:
+        for delta in self._deltas:
+            yield delta
+
+    async def get_final_message(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            usage=self._usage, stop_reason=self._stop_reason
+        )
+
+
+class FakeLLMClient:
+    def __init__(
+        self, response: Optional[str] = None, truncated: bool = False
+    ) -> None:
+        self.response = response
+        self.truncated = truncated
+        self.requests: list[dict[str, Any]] = []
+        self.messages = self
+        self.chat = SimpleNamespace(completions=self)
+
+    @property
+    def n_calls(self) -> int:
+        return len(self.requests)
+
+    def stream(self, **kwargs: Any) -> FakeStream:
+        self.requests.append(kwargs)
+        cached = self.n_calls > 1
+        return FakeStream(
+            self._deltas(kwargs),
+            Usage(
+                input_tokens=10,
+                output_tokens=5,
+                cache_creation_input_tokens=0 if cached else 2000,
+                cache_read_input_tokens=2000 if cached else 0,
+            ),
+            "max_tokens" if self.truncated else "end_turn",
+        )
+
+    async def create(self, **kwargs: Any) -> AsyncIterator[SimpleNamespace]:
+        self.requests.append(kwargs)
+        return self._chunks(self._deltas(kwargs))
+
+    def _deltas(self, kwargs: dict[str, Any]) -> list[str]:
+        text = (
+            kwargs["messages"][-1]["content"].upper()
+            if self.response is None
+            else self.response
+        )
+        return [text[index : index + 3] for index in range(0, len(text), 3)]
+
+    async def _chunks(
+        self, deltas: list[str]
+    ) -> AsyncIterator[SimpleNamespace]:
+        for delta in [*deltas, None]:
+            yield SimpleNamespace(
+                choices=[
+                    SimpleNamespace(
+                        delta=SimpleNamespace(content=delta),
+                        finish_reason=(
+                            None
+                            if delta is not None
+                            else "length" if self.truncated else "stop"
+                        ),
+                    )
+                ]
+            )
+
+
+class FakeAnthropic(Anthropic):
+    _client: Any
+
+
+class FakeOpenAI(OpenAI):
+    _client: Any
+
+
+def _anthropic(**fields: Any) -> FakeAnthropic:
+    return FakeAnthropic(anthropic_api_key=SecretStr("key"), **fields)
+
+
+def _openai(**fields: Any) -> FakeOpenAI:
+    return FakeOpenAI(openai_api_key=SecretStr("key"), **fields)
+
+
+class TestLLMCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _cleanup(
+        self, provider: FakeAnthropic | FakeOpenAI, **fields: Any
+    ) -> LLMCleanup:
+        provider._client = FakeLLMClient()
+        return LLMCleanup(llm_provider=provider, **fields)
+
+    async def test_empty_and_truncated_responses_are_not_cached(
+        self,
+    ) -> None:
+        for factory in (_anthropic, _openai):
+            for client in (
+                FakeLLMClient(response=""),
+                FakeLLMClient(truncated=True),
+            ):
+                with self.subTest(
+                    provider=factory.__name__, truncated=client.truncated
+                ):
+                    cache = DiskCache(
+                        directory=self.directory
+                        / factory.__name__
+                        / str(client.truncated)
+                    )
+                    provider = factory(cache=cache)
+                    provider._client = client
+                    cleanup = LLMCleanup(llm_provider=provider, num_retries=0)
+                    with self.assertRaises(ValueError):
+                        await cleanup.transform("text")
+                    with self.assertRaises(ValueError):
+                        [
+                            line
+                            async for line in cleanup.transform_stream("text")
+                        ]
+                    self.assertEqual(client.n_calls, 2)
+                    self.assertEqual(
+                        await self._cleanup(factory(cache=cache)).transform(
+                            "text"
+                        ),
+                        "TEXT",
+                    )
+
+    def _calls(self, cleanup: LLMCleanup) -> int:
+        return int(cleanup.llm_provider._client.n_calls)
+
+    async def test_rerun_is_served_from_cache(self) -> None:
+        for factory in (_anthropic, _openai):
+            with self.subTest(provider=factory.__name__):
+                cache = DiskCache(directory=self.directory / factory.__name__)
+                first = self._cleanup(factory(cache=cache))
+                second = self._cleanup(factory(cache=cache))
+                self.assertEqual(await first.transform("text"), "TEXT")
+                self.assertEqual(await second.transform("text"), "TEXT")
+                self.assertEqual(
+                    (self._calls(first), self._calls(second)), (1, 0)
+                )
+                self.assertEqual(cache.hits, 1)
+
+    async def test_key_covers_model_prompt_and_text(self) -> None:
+        cache = DiskCache(directory=self.directory)
+        await self._cleanup(_anthropic(cache=cache)).transform("text")
+        variants = (
+            self._cleanup(_anthropic(cache=cache, model="other")),
+            self._cleanup(_anthropic(cache=cache), system_prompt="other"),
+            self._cleanup(_openai(cache=cache)),
+        )
+        for cleanup in variants:
+            await cleanup.transform("text")
+            self.assertEqual(self._calls(cleanup), 1)
+        cleanup = self._cleanup(_anthropic(cache=cache))
+        await cleanup.transform("other text")
+        self.assertEqual(self._calls(cleanup), 1)
+
+    async def test_chunks_are_cached_individually(self) -> None:
+        cache = DiskCache(directory=self.directory)
+        lines = [f"line {index}" for index in range(40)]
+        fields = {"chunk_tokens": 20, "characters_per_token": 4}
+        await self._cleanup(_anthropic(cache=cache), **fields).transform(
+            "\n".join(lines)
+        )
+        lines[-1] = "changed"
+        cleanup = self._cleanup(_anthropic(cache=cache), **fields)
+        await cleanup.transform("\n".join(lines))
+        self.assertEqual(self._calls(cleanup), 1)
+
+    async def test_bypass_refreshes_cache(self) -> None:
+        cache = DiskCache(directory=self.directory)
+        await self._cleanup(_anthropic(cache=cache)).transform("text")
+        cleanup = self._cleanup(_anthropic(cache=cache, bypass_cache=True))
+        await cleanup.transform("text")
+        self.assertEqual(self._calls(cleanup), 1)
+        self.assertEqual(cache.hits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
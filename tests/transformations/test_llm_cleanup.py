@@ -0,0 +1,172 @@
+import asyncio
+import random
+import unittest
+from collections.abc import AsyncIterator
+from collections.abc import Sequence
+from typing import Any
+from unittest.mock import patch
+
+from ocr.transfomations import LLMCleanup
+from ocr.transfomations.llm_cleanup.chunking import continue_lines
+from ocr.transfomations.llm_cleanup.chunking import split_chunks
+from ocr.transfomations.llm_cleanup.provider import Anthropic
+from ocr.transfomations.llm_cleanup.provider.message import Message
+from pydantic import SecretStr
+
+
+class FakeProvider(Anthropic):
+    _chunks: list[str]
+    _failures: set[str]
+    _in_flight: int
+    _peak: int
+
+    def model_post_init(self, context: Any, /) -> None:
+        super().model_post_init(context)
+        self._chunks = []
+        self._failures = set()
+        self._in_flight = 0
+        self._peak = 0
+
+    async def _stream(self, messages: Sequence[Message]) -> AsyncIterator[str]:
+        text = messages[-1].content
+        self._chunks.append(text)
+        self._in_flight += 1
+        self._peak = max(self._peak, self._in_flight)
+        try:
+            await asyncio.sleep(random.random() / 100)
+            first_line = text.split("\n")[0]
+            if first_line in self._failures:
+                self._failures.discard(first_line)
+                raise ConnectionError("overloaded")
+            cleaned = _expected(text)
+            for index in range(0, len(cleaned), 7):
+                await asyncio.sleep(0)
+                yield cleaned[index : index + 7]
+        finally:
+            self._in_flight -= 1
+
+
+def _book(n_lines: int) -> str:
+    return "\n".join(
+        str(index) if index % 10 == 9 else f"line {index} of teh book"
+        for index in range(n_lines)
+    )
+
+
+def _expected(text: str) -> str:
+    return "\n".join(
+        line.replace("teh", "the").upper()
+        for line in text.split("\n")
+        if not line.isdigit()
+    )
+
+
+class TestChunking(unittest.TestCase):
+    def test_chunks_respect_budget_and_overlap(self) -> None:
+        text = _book(100)
+        chunks = split_chunks(text, 200, overlap_lines=2)
+        self.assertGreater(len(chunks), 5)
+        self.assertTrue(all(len(chunk) <= 200 + 2 * 25 for chunk in chunks))
+        for previous, current in zip(chunks, chunks[1:]):
+            self.assertEqual(
+                previous.split("\n")[-2:], current.split("\n")[:2]
+            )
+
+    def test_chunks_end_on_blank_lines(self) -> None:
+        paragraphs = [
+            "\n".join(f"paragraph {p} line {i}" for i in range(4))
+            for p in range(6)
+        ]
+        chunks = split_chunks("\n\n".join(paragraphs), 200, overlap_lines=0)
+        self.assertTrue(all(chunk.endswith("\n") for chunk in chunks[:-1]))
+
+    def test_long_line_gets_own_chunk(self) -> None:
+        chunks = split_chunks("short\n" + 50 * "x" + "\nshort", 20, 0)
+        self.assertEqual(chunks, ["short", 50 * "x", "short"])
+
+    def test_continuation_tolerates_reworded_overlap(self) -> None:
+        self.assertEqual(
+            continue_lines(
+                ["a", "b", "some text here"], "some text here!\nc", 1
+            ),
+            ["c"],
+        )
+        self.assertEqual(continue_lines(["a", "b"], "c\nd", 1), ["c", "d"])
+
+
+class TestLLMCleanup(unittest.IsolatedAsyncioTestCase):
+    def _cleanup(self, **fields: Any) -> LLMCleanup:
+        return LLMCleanup(
+            llm_provider=FakeProvider(anthropic_api_key=SecretStr("key")),
+            retry_delay=0,
+            **fields,
+        )
+
+    async def test_whole_text_is_one_request_by_default(self) -> None:
+        cleanup = self._cleanup()
+        text = _book(100)
+        self.assertEqual(await cleanup.transform(text), _expected(text))
+        self.assertEqual(cleanup.llm_provider._chunks, [text])
+
+    async def test_chunks_are_cleaned_concurrently_in_order(self) -> None:
+        cleanup = self._cleanup(
+            chunk_tokens=50, characters_per_token=4, max_concurrency=3
+        )
+        text = _book(300)
+        self.assertEqual(await cleanup.transform(text), _expected(text))
+        provider = cleanup.llm_provider
+        self.assertGreater(len(provider._chunks), 10)
+        self.assertEqual(provider._peak, 3)
+
+    async def test_zero_overlap_keeps_no_tail(self) -> None:
+        cleanup = self._cleanup(
+            chunk_tokens=50, characters_per_token=4, overlap_lines=0
+        )
+        text = _book(100)
+        with patch(
+            "ocr.transfomations.llm_cleanup.llm_cleanup.continue_lines",
+            wraps=continue_lines,
+        ) as stitcher:
+            self.assertEqual(await cleanup.transform(text), _expected(text))
+        self.assertGreater(stitcher.call_count, 5)
+        self.assertTrue(all(not call.args[0] for call in stitcher.mock_calls))
+        self.assertEqual(
+            cleanup.llm_provider._chunks, split_chunks(text, 200, 0)
+        )
+
+    async def test_failed_chunk_is_retried(self) -> None:
+        cleanup = self._cleanup(chunk_tokens=50, characters_per_token=4)
+        text = _book(100)
+        chunks = split_chunks(text, 200, cleanup.overlap_lines)
+        cleanup.llm_provider._failures = {chunks[3].split("\n")[0]}
+        self.assertEqual(await cleanup.transform(text), _expected(text))
+        self.assertEqual(len(cleanup.llm_provider._chunks), len(chunks) + 1)
+
+    async def test_exhausted_retries_raise(self) -> None:
+        cleanup = self._cleanup(num_retries=0)
+        cleanup.llm_provider._failures = {"line 0 of teh book"}
+        with self.assertRaises(ConnectionError):
+            await cleanup.transform(_book(10))
+
+    async def test_stream_yields_lines_before_response_ends(self) -> None:
+        cleanup = self._cleanup()
+        text = _book(100)
+        lines = cleanup.transform_stream(text)
+        self.assertEqual(await anext(lines), "LINE 0 OF THE BOOK")
+        self.assertEqual(cleanup.llm_provider._in_flight, 1)
+        rest = [line async for line in lines]
+        self.assertEqual(
+            "\n".join(["LINE 0 OF THE BOOK", *rest]), _expected(text)
+        )
+
+    async def test_chunked_stream_matches_transform(self) -> None:
+        cleanup = self._cleanup(chunk_tokens=50, characters_per_token=4)
+        cleanup.llm_provider._failures = {"line 0 of teh book"}
+        text = _book(200)
+        pieces = [piece async for piece in cleanup.transform_stream(text)]
+        self.assertGreater(len(pieces), 5)
+        self.assertEqual("\n".join(pieces), _expected(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
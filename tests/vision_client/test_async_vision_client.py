@@ -0,0 +1,116 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+import grpc
+from google.cloud import vision_v1
+from google.cloud.vision_v1.services.image_annotator.transports import (
+    ImageAnnotatorGrpcAsyncIOTransport,
+)
+from ocr.text_extractor import TextExtractor
+from ocr.vision_client import AsyncVisionClient
+from pydantic import SecretStr
+
+
+class FakeImageAnnotator:
+    def __init__(self) -> None:
+        self.n_requests = 0
+
+    async def batch_annotate_images(
+        self, request: vision_v1.BatchAnnotateImagesRequest, context: Any
+    ) -> vision_v1.BatchAnnotateImagesResponse:
+        self.n_requests += 1
+        return vision_v1.BatchAnnotateImagesResponse(
+            responses=[
+                vision_v1.AnnotateImageResponse(
+                    text_annotations=[
+                        {"description": image_request.image.content.decode()}
+                    ]
+                )
+                for image_request in request.requests
+            ]
+        )
+
+
+class LocalAsyncVisionClient(AsyncVisionClient):
+    def _create_transport(self) -> ImageAnnotatorGrpcAsyncIOTransport:
+        return ImageAnnotatorGrpcAsyncIOTransport(
+            channel=grpc.aio.insecure_channel(self.host)
+        )
+
+
+class TestAsyncVisionClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.annotator = FakeImageAnnotator()
+        self.server = grpc.aio.server()
+        self.server.add_generic_rpc_handlers(
+            (
+                grpc.method_handlers_generic_handler(
+                    "google.cloud.vision.v1.ImageAnnotator",
+                    {
+                        "BatchAnnotateImages": grpc.unary_unary_rpc_method_handler(
+                            self.annotator.batch_annotate_images,
+                            request_deserializer=vision_v1.BatchAnnotateImagesRequest.deserialize,
+                            response_serializer=vision_v1.BatchAnnotateImagesResponse.serialize,
+                        )
+                    },
+                ),
+            )
+        )
+        port = self.server.add_insecure_port("127.0.0.1:0")
+        await self.server.start()
+        self.client = LocalAsyncVisionClient(
+            token=SecretStr("token"), host=f"127.0.0.1:{port}"
+        )
+        self._directory = TemporaryDirectory()
+
+    async def asyncTearDown(self) -> None:
+        await self.server.stop(None)
+        self._directory.cleanup()
+
+    def _images(self, n_images: int) -> tuple[Path, ...]:
+        paths = []
+        for index in range(n_images):
+            path = Path(self._directory.name) / f"page_{index}.png"
+            path.write_text(f"text {index}")
+            paths.append(path)
+        return tuple(paths)
+
+    async def test_extracts_text_over_shared_channel(self) -> None:
+        extractor = TextExtractor(vision_client=self.client, n_tasks=4)
+        result = await extractor.extract_from_images(self._images(10))
+        self.assertEqual(
+            result.split("\n"), [f"text {index}" for index in range(10)]
+        )
+        self.assertEqual(self.annotator.n_requests, 10)
+
+    async def test_batches_share_channel(self) -> None:
+        extractor = TextExtractor(
+            vision_client=self.client, n_tasks=2, batch_size=4
+        )
+        result = await extractor.extract_from_images(self._images(10))
+        self.assertEqual(len(result.split("\n")), 10)
+        self.assertEqual(self.annotator.n_requests, 3)
+
+    async def test_requires_session(self) -> None:
+        with self.assertRaises(RuntimeError):
+            await self.client.extract_text(self._images(1)[0])
+
+
+class TestVisionClientSelection(unittest.TestCase):
+    def test_sync_client_is_default(self) -> None:
+        extractor = TextExtractor.model_validate(
+            {"vision_client": {"token": "token"}}
+        )
+        self.assertEqual(extractor.vision_client.type, "sync")
+
+    def test_async_client_is_selectable(self) -> None:
+        extractor = TextExtractor.model_validate(
+            {"vision_client": {"type": "async", "token": "token"}}
+        )
+        self.assertIsInstance(extractor.vision_client, AsyncVisionClient)
+
+
+if __name__ == "__main__":
+    unittest.main()
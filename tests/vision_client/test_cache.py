@@ -0,0 +1,66 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any
+
+from ocr.cache import DiskCache
+from ocr.text_extractor import TextExtractor
+from pydantic import SecretStr
+from tests.fake_vision_client import FakeVisionClient
+
+
+class TestVisionCache(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+        self.images = []
+        for index in range(6):
+            path = self.directory / f"page_{index}.png"
+            path.write_text(f"text {index}")
+            self.images.append(path)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _client(self, **client_fields: Any) -> FakeVisionClient:
+        return FakeVisionClient(
+            **{
+                "token": SecretStr("token"),
+                "cache": DiskCache(directory=self.directory / "cache"),
+                **client_fields,
+            }
+        )
+
+    async def _extract(self, client: FakeVisionClient) -> str:
+        return await TextExtractor(
+            vision_client=client, batch_size=4
+        ).extract_from_images(self.images)
+
+    async def test_rerun_makes_no_requests(self) -> None:
+        first = self._client()
+        first_result = await self._extract(first)
+        cache = DiskCache(directory=self.directory / "cache")
+        second = self._client(cache=cache)
+        second_result = await self._extract(second)
+        self.assertEqual(first_result, second_result)
+        self.assertEqual(first.annotator.n_images, 6)
+        self.assertEqual(second.annotator.n_images, 0)
+        self.assertEqual(cache.hits, 6)
+
+    async def test_only_changed_pages_are_requested(self) -> None:
+        await self._extract(self._client())
+        self.images[2].write_text("changed")
+        client = self._client()
+        result = await self._extract(client)
+        self.assertEqual(result.split("\n")[2], "changed")
+        self.assertEqual(client.annotator.n_images, 1)
+
+    async def test_language_hints_are_part_of_key(self) -> None:
+        await self._extract(self._client())
+        client = self._client(language_hints=("pl",))
+        await self._extract(client)
+        self.assertEqual(client.annotator.n_images, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
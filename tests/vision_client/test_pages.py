@@ -0,0 +1,73 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ocr.cache import DiskCache
+from ocr.page import Page
+from ocr.text_extractor import TextExtractor
+from pydantic import SecretStr
+from tests.fake_vision_client import FakeVisionClient
+
+
+class TestInMemoryPages(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._directory = TemporaryDirectory()
+        self.directory = Path(self._directory.name)
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _extractor(self, client: FakeVisionClient) -> TextExtractor:
+        return TextExtractor(vision_client=client, batch_size=2)
+
+    def _client(self) -> FakeVisionClient:
+        return FakeVisionClient(
+            token=SecretStr("token"),
+            cache=DiskCache(directory=self.directory / "cache"),
+        )
+
+    async def test_pages_are_read_without_files(self) -> None:
+        pages = [
+            Page(f"page_{index}.png", index, f"text {index}".encode())
+            for index in range(3)
+        ]
+        result = await self._extractor(self._client()).extract_from_images(
+            pages
+        )
+        self.assertEqual(result, "text 0\ntext 1\ntext 2")
+        self.assertEqual(
+            list(self.directory.iterdir()), [self.directory / "cache"]
+        )
+
+    async def test_pages_and_files_share_cache(self) -> None:
+        paths = []
+        for index in range(3):
+            path = self.directory / f"page_{index}.png"
+            path.write_text(f"text {index}")
+            paths.append(path)
+        empty_path = self.directory / "empty.png"
+        empty_path.touch()
+        first_result = await self._extractor(
+            self._client()
+        ).extract_from_images([*paths, empty_path])
+        client = self._client()
+        second_result = await self._extractor(client).extract_from_images(
+            [
+                *(
+                    Page(path.name, index, path.read_bytes())
+                    for index, path in enumerate(paths)
+                ),
+                Page(empty_path.name, 3, b""),
+            ]
+        )
+        self.assertEqual(first_result, second_result)
+        self.assertEqual(client.annotator.n_images, 0)
+
+    def test_repr_omits_content(self) -> None:
+        page = Page("page_1.png", 1, b"x" * 1000)
+        self.assertEqual(str(page), "page_1.png")
+        self.assertNotIn("xxx", repr(page))
+
+
+if __name__ == "__main__":
+    unittest.main()
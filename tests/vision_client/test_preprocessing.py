@@ -0,0 +1,33 @@
+import unittest
+from io import BytesIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from ocr.preprocessing import ImageFormat
+from ocr.preprocessing import PagePreprocessor
+from PIL import Image
+from pydantic import SecretStr
+from tests.fake_vision_client import FakeVisionClient
+
+
+class TestVisionClientPreprocessing(unittest.IsolatedAsyncioTestCase):
+    async def test_preprocessed_page_is_uploaded(self) -> None:
+        with TemporaryDirectory() as directory:
+            image_path = Path(directory) / "page.png"
+            Image.new("RGB", (300, 200), "white").save(image_path)
+            client = FakeVisionClient(
+                token=SecretStr("token"),
+                preprocessor=PagePreprocessor(
+                    max_dimension=150, format=ImageFormat.JPEG
+                ),
+            )
+            async with client.session(1):
+                await client.extract_text(image_path)
+        (content,) = client.annotator.contents
+        uploaded = Image.open(BytesIO(content))
+        self.assertEqual(uploaded.format, "JPEG")
+        self.assertEqual(uploaded.size, (150, 100))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import time
+import unittest
+
+from ocr.page import Page
+from ocr.text_extractor import TextExtractor
+from ocr.vision_client import RateLimiter
+from ocr.vision_client import VisionApiError
+from pydantic import SecretStr
+from tests.fake_vision_client import FakeVisionClient
+
+
+def _pages(*texts: str) -> tuple[Page, ...]:
+    return tuple(
+        Page(f"page_{number}.png", number, text.encode())
+        for number, text in enumerate(texts)
+    )
+
+
+class TestVisionRetry(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.client = FakeVisionClient(
+            token=SecretStr("token"),
+            latency=0.01,
+            retry_delay=0,
+            num_retries=2,
+        )
+        self.annotator = self.client.annotator
+
+    async def test_transient_quota_errors_are_retried(self) -> None:
+        self.annotator.raise_for = 2
+        (page,) = _pages("a")
+        self.assertEqual(await self.client.extract_text(page), "a")
+        self.assertEqual(len(self.annotator.requests), 3)
+
+    async def test_only_throttled_images_are_retried(self) -> None:
+        self.annotator.throttle_once = {"b"}
+        results = await self.client.extract_texts(_pages("a", "b", "c"))
+        self.assertEqual(results, ("a", "b", "c"))
+        self.assertEqual(self.annotator.requests, [["a", "b", "c"], ["b"]])
+
+    async def test_exhausted_retries_raise(self) -> None:
+        self.annotator.always_error = {"a": 14}
+        (page,) = _pages("a")
+        with self.assertRaises(VisionApiError) as context:
+            await self.client.extract_text(page)
+        self.assertTrue(context.exception.retryable)
+        self.assertEqual(len(self.annotator.requests), 3)
+
+    async def test_invalid_image_is_not_retried(self) -> None:
+        self.annotator.always_error = {"a": 3}
+        (page,) = _pages("a")
+        with self.assertRaisesRegex(VisionApiError, "error 3 for a"):
+            await self.client.extract_text(page)
+        self.assertEqual(len(self.annotator.requests), 1)
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+    async def test_additive_increase_multiplicative_decrease(self) -> None:
+        limiter = RateLimiter(increase_after=2)
+        async with limiter.session(8):
+            async with limiter.acquire(1, 1) as first:
+                async with limiter.acquire(1, 1) as second:
+                    limiter.record(first, throttled=True)
+                    limiter.record(second, throttled=True)
+            self.assertEqual(limiter.limit, 4)
+            async with limiter.acquire(1, 1) as generation:
+                limiter.record(generation, throttled=True)
+            self.assertEqual(limiter.limit, 2)
+            for _ in range(4):
+                async with limiter.acquire(1, 1) as generation:
+                    limiter.record(generation, throttled=False)
+            self.assertEqual(limiter.limit, 4)
+
+    async def test_concurrency_backs_off_under_throttling(self) -> None:
+        limiter = RateLimiter(increase_after=1000)
+        client = FakeVisionClient(
+            token=SecretStr("token"),
+            latency=0.01,
+            retry_delay=0,
+            num_retries=20,
+            rate_limiter=limiter,
+        )
+        client.annotator.max_concurrent = 2
+        extractor = TextExtractor(vision_client=client, n_tasks=8)
+        texts = [f"text {index}" for index in range(40)]
+        result = await extractor.extract_from_images(_pages(*texts))
+        self.assertEqual(result, "\n".join(texts))
+        self.assertLessEqual(limiter.limit, 2)
+
+    async def test_requests_per_minute(self) -> None:
+        client = FakeVisionClient(
+            token=SecretStr("token"),
+            latency=0.01,
+            rate_limiter=RateLimiter(requests_per_minute=600),
+        )
+        extractor = TextExtractor(vision_client=client, n_tasks=4)
+        start = time.monotonic()
+        await extractor.extract_from_images(
+            _pages(*(f"text {index}" for index in range(15)))
+        )
+        self.assertGreaterEqual(time.monotonic() - start, 0.45)
+
+
+if __name__ == "__main__":
+    unittest.main()